@@ -0,0 +1,196 @@
+# =============================================================================
+# 언어 자동 선택('auto') 벤치마크 (오프라인)
+# 영어/한국어/중국어/일본어/한영 혼합 페이지가 섞인 합성 스캔 PDF 하나를 만들고
+# 1) 페이지마다 문자 체계 감지 결과, 감지 시간, 감지 정확도를 측정
+# 2) 고정 언어 조합(기본값 kor+eng, 전체 언어)과 'auto'의 처리량(페이지/초)과 문자 정확도를 비교
+# Tesseract가 없으면 1)만 글자 모양 판단(OSD 없음)으로 측정
+# 사용법: python benchmarks/bench_language_detect.py [--pages N] [--workers N]
+#        [--settings kor+eng,auto] [--output 결과.json]
+# =============================================================================
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# 저장소 루트를 모듈 검색 경로에 추가 (benchmarks/ 폴더에서 직접 실행하기 위함)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+import ocr_core
+import ocr_engine
+import script_detect
+from ocr_trace import Histogram
+from bench_pipeline import installed_languages, latency_summary, make_scanned_pdf
+from bench_render_policy import char_accuracy
+
+# 합성 문서의 페이지 종류 (make_lines의 언어 조합) -> 감지되어야 할 언어 조합
+DOCUMENTS = {
+    'eng': 'eng',
+    'kor': 'kor+eng',
+    'chi_sim': 'chi_sim+eng',
+    'jpn': 'jpn+eng',
+    'kor+eng': 'kor+eng',
+}
+
+# 비교할 언어 설정 (프로그램 기본값, 모든 언어 고정, 자동 선택)
+DEFAULT_SETTINGS = (ocr_core.DEFAULT_LANGUAGE, script_detect.FALLBACK_LANGUAGE,
+                    script_detect.LANGUAGE_AUTO)
+
+
+# 페이지 종류마다 합성 스캔 PDF를 만들어 한 파일로 합치는 함수
+def make_archive(folder, pages, dpi, skew):
+    """(PDF 경로, 페이지별 (페이지 종류, 정답 텍스트) 목록) - 페이지 종류가 번갈아 나옴"""
+    parts = []
+    for kind in DOCUMENTS:
+        path = os.path.join(folder, f"{kind.replace('+', '_')}.pdf")
+        parts.append((kind, path, make_scanned_pdf(path, kind, pages, dpi, skew)))
+
+    archive = fitz.open()
+    truths = []
+    for index in range(pages):
+        for kind, path, part_truths in parts:
+            with fitz.open(path) as part:
+                archive.insert_pdf(part, from_page=index, to_page=index)
+            truths.append((kind, part_truths[index]))
+    path = os.path.join(folder, "archive.pdf")
+    archive.save(path, garbage=3, deflate=True)
+    archive.close()
+    return path, truths
+
+
+# 페이지마다 OCR 작업자와 같은 방식으로 렌더링/전처리한 뒤 언어 감지 시간과 결과 측정
+def run_detection(pdf_path, truths, engine, preprocessor):
+    """{'pages': 페이지별 결과, 'exact': 정확히 맞힌 비율, 'covered': 필요한 언어를 포함한 비율,
+    'detect': 감지 시간 요약}"""
+    policy = ocr_core.RenderPolicy()
+    pages, times = [], Histogram()
+    with fitz.open(pdf_path) as doc:
+        for page, (kind, _) in zip(doc, truths):
+            pix, _ = ocr_core.render_page(page, policy)
+            image = ocr_core.pixmap_to_image(pix)
+            if preprocessor is not None:
+                image = preprocessor(image)
+            start = time.perf_counter()
+            detected = script_detect.detect_language(image, engine)
+            times.add((time.perf_counter() - start) * 1000)
+            # 픽셀맵 메모리를 참조하는 이미지를 먼저 해제한 뒤 픽셀맵 해제
+            del image
+            pix = None
+            expected = DOCUMENTS[kind]
+            pages.append({'kind': kind, 'expected': expected, 'detected': detected,
+                          'covered': set(expected.split('+')) <= set(detected.split('+'))})
+    return {'pages': pages,
+            'exact': round(sum(p['detected'] == p['expected'] for p in pages) / len(pages), 4),
+            'covered': round(sum(p['covered'] for p in pages) / len(pages), 4),
+            'detect': latency_summary(times)}
+
+
+# 언어 설정 하나로 문서 전체를 OCR하여 처리량과 문자 정확도 측정
+def run_setting(pdf_path, truths, language, workers, engine_name, preprocessor):
+    """{'pages_per_sec', 'accuracy', 'by_kind': 페이지 종류별 정확도}"""
+    page_nums = list(range(len(truths)))
+    texts = {}
+    start = time.perf_counter()
+    for page_num, text, _ in ocr_core.iter_pdf_pages(pdf_path, page_nums, language, workers,
+                                                     use_text_layer=False,
+                                                     preprocessor=preprocessor,
+                                                     engine=engine_name):
+        texts[page_num] = text
+    elapsed = time.perf_counter() - start
+
+    by_kind = {}
+    for page_num, (kind, truth) in enumerate(truths):
+        by_kind.setdefault(kind, []).append(char_accuracy(truth, texts[page_num]))
+    accuracies = [value for values in by_kind.values() for value in values]
+    return {'pages_per_sec': round(len(page_nums) / elapsed, 3),
+            'accuracy': round(sum(accuracies) / len(accuracies), 4),
+            'by_kind': {kind: round(sum(values) / len(values), 4)
+                        for kind, values in by_kind.items()}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="언어 자동 선택 벤치마크 (오프라인)")
+    parser.add_argument("--pages", type=int, default=2, help="페이지 종류별 페이지 수")
+    parser.add_argument("--workers", type=int, default=ocr_core.DEFAULT_PDF_WORKERS,
+                        help="처리량 측정에 쓸 작업자 프로세스 수")
+    parser.add_argument("--settings", default=",".join(DEFAULT_SETTINGS),
+                        help="쉼표로 구분한 비교할 언어 설정 목록")
+    parser.add_argument("--dpi", type=int, default=300, help="합성 스캔 해상도")
+    parser.add_argument("--skew", type=float, default=1.0, help="합성 스캔 기울기(도)")
+    parser.add_argument("--engine", choices=ocr_engine.ENGINES, default=ocr_engine.ENGINE_AUTO,
+                        help="OCR 엔진")
+    parser.add_argument("--no-preprocess", action="store_true", help="자동 전처리를 사용하지 않음")
+    parser.add_argument("--output", default=None,
+                        help="결과 JSON 파일 (기본값: bench_language_detect_<날짜_시각>.json)")
+    args = parser.parse_args()
+
+    settings = [setting.strip() for setting in args.settings.split(",") if setting.strip()]
+    installed = installed_languages()
+    if installed is None:
+        print("Tesseract를 찾을 수 없어 글자 모양 판단(OSD 없음)으로 감지만 측정합니다.",
+              file=sys.stderr)
+    preprocessor = None if args.no_preprocess else ocr_core.default_preprocessor()
+    engine = None if installed is None else ocr_engine.create_engine(args.engine)
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'pymupdf': fitz.VersionBind,
+            'engine': None if engine is None else engine.name,
+            'osd': installed is not None and ocr_engine.OSD_LANGUAGE in installed,
+        },
+        'settings': {'pages': args.pages, 'workers': args.workers, 'dpi': args.dpi,
+                     'skew': args.skew, 'preprocess': preprocessor is not None},
+    }
+
+    with tempfile.TemporaryDirectory() as folder:
+        pdf_path, truths = make_archive(folder, args.pages, args.dpi, args.skew)
+
+        detection = run_detection(pdf_path, truths, engine, preprocessor)
+        report['detection'] = detection
+        print(f"{'페이지 종류':<12}{'기대':<14}감지 결과")
+        for kind in DOCUMENTS:
+            detected = [p['detected'] for p in detection['pages'] if p['kind'] == kind]
+            print(f"{kind:<12}{DOCUMENTS[kind]:<14}{', '.join(detected)}")
+        print(f"감지 정확도 {detection['exact'] * 100:.1f}%, "
+              f"필요한 언어 포함 {detection['covered'] * 100:.1f}%, "
+              f"감지 시간 p50/p90 {detection['detect']['p50_ms']:.0f}/"
+              f"{detection['detect']['p90_ms']:.0f}ms")
+        if engine is not None:
+            engine.close()
+
+        if installed is not None:
+            report['results'] = {}
+            print(f"\n{'언어 설정':<22}{'페이지/초':>10}{'정확도':>9}  페이지 종류별 정확도")
+            for setting in settings:
+                needed = (script_detect.FALLBACK_LANGUAGE if script_detect.is_auto(setting)
+                          else setting)
+                missing = [name for name in needed.split('+') if name not in installed]
+                if missing:
+                    print(f"{setting:<22}건너뜀 (언어 데이터 없음: {', '.join(missing)})")
+                    continue
+                result = run_setting(pdf_path, truths, setting, args.workers, args.engine,
+                                     preprocessor)
+                report['results'][setting] = result
+                kinds = ", ".join(f"{kind} {value * 100:.0f}%"
+                                  for kind, value in result['by_kind'].items())
+                print(f"{setting:<22}{result['pages_per_sec']:10.2f}"
+                      f"{result['accuracy'] * 100:8.1f}%  {kinds}")
+
+    output = args.output or f"bench_language_detect_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
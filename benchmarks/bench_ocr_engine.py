@@ -0,0 +1,94 @@
+# =============================================================================
+# OCR 엔진 호출당 오버헤드 벤치마크
+# 호출마다 tesseract 프로세스를 띄우는 pytesseract와 상주 엔진(tesserocr)의 호출당 시간 비교
+# 빈 이미지 = 순수 오버헤드(프로세스 생성, 언어 데이터 로드, 임시 파일), 한 줄 이미지 = 작은 실제 입력
+# 사용법: python benchmarks/bench_ocr_engine.py [--lang kor+eng] [--calls N]
+# =============================================================================
+
+import argparse
+import os
+import sys
+import time
+
+# 저장소 루트를 모듈 검색 경로에 추가 (benchmarks/ 폴더에서 직접 실행하기 위함)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+import ocr_engine
+from ocr_core import pixmap_to_image
+
+# 자식 프로세스(tesseract) CPU 시간 측정용 모듈 (Windows에는 없음)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SAMPLE_LINE = "The quick brown fox jumps over the lazy dog 0123456789"
+
+
+# 현재 프로세스와 자식 프로세스의 누적 CPU 시간(초)을 반환하는 함수
+def cpu_time():
+    """자기 자신 + 자식 프로세스 CPU 시간"""
+    total = time.process_time()
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+# 측정용 작은 이미지 생성
+def make_images():
+    """(이름, PIL 이미지) 목록 - 빈 이미지와 한 줄짜리 텍스트 이미지"""
+    doc = fitz.open()
+    page = doc.new_page(width=420, height=30)
+    page.insert_text((5, 20), SAMPLE_LINE, fontsize=11)
+    pix = page.get_pixmap(dpi=300, colorspace=fitz.csGRAY, alpha=False)
+    # 픽셀맵을 닫기 전에 복사본을 만들어 둠
+    line = pixmap_to_image(pix).copy()
+    blank = line.point(lambda value: 255)
+    pix = None
+    doc.close()
+    for image in (line, blank):
+        image.format = "PPM"
+    return [("빈 이미지", blank), ("한 줄", line)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 엔진 호출당 오버헤드 벤치마크")
+    parser.add_argument("--lang", default="kor+eng", help="OCR 언어")
+    parser.add_argument("--calls", type=int, default=20, help="이미지당 호출 횟수")
+    args = parser.parse_args()
+
+    images = make_images()
+    results = {}
+    print(f"{'엔진':<14}{'입력':<10}{'ms/호출':>10}{'CPU ms/호출':>14}")
+    for name in ocr_engine.available_engines():
+        engine = ocr_engine.create_engine(name)
+        # 상주 엔진의 최초 언어 데이터 로드는 한 번뿐이므로 따로 측정
+        start = time.perf_counter()
+        engine.recognize(images[0][1], args.lang)
+        first_ms = (time.perf_counter() - start) * 1000
+        for label, image in images:
+            start, start_cpu = time.perf_counter(), cpu_time()
+            for _ in range(args.calls):
+                engine.recognize(image, args.lang)
+            wall_ms = (time.perf_counter() - start) * 1000 / args.calls
+            cpu_ms = (cpu_time() - start_cpu) * 1000 / args.calls
+            results[(name, label)] = wall_ms
+            print(f"{name:<14}{label:<10}{wall_ms:10.1f}{cpu_ms:14.1f}")
+        print(f"{name:<14}{'첫 호출':<10}{first_ms:10.1f}")
+        engine.close()
+
+    # 빈 이미지 호출 시간 차이 = 상주 엔진이 호출마다 아끼는 오버헤드
+    engines = ocr_engine.available_engines()
+    if len(engines) > 1:
+        saved = results[(ocr_engine.ENGINE_PYTESSERACT, "빈 이미지")] - \
+            results[(ocr_engine.ENGINE_TESSEROCR, "빈 이미지")]
+        print(f"\n상주 엔진이 호출마다 줄인 오버헤드: {saved:.1f}ms")
+    else:
+        print("\ntesserocr가 설치되어 있지 않아 pytesseract만 측정했습니다.")
+
+
+if __name__ == "__main__":
+    main()
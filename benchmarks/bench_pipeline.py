@@ -0,0 +1,341 @@
+# =============================================================================
+# 전체 OCR 파이프라인 벤치마크 (오프라인)
+# PIL/PyMuPDF로 한국어/영어/중국어/일본어 합성 이미지와 스캔 PDF를 만들고
+# 렌더링 → 전처리 → OCR → 쓰기 전체 과정의 처리량(페이지/초), 단계별 지연 시간 백분위수,
+# 최대 메모리(RSS), 정답 대비 문자 정확도를 측정하여 JSON으로 저장
+# 사용법: python benchmarks/bench_pipeline.py [--langs kor,eng] [--pages N] [--workers N]
+#        [--memory-budget-mb MB] [--output 결과.json] [--compare 이전결과.json]
+# =============================================================================
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# 저장소 루트를 모듈 검색 경로에 추가 (benchmarks/ 폴더에서 직접 실행하기 위함)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+import pytesseract
+from PIL import Image, ImageDraw, ImageFont
+
+import ocr_core
+import ocr_engine
+import preprocess
+from ocr_trace import Histogram
+from bench_render_policy import char_accuracy
+
+# 최대 메모리 측정용 모듈 (Windows에는 없음)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# 언어별 합성 문서에 쓸 문장 (language_combo의 언어와 같은 이름)
+SAMPLE_LINES = {
+    'eng': "The quick brown fox jumps over the lazy dog",
+    'kor': "다람쥐 헌 쳇바퀴에 타고파 한글 문서 인식 시험",
+    'chi_sim': "天地玄黄宇宙洪荒日月盈昃辰宿列张汉字识别测试",
+    'jpn': "いろはにほへとちりぬるを日本語の文字認識テスト",
+}
+
+# 한국어/중국어/일본어/라틴 문자를 모두 포함하는 글꼴 (PyMuPDF 내장, 인터넷 연결 불필요)
+CJK_FONT = fitz.Font("cjk")
+
+# 합성 페이지 크기 (A4, pt), 글꼴 크기(pt), 줄 간격 배율
+PAGE_RECT = fitz.paper_rect("a4")
+FONT_SIZE = 14
+LINE_SPACING = 1.6
+
+# 결과에 기록할 지연 시간 백분위수
+PERCENTILES = (50, 90, 99)
+# 파이프라인 단계 (PDF는 render, 이미지 파일은 load로 시작)
+STAGES = ('render', 'load', 'preprocess', 'ocr', 'write')
+
+
+# 언어 조합(예: kor+eng)에 맞는 정답 텍스트 줄 목록
+def make_lines(language, page_index, count):
+    """줄 번호 + 언어별 문장 (조합이면 언어를 번갈아 사용)"""
+    languages = language.split('+')
+    return [f"{page_index + 1}-{n + 1:02d} {SAMPLE_LINES[languages[n % len(languages)]]}"
+            for n in range(count)]
+
+
+# 한 페이지에 들어가는 줄 수
+def lines_per_page():
+    return int((PAGE_RECT.height - 144) / (FONT_SIZE * LINE_SPACING))
+
+
+# PyMuPDF로 텍스트를 그린 뒤 래스터화하여 텍스트 레이어가 없는 스캔 PDF 생성
+def make_scanned_pdf(path, language, pages, dpi, skew):
+    """정답 텍스트 목록 (페이지 순서)"""
+    truths = []
+    doc = fitz.open()
+    for index in range(pages):
+        lines = make_lines(language, index, lines_per_page())
+        source = fitz.open()
+        page = source.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+        page.insert_font(fontname="cjk", fontbuffer=CJK_FONT.buffer)
+        page.insert_text((72, 72 + FONT_SIZE), "\n".join(lines), fontname="cjk",
+                         fontsize=FONT_SIZE, lineheight=LINE_SPACING)
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+        # 스캔한 것처럼 살짝 기울여 이미지만 새 페이지에 넣음 (전처리 단계도 실제로 일하도록)
+        image = ocr_core.pixmap_to_image(pix).rotate(skew, resample=Image.Resampling.BILINEAR,
+                                                     fillcolor=255)
+        pix = None
+        source.close()
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        scanned = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+        scanned.insert_image(scanned.rect, stream=buffer.getvalue())
+        truths.append("\n".join(lines))
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+    return truths
+
+
+# PIL로 텍스트를 직접 그린 합성 이미지 파일 생성
+def make_images(folder, language, count, dpi, skew):
+    """(이미지 경로, 정답 텍스트) 목록"""
+    scale = dpi / 72
+    font = ImageFont.truetype(io.BytesIO(CJK_FONT.buffer), round(FONT_SIZE * scale))
+    size = (round(PAGE_RECT.width * scale), round(PAGE_RECT.height * scale))
+    images = []
+    for index in range(count):
+        lines = make_lines(language, index, lines_per_page())
+        image = Image.new('L', size, 255)
+        draw = ImageDraw.Draw(image)
+        for n, line in enumerate(lines):
+            draw.text((72 * scale, (72 + n * FONT_SIZE * LINE_SPACING) * scale), line,
+                      font=font, fill=0)
+        image = image.rotate(-skew, resample=Image.Resampling.BILINEAR, fillcolor=255)
+        path = os.path.join(folder, f"{language.replace('+', '_')}_{index + 1}.png")
+        image.save(path, dpi=(dpi, dpi))
+        images.append((path, "\n".join(lines)))
+    return images
+
+
+# 이미지 파일을 회색조로 읽는 함수 (파일은 바로 닫음)
+def load_image(path):
+    with Image.open(path) as image:
+        return image.convert('L')
+
+
+# 단계별 시간을 모으는 클래스
+class StageTimes:
+    """단계 이름 -> 소요 시간 히스토그램 (ocr_trace.Histogram, 밀리초)"""
+
+    def __init__(self):
+        self.samples = {}
+
+    def measure(self, stage, func, *args):
+        """func(*args)를 실행하고 소요 시간 기록"""
+        start = time.perf_counter()
+        result = func(*args)
+        self.samples.setdefault(stage, Histogram()).add((time.perf_counter() - start) * 1000)
+        return result
+
+    def summary(self):
+        """단계별 평균/백분위수 (밀리초)"""
+        return {stage: latency_summary(self.samples[stage]) for stage in STAGES
+                if stage in self.samples}
+
+
+# 소요 시간 히스토그램의 요약 (밀리초, 백분위수는 히스토그램 구간 상한으로 추정)
+def latency_summary(histogram):
+    summary = {'count': histogram.count,
+               'mean_ms': round(histogram.total_ms / histogram.count, 2)}
+    for p in PERCENTILES:
+        summary[f'p{p}_ms'] = round(histogram.percentile(p), 2)
+    return summary
+
+
+# 페이지 하나씩 단계를 나누어 실행하며 단계별 지연 시간과 정확도 측정 (현재 프로세스)
+def run_stages(pdf_path, images, truths, language, engine, preprocessor, out_path):
+    """(단계별 시간, 평균 문자 정확도)"""
+    times = StageTimes()
+    policy = ocr_core.RenderPolicy()
+    accuracies = []
+    doc = fitz.open(pdf_path)
+    with open(out_path, 'w', encoding='utf-8') as out:
+        inputs = [('pdf', page_num, truths[page_num]) for page_num in range(doc.page_count)]
+        inputs += [('image', path, truth) for path, truth in images]
+        for kind, item, truth in inputs:
+            pix = None
+            if kind == 'pdf':
+                pix, _ = times.measure('render', ocr_core.render_page, doc[item], policy)
+                image = ocr_core.pixmap_to_image(pix)
+            else:
+                image = times.measure('load', load_image, item)
+            if preprocessor is not None:
+                image = times.measure('preprocess', preprocessor, image)
+            text = times.measure('ocr', engine.recognize, image, language)
+            # 픽셀맵 메모리를 참조하는 이미지를 먼저 해제한 뒤 픽셀맵 해제
+            del image
+            pix = None
+
+            def write():
+                out.write(ocr_core.format_pdf_page(0, text, ocr_core.PAGE_SOURCE_OCR))
+                out.flush()
+            times.measure('write', write)
+            accuracies.append(char_accuracy(truth, text))
+    doc.close()
+    return times.summary(), sum(accuracies) / len(accuracies)
+
+
+# 실제 작업자 프로세스 풀로 전체 파이프라인을 실행하여 처리량 측정
+def run_throughput(pdf_path, images, language, workers, engine_name, preprocessor, out_path,
+                   memory_budget=None):
+    """{'pdf_pages_per_sec': PDF 페이지/초, 'images_per_sec': 이미지/초}"""
+    result = {}
+    page_nums = list(range(ocr_core.get_page_count(pdf_path)))
+    start = time.perf_counter()
+    with open(out_path, 'w', encoding='utf-8') as out:
+        pages = ocr_core.iter_pdf_pages(pdf_path, page_nums, language, workers,
+                                        preprocessor=preprocessor, engine=engine_name,
+                                        memory_budget=memory_budget)
+        for _ in ocr_core.write_pdf_pages(pages, out):
+            pass
+    result['pdf_pages_per_sec'] = round(len(page_nums) / (time.perf_counter() - start), 3)
+
+    start = time.perf_counter()
+    paths = [path for path, _ in images]
+    for path, text, error in ocr_core.process_image_files(paths, language, workers,
+                                                         preprocessor=preprocessor,
+                                                         engine=engine_name):
+        if error is not None:
+            raise error
+        with open(out_path, 'w', encoding='utf-8') as out:
+            out.write(text)
+    result['images_per_sec'] = round(len(paths) / (time.perf_counter() - start), 3)
+    return result
+
+
+# 현재 프로세스와 (끝난) 작업자 프로세스의 최대 메모리 (MB)
+def peak_rss_mb():
+    """{'self': MB, 'children': 가장 컸던 자식 프로세스 MB} - 측정할 수 없으면 None"""
+    if resource is None:
+        return None
+    # Linux는 KB, macOS는 바이트 단위
+    unit = 1 if sys.platform == 'darwin' else 1024
+    return {who: round(resource.getrusage(flag).ru_maxrss * unit / (1024 * 1024), 1)
+            for who, flag in (('self', resource.RUSAGE_SELF),
+                              ('children', resource.RUSAGE_CHILDREN))}
+
+
+# 설치된 Tesseract 언어 데이터 목록
+def installed_languages():
+    try:
+        return set(pytesseract.get_languages(config=''))
+    except (pytesseract.TesseractNotFoundError, OSError):
+        return None
+
+
+# 이전 결과와 비교하여 처리량/정확도 변화 출력
+def print_comparison(previous, current):
+    print(f"\n이전 결과와 비교 ({previous.get('created', '?')})")
+    for language, now in current['languages'].items():
+        before = previous.get('languages', {}).get(language)
+        if before is None:
+            continue
+        for key in ('pdf_pages_per_sec', 'images_per_sec', 'accuracy'):
+            if key in before and before[key]:
+                change = (now[key] - before[key]) / before[key] * 100
+                print(f"  {language:<10}{key:<20}{before[key]:>10}{now[key]:>10}{change:+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 OCR 파이프라인 벤치마크 (오프라인)")
+    parser.add_argument("--langs", default=",".join(language for language in ocr_core.LANGUAGES
+                                                    if language != ocr_core.LANGUAGE_AUTO),
+                        help="쉼표로 구분한 언어 목록 (기본값: 프로그램의 언어 목록 전체)")
+    parser.add_argument("--pages", type=int, default=3, help="언어별 PDF 페이지 수와 이미지 수")
+    parser.add_argument("--workers", type=int, default=ocr_core.DEFAULT_PDF_WORKERS,
+                        help="처리량 측정에 쓸 작업자 프로세스 수")
+    parser.add_argument("--dpi", type=int, default=300, help="합성 스캔 해상도")
+    parser.add_argument("--skew", type=float, default=1.0, help="합성 스캔 기울기(도)")
+    parser.add_argument("--engine", choices=ocr_engine.ENGINES, default=ocr_engine.ENGINE_AUTO,
+                        help="OCR 엔진")
+    parser.add_argument("--no-preprocess", action="store_true", help="자동 전처리를 사용하지 않음")
+    parser.add_argument("--memory-budget-mb", type=int, default=None,
+                        help="PDF 처리량 측정에 쓸 페이지 버퍼 메모리 한도 MB (최대 메모리 비교용)")
+    parser.add_argument("--output", default=None,
+                        help="결과 JSON 파일 (기본값: bench_pipeline_<날짜_시각>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    languages = [language.strip() for language in args.langs.split(",") if language.strip()]
+    installed = installed_languages()
+    if installed is None:
+        print("Tesseract를 찾을 수 없습니다.", file=sys.stderr)
+        return 1
+    preprocessor = None if args.no_preprocess else ocr_core.default_preprocessor()
+    engine = ocr_engine.create_engine(args.engine)
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'tesseract': str(pytesseract.get_tesseract_version()),
+            'pymupdf': fitz.VersionBind,
+            'engine': engine.name,
+            'numpy': preprocess.is_available(),
+        },
+        'settings': {'pages': args.pages, 'workers': args.workers, 'dpi': args.dpi,
+                     'skew': args.skew, 'preprocess': preprocessor is not None,
+                     'memory_budget_mb': args.memory_budget_mb},
+        'languages': {},
+    }
+
+    print(f"{'언어':<10}{'PDF 페이지/초':>14}{'이미지/초':>10}{'정확도':>9}  단계별 p50/p90 ms")
+    with tempfile.TemporaryDirectory() as folder:
+        out_path = os.path.join(folder, "out.txt")
+        for language in languages:
+            missing = [name for name in language.split('+') if name not in installed]
+            if missing or any(name not in SAMPLE_LINES for name in language.split('+')):
+                print(f"{language:<10}건너뜀 (언어 데이터 없음: {', '.join(missing) or language})")
+                continue
+            pdf_path = os.path.join(folder, f"{language.replace('+', '_')}.pdf")
+            truths = make_scanned_pdf(pdf_path, language, args.pages, args.dpi, args.skew)
+            images = make_images(folder, language, args.pages, args.dpi, args.skew)
+
+            stages, accuracy = run_stages(pdf_path, images, truths, language, engine,
+                                          preprocessor, out_path)
+            result = run_throughput(pdf_path, images, language, args.workers, args.engine,
+                                    preprocessor, out_path,
+                                    args.memory_budget_mb * 1024 * 1024
+                                    if args.memory_budget_mb is not None else None)
+            result['accuracy'] = round(accuracy, 4)
+            result['stages'] = stages
+            report['languages'][language] = result
+
+            stage_text = ", ".join(f"{stage} {values['p50_ms']:.0f}/{values['p90_ms']:.0f}"
+                                   for stage, values in stages.items())
+            print(f"{language:<10}{result['pdf_pages_per_sec']:14.2f}"
+                  f"{result['images_per_sec']:10.2f}{accuracy * 100:8.1f}%  {stage_text}")
+    engine.close()
+
+    report['peak_rss_mb'] = peak_rss_mb()
+    if report['peak_rss_mb'] is not None:
+        print(f"\n최대 메모리: 현재 프로세스 {report['peak_rss_mb']['self']}MB, "
+              f"작업자 프로세스 {report['peak_rss_mb']['children']}MB")
+
+    output = args.output or f"bench_pipeline_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(json.load(f), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# =============================================================================
+# 픽셀맵 → OCR 입력 변환 벤치마크
+# 기존 PNG 인코딩/디코딩 경로와 무압축 버퍼 경로의 페이지당 CPU 시간 비교
+# 사용법: python benchmarks/bench_pixmap_handoff.py [PDF 경로] [--pages N] [--ocr]
+# =============================================================================
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+# 저장소 루트를 모듈 검색 경로에 추가 (benchmarks/ 폴더에서 직접 실행하기 위함)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+import pytesseract
+from PIL import Image
+
+from ocr_core import pixmap_to_image
+
+# 자식 프로세스(tesseract) CPU 시간 측정용 모듈 (Windows에는 없음)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# 현재 프로세스와 자식 프로세스의 누적 CPU 시간(초)을 반환하는 함수
+def cpu_time():
+    """자기 자신 + 자식 프로세스 CPU 시간"""
+    total = time.process_time()
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+# 기존 방식: PNG로 인코딩한 뒤 다시 디코딩
+def png_handoff(pix):
+    """PNG 왕복 변환"""
+    return Image.open(io.BytesIO(pix.tobytes("png")))
+
+
+# 새 방식: 픽셀맵 메모리를 그대로 참조
+def raw_handoff(pix):
+    """무압축 버퍼 변환"""
+    return pixmap_to_image(pix)
+
+
+# 벤치마크용 합성 PDF 문서 생성 (입력 파일이 없을 때 사용)
+def make_sample_pdf(page_count):
+    """텍스트가 채워진 합성 PDF 생성"""
+    doc = fitz.open()
+    for page_index in range(page_count):
+        page = doc.new_page()
+        lines = [f"Page {page_index + 1} line {n}: The quick brown fox jumps over the lazy dog."
+                 for n in range(40)]
+        page.insert_text((50, 60), "\n".join(lines), fontsize=11)
+    return doc
+
+
+# 한 가지 변환 방식으로 모든 페이지를 처리하며 페이지당 CPU 시간을 측정
+def run(doc, page_nums, handoff, run_ocr, language):
+    """페이지당 평균 CPU 시간(ms) 반환"""
+    start = cpu_time()
+    for page_num in page_nums:
+        pix = doc[page_num].get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
+        image = handoff(pix)
+        if run_ocr:
+            pytesseract.image_to_string(image, lang=language)
+        else:
+            # OCR 없이 pytesseract가 하는 임시 파일 저장만 재현
+            with tempfile.NamedTemporaryFile(suffix="." + (image.format or "PNG").lower()) as f:
+                image.save(f, format=image.format or "PNG")
+        del image, pix
+    return (cpu_time() - start) * 1000 / len(page_nums)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="픽셀맵 → OCR 입력 변환 벤치마크")
+    parser.add_argument("pdf", nargs="?", help="측정할 PDF 파일 (생략하면 합성 문서 사용)")
+    parser.add_argument("--pages", type=int, default=10, help="측정할 페이지 수")
+    parser.add_argument("--ocr", action="store_true", help="Tesseract 실행까지 포함하여 측정")
+    parser.add_argument("--lang", default="eng", help="OCR 언어 (--ocr 사용시)")
+    args = parser.parse_args()
+
+    doc = fitz.open(args.pdf) if args.pdf else make_sample_pdf(args.pages)
+    page_nums = list(range(min(args.pages, len(doc))))
+
+    png_ms = run(doc, page_nums, png_handoff, args.ocr, args.lang)
+    raw_ms = run(doc, page_nums, raw_handoff, args.ocr, args.lang)
+    doc.close()
+
+    print(f"페이지 수: {len(page_nums)} (OCR 포함: {'예' if args.ocr else '아니오'})")
+    print(f"PNG 왕복 경로 : {png_ms:8.1f} ms CPU/페이지")
+    print(f"무압축 버퍼 경로: {raw_ms:8.1f} ms CPU/페이지")
+    print(f"절감률        : {(1 - raw_ms / png_ms) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# =============================================================================
+# OCR 전처리 단계별 벤치마크
+# 기울어지고 스캔 테두리가 있는 합성 페이지로 전처리 단계별 소요 시간(ms/메가픽셀) 측정
+# 사용법: python benchmarks/bench_preprocess.py [--dpi 300] [--skew 2.0] [--repeat N]
+# =============================================================================
+
+import argparse
+import os
+import sys
+import time
+
+# 저장소 루트를 모듈 검색 경로에 추가 (benchmarks/ 폴더에서 직접 실행하기 위함)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageOps
+
+import preprocess
+from ocr_core import pixmap_to_image
+
+SAMPLE_LINE = "The quick brown fox jumps over the lazy dog 0123456789"
+
+
+# 기울어지고 검은 테두리가 있는 스캔 페이지처럼 보이는 합성 이미지 생성
+def make_scanned_image(dpi, skew):
+    """회색조 PIL 이미지"""
+    doc = fitz.open()
+    page = doc.new_page(width=fitz.paper_rect("a4").width, height=fitz.paper_rect("a4").height)
+    lines = [f"{n:03d} {SAMPLE_LINE}" for n in range(40)]
+    page.insert_text((60, 80), "\n".join(lines), fontsize=11, lineheight=1.5)
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+    # 픽셀맵을 닫기 전에 복사본을 만들어 둠
+    image = pixmap_to_image(pix).copy()
+    pix = None
+    doc.close()
+    # 기울이고 스캐너 덮개처럼 검은 테두리를 덧붙임
+    image = image.rotate(skew, resample=Image.Resampling.BILINEAR, expand=True, fillcolor=255)
+    return ImageOps.expand(image, border=dpi // 10, fill=0)
+
+
+# 함수를 여러 번 실행한 평균 시간(초)
+def measure(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 전처리 단계별 벤치마크")
+    parser.add_argument("--dpi", type=int, default=300, help="합성 페이지 해상도")
+    parser.add_argument("--skew", type=float, default=2.0, help="합성 페이지 기울기(도)")
+    parser.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수")
+    args = parser.parse_args()
+
+    if not preprocess.is_available():
+        print("NumPy가 설치되어 있지 않습니다.", file=sys.stderr)
+        return 1
+
+    image = make_scanned_image(args.dpi, args.skew)
+    megapixels = image.width * image.height / 1e6
+    gray = preprocess.to_gray_array(image)
+    ink = preprocess.binarize(gray)
+
+    # 측정할 단계: (이름, 함수)
+    stages = [
+        ("회색조 변환", lambda: preprocess.to_gray_array(image)),
+        ("Otsu 이진화", lambda: preprocess.binarize(gray, preprocess.BINARIZE_OTSU)),
+        ("적응형 이진화", lambda: preprocess.binarize(gray, preprocess.BINARIZE_ADAPTIVE)),
+        ("기울기 추정", lambda: preprocess.estimate_skew(preprocess.remove_borders(ink))),
+        ("테두리 잘라내기", lambda: preprocess.content_box(ink)),
+        ("전체 (Otsu)", lambda: preprocess.Preprocessor()(image)),
+        ("전체 (적응형)", lambda: preprocess.Preprocessor(preprocess.BINARIZE_ADAPTIVE)(image)),
+    ]
+
+    print(f"페이지 {image.width}x{image.height} ({megapixels:.1f}MP), 기울기 {args.skew}도")
+    print(f"{'단계':<14}{'ms':>10}{'ms/MP':>10}")
+    for name, func in stages:
+        seconds, _ = measure(func, args.repeat)
+        print(f"{name:<14}{seconds * 1000:10.1f}{seconds * 1000 / megapixels:10.1f}")
+
+    # 보정 후 남은 기울기 확인
+    result = preprocess.Preprocessor()(image)
+    residual = preprocess.estimate_skew(preprocess.to_gray_array(result) < 128)
+    print(f"\n보정 후 남은 기울기: {residual:.2f}도, 결과 크기 {result.width}x{result.height}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
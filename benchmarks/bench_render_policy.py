@@ -0,0 +1,96 @@
+# =============================================================================
+# PDF 렌더링 해상도 정책 벤치마크
+# 기존 고정 2x 컬러 렌더링과 적응형 해상도 + 회색조 렌더링의 처리량/정확도 비교
+# 사용법: python benchmarks/bench_render_policy.py [--lang eng] [--repeat N]
+# =============================================================================
+
+import argparse
+import difflib
+import os
+import sys
+import time
+
+# 저장소 루트를 모듈 검색 경로에 추가 (benchmarks/ 폴더에서 직접 실행하기 위함)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+from ocr_core import RenderPolicy, ocr_image, pixmap_to_image, render_page
+
+# 측정할 합성 페이지 종류: (이름, 용지 크기, 글꼴 크기)
+CASES = [
+    ("A4 8pt", fitz.paper_rect("a4"), 8),
+    ("A4 11pt", fitz.paper_rect("a4"), 11),
+    ("A4 16pt", fitz.paper_rect("a4"), 16),
+    ("A2 24pt", fitz.paper_rect("a2"), 24),
+]
+
+# 비교할 렌더링 정책
+POLICIES = [
+    ("고정 2x 컬러", RenderPolicy(adaptive=False, grayscale=False)),
+    ("적응형 회색조", RenderPolicy()),
+]
+
+SAMPLE_LINE = "The quick brown fox jumps over the lazy dog 0123456789"
+
+
+# 스캔 문서처럼 텍스트 레이어가 없는 (이미지만 있는) 합성 페이지 생성
+def make_scanned_page(doc, rect, fontsize):
+    """(페이지, 정답 텍스트) 반환"""
+    source = fitz.open()
+    page = source.new_page(width=rect.width, height=rect.height)
+    line_height = fontsize * 1.5
+    count = int((rect.height - 100) / line_height)
+    lines = [f"{n:03d} {SAMPLE_LINE}" for n in range(count)]
+    page.insert_text((50, 50 + fontsize), "\n".join(lines), fontsize=fontsize,
+                     lineheight=1.5)
+    # 300 DPI 회색조로 래스터화한 이미지만 새 페이지에 넣어 텍스트 레이어 제거
+    pix = page.get_pixmap(dpi=300, colorspace=fitz.csGRAY, alpha=False)
+    scanned = doc.new_page(width=rect.width, height=rect.height)
+    scanned.insert_image(scanned.rect, pixmap=pix)
+    source.close()
+    return scanned, "\n".join(lines)
+
+
+# 정답과 OCR 결과의 문자 유사도 (공백 차이는 무시)
+def char_accuracy(truth, text):
+    """0~1 사이 문자 유사도"""
+    return difflib.SequenceMatcher(None, "".join(truth.split()), "".join(text.split()),
+                                   autojunk=False).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 렌더링 해상도 정책 벤치마크")
+    parser.add_argument("--lang", default="eng", help="OCR 언어")
+    parser.add_argument("--repeat", type=int, default=1, help="페이지당 반복 횟수")
+    args = parser.parse_args()
+
+    doc = fitz.open()
+    pages = [(name,) + make_scanned_page(doc, rect, fontsize) for name, rect, fontsize in CASES]
+
+    print(f"{'페이지':<10}{'정책':<14}{'DPI':>6}{'픽셀맵MB':>10}{'초/페이지':>10}{'정확도':>8}")
+    totals = {policy_name: [0.0, 0.0] for policy_name, _ in POLICIES}
+    for name, page, truth in pages:
+        for policy_name, policy in POLICIES:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                pix, scale = render_page(page, policy)
+                size_mb = len(pix.samples_mv) / (1024 * 1024)
+                text = ocr_image(pixmap_to_image(pix), args.lang)
+                pix = None
+            seconds = (time.perf_counter() - start) / args.repeat
+            accuracy = char_accuracy(truth, text)
+            totals[policy_name][0] += seconds
+            totals[policy_name][1] += accuracy
+            print(f"{name:<10}{policy_name:<14}{scale * 72:6.0f}{size_mb:10.1f}"
+                  f"{seconds:10.2f}{accuracy * 100:7.1f}%")
+
+    print()
+    for policy_name, (seconds, accuracy) in totals.items():
+        print(f"{policy_name:<14} 처리량 {len(pages) / seconds:6.2f} 페이지/초, "
+              f"평균 정확도 {accuracy / len(pages) * 100:5.1f}%")
+    doc.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# =============================================================================
+# 로컬 OCR HTTP 서비스 부하 벤치마크 (오프라인, localhost만 사용)
+# 같은 프로세스 안에서 ocr_server를 빈 포트로 띄우고 여러 클라이언트가 동시에 합성 이미지/PDF를 올려
+# 처리량(페이지/초), 요청 지연 시간 백분위수, 429(대기열 한도 초과) 비율, 평균 묶음 크기를 측정
+# 사용법: python benchmarks/bench_server.py [--clients N] [--requests N] [--workers N]
+#        [--max-queue N] [--batch-size N] [--lang eng] [--output 결과.json]
+# =============================================================================
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# 저장소 루트를 모듈 검색 경로에 추가 (benchmarks/ 폴더에서 직접 실행하기 위함)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ocr_core
+import ocr_server
+from ocr_trace import Histogram
+from bench_pipeline import latency_summary, make_images, make_scanned_pdf
+
+
+# 별도 스레드의 이벤트 루프에서 서버를 실행하는 함수
+def start_server(argv):
+    """(포트, 중지 함수)"""
+    args = ocr_server.build_parser().parse_args(argv)
+    ready = threading.Event()
+    state = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        state['loop'] = loop
+        state['task'] = loop.create_task(ocr_server.serve(
+            args, lambda host, port: (state.update(port=port), ready.set())))
+        try:
+            loop.run_until_complete(state['task'])
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        state['loop'].call_soon_threadsafe(state['task'].cancel)
+        thread.join()
+    return state['port'], stop
+
+
+# 파일 하나를 올리고 (상태 코드, 페이지 수, 소요 시간)을 반환하는 함수
+def upload(port, path, language):
+    with open(path, 'rb') as f:
+        data = f.read()
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/ocr?lang={language}&name={os.path.basename(path)}",
+        data=data, method='POST')
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            pages = len(json.load(response)['pages'])
+            return response.status, pages, time.perf_counter() - start
+    except urllib.error.HTTPError as e:
+        return e.code, 0, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 OCR HTTP 서비스 부하 벤치마크")
+    parser.add_argument("--clients", type=int, default=8, help="동시에 요청하는 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=32, help="전체 요청 수")
+    parser.add_argument("--workers", type=int, default=ocr_core.DEFAULT_PDF_WORKERS,
+                        help="서버 작업자 프로세스 수")
+    parser.add_argument("--max-queue", type=int, default=ocr_server.DEFAULT_MAX_QUEUE,
+                        help="서버 대기열 한도 (페이지)")
+    parser.add_argument("--batch-size", type=int, default=ocr_server.DEFAULT_BATCH_SIZE,
+                        help="서버 묶음 크기 (페이지)")
+    parser.add_argument("--lang", default="eng", help="OCR 언어")
+    parser.add_argument("--pdf-pages", type=int, default=2, help="업로드할 PDF의 페이지 수")
+    parser.add_argument("--output", default=None,
+                        help="결과 JSON 파일 (기본값: bench_server_<날짜_시각>.json)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        # 이미지 한 장과 여러 쪽 스캔 PDF를 번갈아 올림
+        image_path = make_images(folder, args.lang, 1, 300, 1.0)[0][0]
+        pdf_path = os.path.join(folder, "scan.pdf")
+        make_scanned_pdf(pdf_path, args.lang, args.pdf_pages, 300, 1.0)
+        uploads = [(image_path, pdf_path)[index % 2] for index in range(args.requests)]
+
+        port, stop = start_server(["--port", "0", "-w", str(args.workers),
+                                   "--max-queue", str(args.max_queue),
+                                   "--batch-size", str(args.batch_size), "--no-cache"])
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.clients) as clients:
+                results = list(clients.map(lambda path: upload(port, path, args.lang), uploads))
+            elapsed = time.perf_counter() - start
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                metrics = json.load(response)
+        finally:
+            stop()
+
+    statuses = {}
+    for status, _, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    pages = sum(count for _, count, _ in results)
+    latency = Histogram()
+    for status, _, seconds in results:
+        if status == 200:
+            latency.add(seconds * 1000)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'settings': vars(args),
+        'pages_per_sec': round(pages / elapsed, 3),
+        'statuses': statuses,
+        'rejected_fraction': round(statuses.get('429', 0) / len(results), 4),
+        'latency_ok': latency_summary(latency) if latency.count else None,
+        'mean_batch_size': metrics['mean_batch_size'],
+        'server': metrics,
+    }
+    print(f"처리량 {report['pages_per_sec']:.2f} 페이지/초, 응답 {statuses}, "
+          f"평균 묶음 {report['mean_batch_size']}쪽")
+    if report['latency_ok']:
+        print(f"성공 요청 지연 p50/p90/p99: {report['latency_ok']['p50_ms']:.0f}/"
+              f"{report['latency_ok']['p90_ms']:.0f}/{report['latency_ok']['p99_ms']:.0f}ms")
+
+    output = args.output or f"bench_server_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
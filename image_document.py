@@ -0,0 +1,117 @@
+# =============================================================================
+# 이미지 문서 모델
+# 원본 전체 해상도 이미지, 비파괴 전처리 작업 목록, 미리보기 피라미드를 함께 관리
+# 전처리는 필요할 때(OCR 실행 또는 미리보기)만 적용하며 결과를 캐시함
+# =============================================================================
+
+# 이미지 처리 라이브러리 - Image(이미지 로드/처리), ImageFilter(필터), ImageEnhance(향상)
+from PIL import Image, ImageFilter, ImageEnhance
+
+
+# 선명하게 - PIL의 ImageFilter.SHARPEN 필터 적용
+def _sharpen(image):
+    return image.filter(ImageFilter.SHARPEN)
+
+
+# 대비 강화 - 대비를 2.0배로 강화 (1.0이 원본, 2.0이 2배 강화)
+def _enhance_contrast(image):
+    return ImageEnhance.Contrast(image).enhance(2.0)
+
+
+# 사용할 수 있는 전처리 작업 (이름 -> 함수)
+OPERATIONS = {
+    'sharpen': _sharpen,
+    'contrast': _enhance_contrast,
+}
+
+
+# 보관할 미리보기 최대 개수 (되돌리기 등으로 다시 쓰일 수 있는 최근 미리보기)
+MAX_CACHED_PREVIEWS = 16
+
+
+# 이미지 문서 클래스
+class ImageDocument:
+    """원본 + 전처리 작업 목록 + 미리보기 캐시"""
+
+    def __init__(self, original):
+        # 원본 전체 해상도 이미지 (절대 변경하지 않음)
+        self.original = original
+        # 적용할 전처리 작업 이름 목록 (순서대로 적용)
+        self.operations = []
+        # 원본을 1/2씩 줄인 미리보기 피라미드 (0번이 원본, 필요할 때 생성)
+        self._pyramid = [original]
+        # 전체 해상도 결과 캐시 (작업 목록, 이미지)
+        self._rendered = None
+        # 미리보기 캐시 ((크기, 작업 목록) -> 이미지)
+        self._previews = {}
+
+    # 이미지 파일을 열어 문서를 만드는 함수
+    @classmethod
+    def open(cls, path):
+        """이미지 파일 불러오기"""
+        with Image.open(path) as image:
+            # 파일을 닫아도 쓸 수 있도록 픽셀 데이터를 모두 읽어 둠
+            image.load()
+            # 팔레트 이미지는 축소/대비 조정을 위해 RGB(A)로 변환
+            if image.mode == 'P':
+                return cls(image.convert('RGBA' if 'transparency' in image.info else 'RGB'))
+            return cls(image.copy())
+
+    def apply(self, name):
+        """전처리 작업 추가 (실제 필터는 OCR/미리보기 때 적용)"""
+        if name not in OPERATIONS:
+            raise ValueError(f"알 수 없는 전처리 작업: {name}")
+        self.operations.append(name)
+
+    def undo(self):
+        """마지막 전처리 작업 취소 (취소할 작업이 없으면 False)"""
+        if not self.operations:
+            return False
+        self.operations.pop()
+        return True
+
+    def reset(self):
+        """모든 전처리 작업 취소"""
+        self.operations.clear()
+
+    # 이미지에 작업 목록을 차례로 적용
+    def _apply_operations(self, image, operations):
+        for name in operations:
+            image = OPERATIONS[name](image)
+        return image
+
+    def render(self):
+        """전처리 작업을 적용한 전체 해상도 이미지 (OCR용, 같은 작업 목록이면 캐시 사용)"""
+        operations = tuple(self.operations)
+        if self._rendered is None or self._rendered[0] != operations:
+            self._rendered = (operations, self._apply_operations(self.original, operations))
+        return self._rendered[1]
+
+    # 목표 크기 이상인 가장 작은 피라미드 단계를 찾는 함수
+    def _pyramid_level(self, max_width, max_height):
+        level = 0
+        while True:
+            image = self._pyramid[level]
+            # 한 단계 더 줄여도 최종 미리보기보다 크거나 같은 동안 계속 내려감
+            if min(max_width / image.width, max_height / image.height) > 0.5:
+                return image
+            if level + 1 == len(self._pyramid):
+                if image.width < 2 or image.height < 2:
+                    return image
+                self._pyramid.append(image.reduce(2))
+            level += 1
+
+    def preview(self, max_width, max_height):
+        """캔버스 표시용 미리보기 (비율 유지, 전처리는 축소된 이미지에 적용)"""
+        key = ((max_width, max_height), tuple(self.operations))
+        preview = self._previews.get(key)
+        if preview is None:
+            # 원본이 아닌 가까운 피라미드 단계에서 줄이고 필터를 적용하므로 가벼움
+            preview = self._pyramid_level(max_width, max_height).copy()
+            preview.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+            preview = self._apply_operations(preview, self.operations)
+            # 오래된 미리보기가 계속 쌓이지 않도록 일정 개수를 넘으면 비움
+            if len(self._previews) >= MAX_CACHED_PREVIEWS:
+                self._previews.clear()
+            self._previews[key] = preview
+        return preview
@@ -0,0 +1,198 @@
+# =============================================================================
+# 페이지 레이아웃 분석 모듈 (NumPy 기반)
+# 투영 프로파일 XY-cut으로 페이지 이미지를 글 단(column)/문단 블록으로 나누고 읽는 순서로 정렬
+# 블록마다 따로 OCR하여 한 페이지 안에서도 여러 스레드가 동시에 인식할 수 있게 함
+# NumPy가 없으면 페이지 전체를 블록 하나로 취급
+# =============================================================================
+
+import statistics
+
+# 이진화/테두리 제거 함수 재사용
+import preprocess
+# 배열 연산 라이브러리 (선택사항)
+from preprocess import np
+
+# 레이아웃 분석에 사용할 축소 이미지의 최대 변 길이
+LAYOUT_SAMPLE_SIZE = 1000
+# 단/문단 사이로 볼 최소 빈 간격 (글자 줄 높이의 배수)
+MIN_GAP_LINES = 1.5
+# 블록 최소 높이 (글자 줄 높이의 배수) - 이보다 작은 문단은 위/아래 문단과 합침 (호출 수 제한)
+MIN_BLOCK_LINES = 4
+# 블록 최소 너비 (페이지 너비 비율) - 좁은 표 열이 따로 떨어지지 않도록 이웃과 합침
+MIN_BLOCK_WIDTH_FRACTION = 0.15
+# 블록 주위에 남길 여백 (축소 이미지 픽셀)
+BLOCK_MARGIN = 3
+
+
+# bool 배열에서 True가 연속된 구간 목록 (script_detect도 사용)
+def runs(mask):
+    """(시작, 끝) 목록 - 끝은 포함하지 않음"""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+# 잉크 구간 사이의 넓은 빈 간격에서 자른 구간 목록
+def _split(profile, min_gap, min_size=0):
+    """(시작, 끝) 목록 - min_size보다 작은 조각은 다음 조각과 합침"""
+    spans = runs(profile)
+    if not spans:
+        return []
+    # 넓은 빈 간격을 사이에 둔 잉크 구간끼리 묶음
+    segments = [list(spans[0])]
+    for start, end in spans[1:]:
+        if start - segments[-1][1] >= min_gap:
+            segments.append([start, end])
+        else:
+            segments[-1][1] = end
+    # 너무 작은 조각은 다음 조각과 합치고, 마지막 자투리는 앞 조각에 붙임
+    groups = []
+    for start, end in segments:
+        if groups and groups[-1][1] - groups[-1][0] < min_size:
+            groups[-1][1] = end
+        else:
+            groups.append([start, end])
+    if len(groups) > 1 and groups[-1][1] - groups[-1][0] < min_size:
+        groups[-2][1] = groups.pop()[1]
+    return [tuple(group) for group in groups]
+
+
+# 글자 줄 높이 추정 (가로 투영에서 잉크 행이 연속된 구간 높이의 중앙값)
+def _line_height(ink):
+    heights = [end - start for start, end in runs(ink.any(axis=1)) if end - start >= 2]
+    return statistics.median(heights) if heights else None
+
+
+# 영역에 세로 빈 띠(단 사이)가 있는지 확인
+def _has_columns(region, min_gap, min_width):
+    return len(_split(region.any(axis=0), min_gap, min_width)) > 1
+
+
+# 재귀 XY-cut - 세로 빈 띠(단 사이)가 있으면 왼쪽→오른쪽, 없으면 가로 빈 띠로 위→아래 분할
+def _xy_cut(ink, box, min_gap, min_width, blocks):
+    left, top, right, bottom = box
+    region = ink[top:bottom, left:right]
+    rows = runs(region.any(axis=1))
+    cols = runs(region.any(axis=0))
+    if not rows or not cols:
+        return
+    # 빈 가장자리를 잘라낸 내용 영역
+    left, right = left + cols[0][0], left + cols[-1][1]
+    top, bottom = top + rows[0][0], top + rows[-1][1]
+    region = ink[top:bottom, left:right]
+
+    columns = _split(region.any(axis=0), min_gap, min_width)
+    if len(columns) > 1:
+        for start, end in columns:
+            _xy_cut(ink, (left + start, top, left + end, bottom), min_gap, min_width, blocks)
+        return
+    # 페이지 전체에 걸친 제목 때문에 단 구분선이 끊긴 경우: 같은 단 구분선을 공유하는
+    # 이웃 띠를 다시 묶어야 단마다 위→아래로 읽힘 (띠마다 왼쪽→오른쪽으로 읽지 않도록)
+    strips = []
+    for start, end in _split(region.any(axis=1), min_gap):
+        if (strips and _has_columns(region[strips[-1][0]:strips[-1][1]], min_gap, min_width)
+                and _has_columns(region[strips[-1][0]:end], min_gap, min_width)):
+            strips[-1][1] = end
+        else:
+            strips.append([start, end])
+    if len(strips) > 1:
+        for start, end in strips:
+            _xy_cut(ink, (left, top + start, right, top + end), min_gap, min_width, blocks)
+        return
+    blocks.append((left, top, right, bottom))
+
+
+# 두 상자가 겹치는지 확인
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+# 읽는 순서로 이웃한 작은 블록을 합치는 함수 (합친 상자가 다른 블록을 덮지 않을 때만)
+def _merge_small(blocks, min_height):
+    """합쳐진 블록 목록 - 제목 한 줄 같은 작은 블록 때문에 OCR 호출이 늘지 않도록 함"""
+    groups = []
+    for index, box in enumerate(blocks):
+        if groups:
+            union_box, members = groups[-1]
+            if union_box[3] - union_box[1] < min_height or box[3] - box[1] < min_height:
+                union = (min(union_box[0], box[0]), min(union_box[1], box[1]),
+                         max(union_box[2], box[2]), max(union_box[3], box[3]))
+                # 다른 단의 블록을 덮게 되면 읽는 순서가 섞이므로 합치지 않음
+                if not any(_overlaps(union, other) for other_index, other in enumerate(blocks)
+                           if other_index not in members and other_index != index):
+                    groups[-1] = (union, members | {index})
+                    continue
+        groups.append((box, {index}))
+    return [union_box for union_box, _ in groups]
+
+
+# 블록마다 주위 여백을 더하는 함수 (이웃 블록과 겹치게 되는 쪽은 그대로 둠)
+def _add_margins(blocks, margin):
+    """여백을 더한 블록 목록 - 줄 사이에서 나눈 경계에 이웃 줄 일부가 섞이지 않도록 함"""
+    result = []
+    for index, box in enumerate(blocks):
+        others = [other for other_index, other in enumerate(blocks) if other_index != index]
+        box = list(box)
+        # 왼쪽, 위, 오른쪽, 아래 순서로 한 변씩 넓혀 봄
+        for side, delta in ((0, -margin), (1, -margin), (2, margin), (3, margin)):
+            grown = list(box)
+            grown[side] += delta
+            if not any(_overlaps(grown, other) for other in others):
+                box = grown
+        result.append(tuple(box))
+    return result
+
+
+# 블록을 가운데에 가장 가까운 줄 사이 빈 행에서 위/아래 둘로 나누는 함수
+def _split_lines(ink, box, min_height):
+    """(위 블록, 아래 블록) - 양쪽 모두 min_height 이상으로 나눌 수 없으면 None"""
+    left, top, right, bottom = box
+    middle = (top + bottom) / 2
+    best = None
+    for start, end in runs(~ink[top:bottom, left:right].any(axis=1)):
+        cut = top + (start + end) // 2
+        if cut - top >= min_height and bottom - cut >= min_height:
+            if best is None or abs(cut - middle) < abs(best - middle):
+                best = cut
+    if best is None:
+        return None
+    return (left, top, right, best), (left, best, right, bottom)
+
+
+# 페이지 이미지의 텍스트 블록을 읽는 순서대로 찾는 함수
+def find_blocks(image, min_blocks=1):
+    """(왼쪽, 위, 오른쪽, 아래) 블록 목록 (원본 이미지 좌표) - 나눌 수 없으면 빈 목록
+
+    단/문단 블록이 min_blocks개보다 적으면 가장 높은 블록부터 줄 사이에서 더 나눔
+    (문단 구분이 없는 빽빽한 한 단짜리 페이지도 여러 스레드가 나누어 인식할 수 있도록)
+    """
+    if np is None:
+        return []
+    # 축소한 회색조 이미지로 분석 (블록 경계만 찾으면 되므로 해상도가 낮아도 충분)
+    factor = max(1, -(-max(image.size) // LAYOUT_SAMPLE_SIZE))
+    sample = image if image.mode == 'L' else image.convert('L')
+    if factor > 1:
+        sample = sample.reduce(factor)
+    ink = preprocess.remove_borders(preprocess.binarize(preprocess.to_gray_array(sample)))
+
+    line_height = _line_height(ink)
+    if line_height is None:
+        return []
+    blocks = []
+    _xy_cut(ink, (0, 0, ink.shape[1], ink.shape[0]), max(2, MIN_GAP_LINES * line_height),
+            MIN_BLOCK_WIDTH_FRACTION * ink.shape[1], blocks)
+    blocks = _merge_small(blocks, MIN_BLOCK_LINES * line_height)
+    while len(blocks) < min_blocks:
+        index = max(range(len(blocks)), key=lambda i: blocks[i][3] - blocks[i][1])
+        halves = _split_lines(ink, blocks[index], MIN_BLOCK_LINES * line_height)
+        if halves is None:
+            break
+        blocks[index:index + 1] = halves
+    if len(blocks) < 2:
+        return []
+
+    # 여백을 더해 원본 좌표로 되돌림
+    width, height = image.size
+    return [(max(0, left * factor), max(0, top * factor),
+             min(width, right * factor), min(height, bottom * factor))
+            for left, top, right, bottom in _add_margins(blocks, BLOCK_MARGIN)]
@@ -13,19 +13,39 @@ os.environ['TK_SILENCE_DEPRECATION'] = '1'
 import tkinter as tk
 # tkinter 추가 위젯들 - ttk(테마 위젯), filedialog(파일선택), messagebox(메시지박스), scrolledtext(스크롤 텍스트)
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-# OCR 엔진 - Tesseract OCR을 파이썬에서 사용할 수 있게 해주는 라이브러리
-import pytesseract
-# 이미지 처리 라이브러리 - Image(이미지 로드/처리), ImageTk(tkinter용 이미지), ImageFilter(필터), ImageEnhance(향상)
-from PIL import Image, ImageTk, ImageFilter, ImageEnhance
-# PDF 처리 라이브러리 - PyMuPDF 라이브러리로 PDF를 이미지로 변환
-import fitz  # PyMuPDF
-# 입출력 스트림 처리를 위한 라이브러리
-import io
+# 이미지 처리 라이브러리 - ImageTk(tkinter용 이미지)
+from PIL import ImageTk
 # 멀티스레딩을 위한 라이브러리 - PDF 처리를 백그라운드에서 실행
 import threading
+# 백그라운드 작업이 UI 갱신 요청을 메인 스레드로 넘기기 위한 스레드 안전 큐
+import queue
 # 날짜/시간 처리를 위한 라이브러리 (현재 코드에서는 사용하지 않음)
 from datetime import datetime
 
+# OCR 핵심 처리 모듈 - GUI 없이도 사용할 수 있는 이미지/PDF OCR 함수
+import ocr_core
+# OCR 결과 디스크 캐시 - 같은 이미지/페이지를 다시 OCR하지 않도록 결과 저장
+from ocr_cache import OcrCache
+# 이미지 문서 모델 - 원본, 비파괴 전처리 작업 목록, 미리보기 캐시
+from image_document import ImageDocument
+# OCR 전처리 - 이진화, 기울기 보정, 테두리 잘라내기 (NumPy 필요)
+import preprocess
+# 구조화 결과 저장 (JSON Lines, hOCR, ALTO, 검색 가능한 PDF)
+import ocr_output
+# 이어서 처리할 수 있는 작업 (체크포인트 매니페스트)
+import ocr_job
+# 단계별 시간 측정 (처리 속도, 남은 시간, Chrome trace 내보내기)
+import ocr_trace
+
+# 백그라운드 작업의 UI 갱신 요청을 처리하는 주기 (밀리초)
+UI_POLL_MS = 50
+# 한 번에 처리할 최대 UI 갱신 요청 수 (너무 많이 쌓여도 화면이 멈추지 않도록)
+UI_EVENTS_PER_POLL = 200
+# 결과 저장 대화상자의 파일 형식 (확장자로 저장 형식 결정)
+RESULT_FILE_TYPES = [("텍스트 파일", "*.txt"), ("JSON Lines (단어/위치/신뢰도)", "*.jsonl"),
+                     ("hOCR", "*.hocr"), ("ALTO XML", "*.xml"), ("검색 가능한 PDF", "*.pdf"),
+                     ("모든 파일", "*.*")]
+
 # OCR 애플리케이션의 메인 클래스 정의
 class SimpleOCR:
     # 클래스 초기화 메서드 - 프로그램 시작시 호출됨
@@ -39,12 +59,43 @@ class SimpleOCR:
 
         # 현재 로드된 이미지를 저장할 변수 (초기값 None)
         self.current_image = None
-        # PIL 이미지 객체를 저장할 변수 (초기값 None)
-        self.current_pil_image = None
+        # 현재 이미지 문서 (원본 + 전처리 작업 목록, 초기값 None)
+        self.image_doc = None
+        # 현재 이미지 파일 경로 (검색 가능한 PDF로 저장할 때 원본 이미지로 사용)
+        self.image_path = None
+        # 마지막 이미지 OCR의 구조화 결과 (단어, 위치, 신뢰도 - 초기값 None)
+        self.image_ocr_page = None
+        # OCR 결과 캐시 (기본 경로, 처음 사용할 때 파일 생성)
+        self.ocr_cache = OcrCache()
+        # 백그라운드 작업이 보낸 UI 갱신 요청 큐 (메인 스레드에서만 위젯을 다룸)
+        self.ui_queue = queue.Queue()
+        # 실행 중인 PDF 작업의 일시정지/취소 제어 객체 (작업이 없으면 None)
+        self.pdf_job = None
 
         # 사용자 인터페이스 설정 메서드 호출
         self.setup_ui()
 
+        # UI 갱신 요청 처리 루프 시작
+        self.root.after(UI_POLL_MS, self._drain_ui_queue)
+
+    # 백그라운드 스레드에서 UI 갱신 요청을 보내는 메서드 (위젯을 직접 건드리지 않음)
+    def _post_ui(self, func, *args):
+        """메인 스레드에서 func(*args)를 실행하도록 요청"""
+        self.ui_queue.put((func, args))
+
+    # 쌓인 UI 갱신 요청을 메인 스레드에서 처리하는 메서드 (UI_POLL_MS마다 실행)
+    def _drain_ui_queue(self):
+        """UI 갱신 요청 처리"""
+        try:
+            for _ in range(UI_EVENTS_PER_POLL):
+                func, args = self.ui_queue.get_nowait()
+                func(*args)
+        except queue.Empty:
+            pass
+        finally:
+            # 다음 처리 예약
+            self.root.after(UI_POLL_MS, self._drain_ui_queue)
+
     # 전체 사용자 인터페이스 레이아웃 설정 메서드
     def setup_ui(self):
         # 그리드 가중치 설정을 먼저 설정하여 레이아웃 문제 방지
@@ -102,6 +153,8 @@ class SimpleOCR:
                   command=self.sharpen_image).pack(side='left', padx=2)
         ttk.Button(button_frame, text="대비 강화",
                   command=self.enhance_contrast).pack(side='left', padx=2)
+        ttk.Button(button_frame, text="되돌리기",
+                  command=self.undo_preprocessing).pack(side='left', padx=2)
 
         # 오른쪽 영역: OCR 결과 표시를 위한 프레임
         right_frame = ttk.LabelFrame(main_container, text="OCR 결과", padding="10")
@@ -113,11 +166,28 @@ class SimpleOCR:
 
         # "언어:" 레이블과 콤보박스
         ttk.Label(lang_frame, text="언어:").pack(side='left', padx=2)
-        self.language_var = tk.StringVar(value="kor+eng")
+        self.language_var = tk.StringVar(value=ocr_core.DEFAULT_LANGUAGE)
         self.language_combo = ttk.Combobox(lang_frame, textvariable=self.language_var,
-                                          values=['kor+eng', 'kor', 'eng', 'chi_sim', 'jpn'])
+                                          values=ocr_core.LANGUAGES)
         self.language_combo.pack(side='left', padx=2)
 
+        # OCR 전에 이진화/기울기 보정/테두리 잘라내기를 자동으로 적용하는 옵션 (PDF 탭과 공유)
+        self.auto_preprocess_var = tk.BooleanVar(value=preprocess.is_available())
+        ttk.Checkbutton(lang_frame, text="자동 전처리", variable=self.auto_preprocess_var,
+                        state='normal' if preprocess.is_available() else 'disabled'
+                        ).pack(side='left', padx=(10,2))
+
+        # 페이지를 단/문단 블록으로 나누어 여러 스레드에서 동시에 인식하는 옵션 (PDF 탭과 공유)
+        self.region_ocr_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(lang_frame, text="영역 병렬", variable=self.region_ocr_var,
+                        state='normal' if preprocess.is_available() else 'disabled'
+                        ).pack(side='left', padx=2)
+
+        # 단계별 소요 시간을 기록하여 작업이 끝나면 요약을 보여 주고 trace 파일로 저장하는 옵션 (PDF 탭과 공유)
+        self.trace_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(lang_frame, text="성능 기록",
+                        variable=self.trace_var).pack(side='left', padx=2)
+
         # "OCR 실행" 버튼
         ttk.Button(right_frame, text="OCR 실행",
                   command=self.run_image_ocr).pack(pady=5)
@@ -151,6 +221,20 @@ class SimpleOCR:
         ttk.Button(file_select_frame, text="찾아보기",
                   command=self.load_pdf).pack(side='right')
 
+        # 결과를 처리되는 대로 바로 기록할 파일 선택 영역 (비워 두면 화면에만 표시)
+        output_select_frame = ttk.Frame(file_frame)
+        output_select_frame.pack(fill='x', pady=2)
+
+        ttk.Label(output_select_frame, text="결과 파일:").pack(side='left', padx=(0,5))
+        self.pdf_output_var = tk.StringVar()
+        ttk.Entry(output_select_frame, textvariable=self.pdf_output_var, width=60).pack(side='left', fill='x', expand=True, padx=(0,5))
+        ttk.Button(output_select_frame, text="저장 위치",
+                  command=self.select_pdf_output).pack(side='right')
+        # 같은 결과 파일로 중단되었던 작업이 있으면 완료된 페이지는 건너뛰고 이어서 처리하는 옵션
+        self.pdf_resume_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(output_select_frame, text="이어서 처리",
+                        variable=self.pdf_resume_var).pack(side='right', padx=5)
+
         # 페이지 범위 선택을 위한 서브 프레임
         page_frame = ttk.Frame(file_frame)
         page_frame.pack(pady=5)
@@ -162,12 +246,56 @@ class SimpleOCR:
         ttk.Label(page_frame, text="~").pack(side='left', padx=2)
         self.end_page_var = tk.StringVar(value="1")
         ttk.Entry(page_frame, textvariable=self.end_page_var, width=5).pack(side='left', padx=2)
-        ttk.Button(page_frame, text="PDF OCR 실행",
-                  command=self.run_pdf_ocr).pack(side='left', padx=10)
+
+        # 동시에 처리할 작업자(프로세스) 수 선택 위젯
+        ttk.Label(page_frame, text="작업자 수:").pack(side='left', padx=(10,2))
+        self.pdf_workers_var = tk.StringVar(value=str(ocr_core.DEFAULT_PDF_WORKERS))
+        ttk.Spinbox(page_frame, textvariable=self.pdf_workers_var, from_=1, to=64,
+                    width=4).pack(side='left', padx=2)
+
+        # 페이지 버퍼 메모리 한도(MB) 선택 위젯 (0 = 제한 없음, 한도가 있으면 긴 페이지는 띠로 나누어 처리)
+        ttk.Label(page_frame, text="메모리 한도(MB):").pack(side='left', padx=(10,2))
+        self.pdf_memory_var = tk.StringVar(value="0")
+        ttk.Spinbox(page_frame, textvariable=self.pdf_memory_var, from_=0, to=65536,
+                    increment=256, width=6).pack(side='left', padx=2)
+
+        # 자동 전처리 옵션 (이미지 탭과 같은 설정)
+        ttk.Checkbutton(page_frame, text="자동 전처리", variable=self.auto_preprocess_var,
+                        state='normal' if preprocess.is_available() else 'disabled'
+                        ).pack(side='left', padx=(10,2))
+
+        # 영역 병렬 옵션 (이미지 탭과 같은 설정, 페이지 수가 작업자 수보다 적을 때 효과)
+        ttk.Checkbutton(page_frame, text="영역 병렬", variable=self.region_ocr_var,
+                        state='normal' if preprocess.is_available() else 'disabled'
+                        ).pack(side='left', padx=2)
+
+        # 성능 기록 옵션 (이미지 탭과 같은 설정)
+        ttk.Checkbutton(page_frame, text="성능 기록",
+                        variable=self.trace_var).pack(side='left', padx=2)
+
+        # 텍스트 레이어가 있는 페이지는 OCR 없이 바로 추출하는 옵션
+        self.use_text_layer_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(page_frame, text="텍스트 레이어 우선",
+                        variable=self.use_text_layer_var).pack(side='left', padx=(10,2))
+
+        self.pdf_run_button = ttk.Button(page_frame, text="PDF OCR 실행",
+                                         command=self.run_pdf_ocr)
+        self.pdf_run_button.pack(side='left', padx=10)
+
+        # 실행 중인 PDF 작업을 일시정지/계속하거나 취소하는 버튼
+        self.pdf_pause_button = ttk.Button(page_frame, text="일시정지", state='disabled',
+                                           command=self.toggle_pdf_pause)
+        self.pdf_pause_button.pack(side='left', padx=2)
+        self.pdf_cancel_button = ttk.Button(page_frame, text="취소", state='disabled',
+                                            command=self.cancel_pdf_ocr)
+        self.pdf_cancel_button.pack(side='left', padx=2)
 
         # PDF 처리 진행률을 표시할 프로그레스 바
         self.pdf_progress = ttk.Progressbar(file_frame, mode='determinate')
         self.pdf_progress.pack(fill='x', pady=5)
+        # 처리 속도와 남은 시간 표시 (최근 완료된 페이지들로 계산)
+        self.pdf_rate_var = tk.StringVar()
+        ttk.Label(file_frame, textvariable=self.pdf_rate_var).pack(anchor='w')
 
         # PDF OCR 결과 표시를 위한 프레임 (레이블과 테두리 포함)
         result_frame = ttk.LabelFrame(self.pdf_frame, text="PDF OCR 결과", padding="10")
@@ -181,6 +309,11 @@ class SimpleOCR:
         ttk.Button(result_frame, text="결과 저장",
                   command=self.save_pdf_result).pack(pady=5)
 
+    # 자동 전처리 옵션에 맞는 전처리기를 반환하는 메서드
+    def _selected_preprocessor(self):
+        """자동 전처리가 켜져 있으면 전처리기, 아니면 None"""
+        return ocr_core.default_preprocessor() if self.auto_preprocess_var.get() else None
+
     # 이미지 파일을 로드하는 메서드
     def load_image(self):
         """이미지 파일 불러오기"""
@@ -193,17 +326,28 @@ class SimpleOCR:
         # 사용자가 파일을 선택했는지 확인
         if file_path:
             try:
-                # PIL을 사용하여 선택된 이미지 파일 로드
-                self.current_pil_image = Image.open(file_path)
-                # 로드된 이미지를 캔버스에 표시
-                self.display_pil_image(self.current_pil_image)
+                # 선택된 이미지 파일을 원본 그대로 이미지 문서로 로드
+                self.image_doc = ImageDocument.open(file_path)
+                self.image_path = file_path
+                # 이전 이미지의 OCR 결과는 더 이상 이 이미지와 맞지 않음
+                self.image_ocr_page = None
+                # 로드된 이미지의 미리보기를 캔버스에 표시
+                self.refresh_image_preview()
             except Exception as e:
                 # 이미지 로드 실패 시 오류 메시지 표시
                 messagebox.showerror("오류", f"이미지 로드 실패: {str(e)}")
 
+    # 현재 이미지 문서의 미리보기를 캔버스에 다시 그리는 메서드
+    def refresh_image_preview(self):
+        """미리보기 갱신 (원본은 건드리지 않음)"""
+        if self.image_doc is None:
+            return
+        # 캔버스 크기에 맞는 미리보기 (축소 이미지에만 전처리를 적용하므로 가벼움)
+        self.display_pil_image(self.image_doc.preview(400, 400))
+
     # PIL 이미지를 tkinter 캔버스에 표시하는 메서드
     def display_pil_image(self, pil_image):
-        """PIL 이미지를 캔버스에 표시"""
+        """PIL 이미지를 캔버스에 표시 (이미 캔버스 크기에 맞춘 미리보기를 받음)"""
         # 이미지가 None인 경우 함수 종료
         if pil_image is None:
             return
@@ -212,10 +356,6 @@ class SimpleOCR:
         canvas_width = 400   # 캔버스 가로 크기
         canvas_height = 400  # 캔버스 세로 크기
 
-        # 이미지를 캔버스 크기에 맞게 비율 유지하면서 리사이즈
-        # LANCZOS 알고리즘을 사용하여 고품질 리샘플링
-        pil_image.thumbnail((canvas_width, canvas_height), Image.Resampling.LANCZOS)
-
         # PIL 이미지를 tkinter에서 사용할 수 있는 PhotoImage 형태로 변환
         photo = ImageTk.PhotoImage(pil_image)
         # 캔버스의 기존 내용을 모두 삭제
@@ -225,55 +365,44 @@ class SimpleOCR:
         # 이미지 객체의 참조를 유지 (가비지 컬렉션 방지)
         self.image_canvas.image = photo
 
-    # 이미지 선명도를 향상시키는 메서드
-    def sharpen_image(self):
-        """이미지 선명하게 만들기"""
+    # 이미지 문서에 전처리 작업을 추가하는 메서드
+    def _apply_preprocessing(self, name, error_label):
+        """전처리 작업 추가 후 미리보기 갱신 (전체 해상도 필터는 OCR 때 한 번만 적용)"""
         # 현재 로드된 이미지가 있는지 확인
-        if self.current_pil_image is None:
+        if self.image_doc is None:
             # 이미지가 없으면 경고 메시지 표시
             messagebox.showwarning("경고", "먼저 이미지를 불러와주세요.")
             return
 
         try:
-            # PIL의 ImageFilter.SHARPEN 필터를 적용하여 이미지 선명도 향상
-            sharpened = self.current_pil_image.filter(ImageFilter.SHARPEN)
-            # 선명하게 처리된 이미지로 현재 이미지 교체
-            self.current_pil_image = sharpened
-            # 처리된 이미지를 캔버스에 표시
-            self.display_pil_image(self.current_pil_image)
-
+            self.image_doc.apply(name)
+            # 처리된 이미지의 미리보기를 캔버스에 표시
+            self.refresh_image_preview()
         except Exception as e:
-            # 선명도 처리 실패 시 오류 메시지 표시
-            messagebox.showerror("오류", f"선명도 처리 실패: {str(e)}")
+            # 처리 실패 시 오류 메시지 표시
+            messagebox.showerror("오류", f"{error_label} 실패: {str(e)}")
+
+    # 이미지 선명도를 향상시키는 메서드
+    def sharpen_image(self):
+        """이미지 선명하게 만들기"""
+        self._apply_preprocessing('sharpen', "선명도 처리")
 
     # 이미지 대비를 강화하는 메서드
     def enhance_contrast(self):
         """이미지 대비 강화"""
-        # 현재 로드된 이미지가 있는지 확인
-        if self.current_pil_image is None:
-            # 이미지가 없으면 경고 메시지 표시
-            messagebox.showwarning("경고", "먼저 이미지를 불러와주세요.")
-            return
+        self._apply_preprocessing('contrast', "대비 강화")
 
-        try:
-            # PIL의 ImageEnhance.Contrast를 사용하여 대비 조정 객체 생성
-            enhancer = ImageEnhance.Contrast(self.current_pil_image)
-            # 대비를 2.0배로 강화 (1.0이 원본, 2.0이 2배 강화)
-            enhanced = enhancer.enhance(2.0)
-            # 대비가 강화된 이미지로 현재 이미지 교체
-            self.current_pil_image = enhanced
-            # 처리된 이미지를 캔버스에 표시
-            self.display_pil_image(self.current_pil_image)
-
-        except Exception as e:
-            # 대비 강화 실패 시 오류 메시지 표시
-            messagebox.showerror("오류", f"대비 강화 실패: {str(e)}")
+    # 마지막 전처리 작업을 취소하는 메서드
+    def undo_preprocessing(self):
+        """전처리 되돌리기"""
+        if self.image_doc is not None and self.image_doc.undo():
+            self.refresh_image_preview()
 
     # 이미지에서 OCR을 실행하는 메서드
     def run_image_ocr(self):
         """이미지 OCR 실행"""
         # 현재 로드된 이미지가 있는지 확인
-        if self.current_pil_image is None:
+        if self.image_doc is None:
             # 이미지가 없으면 경고 메시지 표시
             messagebox.showwarning("경고", "먼저 이미지를 불러와주세요.")
             return
@@ -281,13 +410,27 @@ class SimpleOCR:
         try:
             # 사용자가 선택한 OCR 언어 가져오기
             language = self.language_var.get()
-            # pytesseract를 사용하여 이미지에서 텍스트 추출
-            text = pytesseract.image_to_string(self.current_pil_image, lang=language)
-
-            # 결과 텍스트 영역의 기존 내용 삭제 (처음부터 끝까지)
-            self.image_result_text.delete(1.0, tk.END)
-            # 추출된 텍스트를 결과 영역에 삽입
-            self.image_result_text.insert(1.0, text)
+            # 전처리 작업을 적용한 전체 해상도 이미지에서 텍스트 추출 (미리보기가 아닌 원본 해상도)
+            # 영역 병렬 옵션이 켜져 있으면 블록별로 CPU 코어 수만큼 동시에 인식
+            region_workers = ocr_core.DEFAULT_PDF_WORKERS if self.region_ocr_var.get() else 1
+            # 성능 기록 옵션이 켜져 있으면 이번 OCR의 단계별 소요 시간 기록
+            trace = ocr_trace.Trace() if self.trace_var.get() else None
+            with ocr_trace.recording(trace):
+                # 전처리 작업(선명하게, 대비 향상 등)을 원본 해상도 이미지에 적용
+                with ocr_trace.stage('image_edits'):
+                    image = self.image_doc.render()
+                # 단어 위치/신뢰도까지 받아 두어 hOCR/ALTO/JSON/검색 가능한 PDF로도 저장할 수 있게 함
+                self.image_ocr_page = ocr_core.ocr_image_data(image, language, self.ocr_cache,
+                                                              self._selected_preprocessor(),
+                                                              region_workers=region_workers)
+                self.image_ocr_page['page'] = 1
+                text = self.image_ocr_page['text']
+
+                with ocr_trace.stage('ui'):
+                    # 결과 텍스트 영역의 기존 내용 삭제 (처음부터 끝까지)
+                    self.image_result_text.delete(1.0, tk.END)
+                    # 추출된 텍스트를 결과 영역에 삽입
+                    self.image_result_text.insert(1.0, text)
 
             # 추출된 텍스트가 있는지 확인 (공백 제거 후)
             if text.strip():
@@ -296,6 +439,8 @@ class SimpleOCR:
             else:
                 # 텍스트가 인식되지 않으면 경고 메시지 표시
                 messagebox.showwarning("결과", "인식된 텍스트가 없습니다.")
+            if trace is not None:
+                self._save_trace(trace)
 
         except Exception as e:
             # OCR 실행 실패 시 오류 메시지 표시
@@ -315,6 +460,98 @@ class SimpleOCR:
             # 선택된 PDF 파일 경로를 변수에 저장
             self.pdf_path_var.set(file_path)
 
+    # PDF 결과를 바로 기록할 파일을 선택하는 메서드
+    def select_pdf_output(self):
+        """PDF 결과 파일 선택"""
+        # 파일 저장 대화상자 열기
+        file_path = filedialog.asksaveasfilename(
+            title="PDF OCR 결과 파일",  # 대화상자 제목
+            defaultextension=".txt",  # 기본 확장자
+            filetypes=RESULT_FILE_TYPES  # 파일 형식 필터 (확장자로 저장 형식 결정)
+        )
+
+        # 사용자가 저장 경로를 지정했는지 확인
+        if file_path:
+            self.pdf_output_var.set(file_path)
+
+    # 실행 중인 PDF 작업을 일시정지하거나 다시 계속하는 메서드
+    def toggle_pdf_pause(self):
+        """PDF OCR 일시정지/계속"""
+        if self.pdf_job is None:
+            return
+        if self.pdf_job.paused:
+            self.pdf_job.resume()
+            self.pdf_pause_button.config(text="일시정지")
+        else:
+            # 처리 중인 페이지는 마저 끝내고 새 페이지는 시작하지 않음
+            self.pdf_job.pause()
+            self.pdf_pause_button.config(text="계속")
+
+    # 실행 중인 PDF 작업을 취소하는 메서드
+    def cancel_pdf_ocr(self):
+        """PDF OCR 취소"""
+        if self.pdf_job is not None:
+            self.pdf_job.cancel()
+            self.pdf_cancel_button.config(state='disabled')
+            self.pdf_pause_button.config(state='disabled')
+
+    # PDF 작업 시작/종료에 맞춰 버튼 상태를 바꾸는 메서드
+    def _set_pdf_running(self, running):
+        """실행 중이면 실행 버튼을 막고 일시정지/취소 버튼을 활성화"""
+        self.pdf_run_button.config(state='disabled' if running else 'normal')
+        self.pdf_pause_button.config(state='normal' if running else 'disabled', text="일시정지")
+        self.pdf_cancel_button.config(state='normal' if running else 'disabled')
+
+    # 결과 영역 끝에 텍스트를 이어 붙이는 메서드 (메인 스레드에서 실행)
+    def _append_pdf_result(self, text, trace=None):
+        """PDF 결과 영역에 텍스트 추가 (trace는 작업 스레드에서 넘겨 받은 기록)"""
+        with ocr_trace.recording(trace), ocr_trace.stage('ui'):
+            self.pdf_result_text.insert(tk.END, text)
+            # 새로 추가된 페이지가 보이도록 스크롤
+            self.pdf_result_text.see(tk.END)
+
+    # 진행률 바와 처리 속도 표시를 갱신하는 메서드 (메인 스레드에서 실행)
+    def _update_pdf_progress(self, value, status, trace=None):
+        """진행률 바 값과 '페이지/초, 남은 시간' 문구 갱신 (trace는 작업 스레드에서 넘겨 받은 기록)"""
+        with ocr_trace.recording(trace), ocr_trace.stage('ui'):
+            self.pdf_progress.config(value=value)
+            self.pdf_rate_var.set(status)
+
+    # 단계별 소요 시간 요약을 보여 주고 trace 파일로 저장하는 메서드 (메인 스레드에서 실행)
+    def _save_trace(self, trace):
+        """성능 기록 요약 표시 후 Chrome trace JSON 저장 (저장 위치를 고르지 않으면 저장하지 않음)"""
+        summary = trace.format_summary(limit=12)
+        messagebox.showinfo("성능 기록", f"단계별 소요 시간:\n{summary}\n\n"
+                                       "chrome://tracing 또는 ui.perfetto.dev에서 열 수 있는 "
+                                       "trace 파일로 저장할 수 있습니다.")
+        file_path = filedialog.asksaveasfilename(
+            title="성능 기록 저장",  # 대화상자 제목
+            defaultextension=".json",  # 기본 확장자
+            filetypes=[("Chrome trace", "*.json"), ("모든 파일", "*.*")]  # 파일 형식 필터
+        )
+        if file_path:
+            try:
+                trace.write_chrome_trace(file_path)
+            except Exception as e:
+                messagebox.showerror("오류", f"저장 실패: {str(e)}")
+
+    # 백그라운드 작업을 trace에 기록하며 실행하는 메서드 (백그라운드 스레드에서 실행)
+    def _run_recorded(self, trace, func, *args):
+        """func(*args) 실행 - trace가 있으면 끝난 뒤 요약 표시/저장 요청"""
+        with ocr_trace.recording(trace):
+            func(*args, trace=trace)
+        if trace is not None:
+            self._post_ui(self._save_trace, trace)
+
+    # PDF 작업이 끝난 뒤 화면을 정리하는 메서드 (메인 스레드에서 실행)
+    def _finish_pdf_job(self):
+        """진행률 바 리셋 및 버튼 상태 복구"""
+        self.pdf_job = None
+        # 처리 완료 후 진행률 바를 0으로 리셋
+        self.pdf_progress.config(value=0)
+        self.pdf_rate_var.set("")
+        self._set_pdf_running(False)
+
     # PDF OCR을 실행하는 메서드 (메인 스레드에서 실행)
     def run_pdf_ocr(self):
         """PDF OCR 실행"""
@@ -331,77 +568,140 @@ class SimpleOCR:
             start_page = int(self.start_page_var.get()) - 1  # 0-based index
             # 끝 페이지를 정수로 변환 (사용자 입력은 1부터 시작하므로 -1)
             end_page = int(self.end_page_var.get()) - 1
+            # 작업자 수를 정수로 변환 (최소 1개)
+            workers = max(1, int(self.pdf_workers_var.get()))
+            # 메모리 한도를 바이트로 변환 (0 이하면 제한 없음)
+            memory_mb = int(self.pdf_memory_var.get())
         except ValueError:
             # 페이지 번호가 유효하지 않으면 오류 메시지 표시
-            messagebox.showerror("오류", "올바른 페이지 번호를 입력해주세요.")
+            messagebox.showerror("오류", "올바른 페이지 번호, 작업자 수, 메모리 한도를 입력해주세요.")
             return
 
+        # 사용자가 선택한 OCR 언어와 옵션 가져오기 (메인 스레드에서 읽어서 전달)
+        language = self.language_var.get()
+        use_text_layer = self.use_text_layer_var.get()
+        output_path = self.pdf_output_var.get()
+        preprocessor = self._selected_preprocessor()
+        regions = self.region_ocr_var.get()
+        resume = self.pdf_resume_var.get()
+        memory_budget = memory_mb * 1024 * 1024 if memory_mb > 0 else None
+        # 성능 기록 옵션이 켜져 있으면 작업자 프로세스의 기록까지 모을 Trace
+        trace = ocr_trace.Trace() if self.trace_var.get() else None
+
+        # 결과 영역을 비우고 작업 제어 객체 생성
+        self.pdf_result_text.delete(1.0, tk.END)
+        self.pdf_job = ocr_core.JobControl()
+        self._set_pdf_running(True)
+
         # PDF 처리를 백그라운드 스레드에서 실행 (UI 블로킹 방지)
-        thread = threading.Thread(target=self._process_pdf, args=(pdf_path, start_page, end_page))
+        thread = threading.Thread(target=self._run_recorded,
+                                  args=(trace, self._process_pdf, pdf_path, start_page, end_page,
+                                        language, workers, use_text_layer, output_path,
+                                        preprocessor, regions, resume, memory_budget,
+                                        self.pdf_job))
         # 데몬 스레드로 설정 (메인 프로그램 종료시 함께 종료)
         thread.daemon = True
         # 스레드 시작
         thread.start()
 
     # PDF를 실제로 처리하는 메서드 (백그라운드 스레드에서 실행)
-    def _process_pdf(self, pdf_path, start_page, end_page):
-        """PDF 처리 (백그라운드)"""
+    def _process_pdf(self, pdf_path, start_page, end_page, language, workers, use_text_layer,
+                     output_path, preprocessor, regions, resume, memory_budget, control,
+                     trace=None):
+        """PDF 처리 (백그라운드) - 위젯은 직접 다루지 않고 _post_ui로 요청만 보냄"""
+        # 결과 파일 + 체크포인트 매니페스트 (결과 파일이 지정된 경우 페이지가 끝나는 대로 기록)
+        checkpoint = None
         try:
-            # PyMuPDF를 사용하여 PDF 문서 열기
-            doc = fitz.open(pdf_path)
-            # 처리할 총 페이지 수 계산 (끝 페이지+1과 문서 총 페이지 중 작은 값)
-            total_pages = min(end_page + 1, len(doc))
-
-            # 프로그레스 바의 최대값을 처리할 페이지 수로 설정
-            self.pdf_progress.config(maximum=total_pages - start_page)
-
-            # 추출된 텍스트를 저장할 리스트
-            all_text = []
-
-            # 지정된 범위의 각 페이지에 대해 처리
-            for page_num in range(start_page, total_pages):
-                # 현재 페이지 객체 가져오기
-                page = doc[page_num]
-
-                # 페이지를 이미지로 변환 (2x 해상도로 품질 향상)
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                # 픽셀맵을 PNG 바이트 데이터로 변환
-                img_data = pix.tobytes("png")
-                # 바이트 데이터를 PIL 이미지로 변환
-                pil_image = Image.open(io.BytesIO(img_data))
-
-                # 사용자가 선택한 OCR 언어 가져오기
-                language = self.language_var.get()
-                # pytesseract를 사용하여 페이지 이미지에서 텍스트 추출
-                text = pytesseract.image_to_string(pil_image, lang=language)
-
-                # 페이지 번호와 함께 추출된 텍스트를 리스트에 추가
-                all_text.append(f"=== 페이지 {page_num + 1} ===\n{text}\n")
-
-                # 진행률 바 업데이트 (현재 처리된 페이지 수)
-                self.pdf_progress.config(value=page_num - start_page + 1)
-                # GUI 업데이트 강제 실행 (백그라운드 스레드에서 UI 업데이트)
-                self.root.update()
-
-            # PDF 문서 닫기 (메모리 해제)
-            doc.close()
-
-            # 모든 페이지의 텍스트를 하나로 합치기
-            result_text = '\n'.join(all_text)
-            # 결과 텍스트 영역의 기존 내용 삭제
-            self.pdf_result_text.delete(1.0, tk.END)
-            # 추출된 모든 텍스트를 결과 영역에 삽입
-            self.pdf_result_text.insert(1.0, result_text)
-
-            # 처리 완료 메시지 표시 (처리된 페이지 수 포함)
-            messagebox.showinfo("완료", f"PDF OCR이 완료되었습니다. ({total_pages - start_page}페이지 처리)")
+            # 처리할 페이지 번호 목록 (끝 페이지+1과 문서 총 페이지 중 작은 값까지)
+            page_count = ocr_core.get_page_count(pdf_path)
+            page_nums = list(range(start_page, min(end_page + 1, page_count)))
+
+            # 메모리 한도가 있으면 상한을 넘는 긴 페이지는 해상도를 낮추는 대신 띠로 나누어 렌더링
+            render_policy = ocr_core.RenderPolicy(split_tall=memory_budget is not None)
+
+            # 결과 파일 확장자로 저장 형식 결정 (단어 위치가 필요한 형식이면 구조화 결과로 처리)
+            fmt = ocr_output.format_for_path(output_path) if output_path else ocr_output.FORMAT_TEXT
+            structured = fmt in ocr_output.STRUCTURED_FORMATS
+            # 결과 파일이 지정되었으면 진행 상태를 기록 (이어서 처리하면 완료된 페이지는 건너뜀)
+            skipped = 0
+            if output_path:
+                settings = ocr_job.job_settings(language, use_text_layer, render_policy,
+                                                preprocessor, memory_budget)
+                checkpoint = ocr_job.PdfJob(pdf_path, output_path, fmt, page_nums, settings, resume)
+                skipped = checkpoint.skipped
+
+            # 프로그레스 바의 최대값을 처리할 페이지 수로 설정 (이전 작업에서 완료된 페이지 포함)
+            self._post_ui(self.pdf_progress.config, {'maximum': len(page_nums), 'value': skipped})
+
+            # 이번 실행에서 처리할 페이지 (이전 작업에서 완료된 페이지 제외)
+            pending_pages = checkpoint.pending_pages if checkpoint else page_nums
+            # 최근 완료된 페이지들로 처리 속도와 남은 시간 계산
+            meter = ocr_trace.RateMeter(len(pending_pages))
+
+            # 페이지가 끝날 때마다 호출되는 진행률 갱신 함수 (완료 순서대로 호출됨)
+            def on_progress(done_count, total):
+                rate, eta = meter.update(done_count)
+                status = (f"{rate:.2f} 페이지/초, 남은 시간 {ocr_trace.format_eta(eta)}"
+                          if rate is not None else "")
+                # 진행률 바 업데이트 요청 (현재까지 완료된 페이지 수)
+                self._post_ui(self._update_pdf_progress, skipped + done_count, status, trace)
+
+            # 작업자 프로세스 풀에서 페이지를 병렬 처리 (결과는 페이지 순서대로 하나씩 도착)
+            # 결과 파일이 있으면 실패한 페이지에서 멈추지 않고 기록해 두었다가 다음에 다시 처리
+            pages = ocr_core.iter_pdf_pages(pdf_path, pending_pages,
+                                            language, workers, use_text_layer, on_progress,
+                                            self.ocr_cache, control, render_policy,
+                                            preprocessor=preprocessor,
+                                            regions=regions, structured=structured,
+                                            keep_going=checkpoint is not None, trace=trace,
+                                            memory_budget=memory_budget)
+            # 도착하는 페이지를 바로 결과 파일과 매니페스트에 기록
+            if checkpoint is not None:
+                pages = checkpoint.run(pages)
+
+            # 처리 경로별 페이지 수
+            counts = {}
+            for index, (page_num, result, source) in enumerate(pages):
+                counts[source] = counts.get(source, 0) + 1
+                if source == ocr_core.PAGE_SOURCE_ERROR:
+                    text = f"오류: {result}"
+                else:
+                    text = result['text'] if structured else result
+                # 페이지 사이에 빈 줄을 두고 결과 영역 끝에 이어 붙이기 요청
+                page_text = ocr_core.format_pdf_page(page_num, text, source)
+                self._post_ui(self._append_pdf_result, '\n' + page_text if index else page_text,
+                              trace)
+
+            # 처리 경로별 페이지 수 보고
+            if skipped:
+                counts["이전 작업"] = skipped
+            detail = ", ".join(f"{source}: {count}페이지" for source, count in counts.items())
+            if control.cancelled:
+                # 취소된 경우 그때까지 처리된 페이지 수 표시
+                self._post_ui(messagebox.showwarning, "취소",
+                              f"PDF OCR이 취소되었습니다. ({sum(counts.values())}페이지 처리)\n{detail}")
+            elif checkpoint is not None and checkpoint.failed:
+                # 실패한 페이지는 "이어서 처리"로 다시 실행하면 그 페이지만 다시 처리됨
+                self._post_ui(messagebox.showwarning, "일부 실패",
+                              f"{checkpoint.failed}페이지를 처리하지 못했습니다. "
+                              f"\"이어서 처리\"를 켜고 다시 실행하면 실패한 페이지만 다시 처리합니다.\n{detail}")
+            else:
+                # 처리 완료 메시지 표시 (처리된 페이지 수와 경로별 보고 포함)
+                self._post_ui(messagebox.showinfo, "완료",
+                              f"PDF OCR이 완료되었습니다. ({sum(counts.values())}페이지 처리)\n{detail}")
 
         except Exception as e:
-            # PDF 처리 실패 시 오류 메시지 표시
-            messagebox.showerror("오류", f"PDF 처리 실패: {str(e)}")
+            # PDF 처리 실패 시 오류 메시지 표시 요청
+            self._post_ui(messagebox.showerror, "오류", f"PDF 처리 실패: {str(e)}")
         finally:
-            # 처리 완료 후 진행률 바를 0으로 리셋
-            self.pdf_progress.config(value=0)
+            # 결과 파일 완성 (모든 페이지가 끝났으면 페이지 순서로 정리하고 체크포인트 삭제)
+            if checkpoint is not None:
+                try:
+                    checkpoint.close()
+                except Exception as e:
+                    self._post_ui(messagebox.showerror, "오류", f"결과 파일 저장 실패: {str(e)}")
+            # 진행률 바 리셋 및 버튼 상태 복구 요청
+            self._post_ui(self._finish_pdf_job)
 
     # 이미지 OCR 결과를 파일로 저장하는 메서드
     def save_result(self):
@@ -418,15 +718,27 @@ class SimpleOCR:
         file_path = filedialog.asksaveasfilename(
             title="결과 저장",  # 대화상자 제목
             defaultextension=".txt",  # 기본 확장자
-            filetypes=[("텍스트 파일", "*.txt"), ("모든 파일", "*.*")]  # 파일 형식 필터
+            filetypes=RESULT_FILE_TYPES  # 파일 형식 필터 (확장자로 저장 형식 결정)
         )
 
         # 사용자가 저장 경로를 지정했는지 확인
         if file_path:
             try:
-                # UTF-8 인코딩으로 텍스트 파일 쓰기
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(text)
+                fmt = ocr_output.format_for_path(file_path)
+                if fmt in ocr_output.STRUCTURED_FORMATS:
+                    # 단어 위치가 필요한 형식은 마지막 OCR의 구조화 결과로 저장 (편집한 텍스트는 반영되지 않음)
+                    if self.image_ocr_page is None:
+                        messagebox.showwarning("경고", "먼저 OCR을 실행해주세요.")
+                        return
+                    writer = ocr_output.open_writer(fmt, file_path, self.image_path)
+                    try:
+                        writer.write_page(self.image_ocr_page, image=self.image_path)
+                    finally:
+                        writer.close()
+                else:
+                    # UTF-8 인코딩으로 텍스트 파일 쓰기
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        f.write(text)
                 # 저장 완료 메시지 표시
                 messagebox.showinfo("완료", "결과가 저장되었습니다.")
             except Exception as e:
@@ -453,6 +765,12 @@ class SimpleOCR:
 
         # 사용자가 저장 경로를 지정했는지 확인
         if file_path:
+            # 구조화 결과는 화면의 텍스트로 만들 수 없으므로 실행 전에 결과 파일로 지정해야 함
+            # (모든 페이지의 단어 목록을 메모리에 모아 두지 않고 페이지가 끝나는 대로 기록)
+            if ocr_output.format_for_path(file_path) in ocr_output.STRUCTURED_FORMATS:
+                messagebox.showwarning("경고", "JSON Lines/hOCR/ALTO/검색 가능한 PDF는 실행 전에 "
+                                             "\"저장 위치\"에서 결과 파일로 지정해주세요.")
+                return
             try:
                 # UTF-8 인코딩으로 텍스트 파일 쓰기
                 with open(file_path, 'w', encoding='utf-8') as f:
@@ -0,0 +1,291 @@
+# =============================================================================
+# 명령줄 일괄 OCR 프로그램 (GUI 없음)
+# 디렉토리 트리 또는 이미지/PDF 파일 목록을 OCR하여 입력마다 결과 파일 하나를 작성
+# 사용법: python ocr_batch.py 입력... -o 출력폴더 [-l 언어] [-w 작업자수] [-p 페이지범위] [-f 형식] [--resume]
+#        [--memory-budget-mb MB] [--split-tall]
+# 진행 상태를 체크포인트 매니페스트에 기록하므로 중단된 작업은 --resume으로 이어서 처리
+# --trace 파일을 주면 단계별 소요 시간을 Chrome trace JSON으로 저장하고 요약을 출력
+# =============================================================================
+
+import argparse
+import os
+import sys
+
+# OCR 핵심 처리 모듈 (tkinter를 가져오지 않음)
+import ocr_core
+# OCR 결과 디스크 캐시
+from ocr_cache import OcrCache, DEFAULT_CACHE_MAX_BYTES
+# OCR 전처리 (이진화, 기울기 보정, 테두리 잘라내기)
+import preprocess
+# OCR 엔진 백엔드
+import ocr_engine
+# 구조화 결과 저장 (JSON Lines, hOCR, ALTO, 검색 가능한 PDF)
+import ocr_output
+# 이어서 처리할 수 있는 작업 (체크포인트 매니페스트)
+import ocr_job
+# 단계별 시간 측정 (Chrome trace 내보내기)
+import ocr_trace
+
+
+# 입력 경로 목록에서 처리할 (파일 경로, 출력용 상대 경로) 목록을 만드는 함수
+def collect_inputs(paths):
+    """디렉토리는 재귀적으로 탐색하여 지원하는 파일만 수집"""
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dir_path, dir_names, file_names in os.walk(path):
+                # 항상 같은 순서로 처리하도록 정렬
+                dir_names.sort()
+                for file_name in sorted(file_names):
+                    file_path = os.path.join(dir_path, file_name)
+                    if ocr_core.is_image_file(file_path) or ocr_core.is_pdf_file(file_path):
+                        # 디렉토리 구조를 출력 폴더에 그대로 유지
+                        inputs.append((file_path, os.path.relpath(file_path, path)))
+        elif os.path.isfile(path):
+            inputs.append((path, os.path.basename(path)))
+        else:
+            print(f"경고: 파일을 찾을 수 없습니다: {path}", file=sys.stderr)
+    return inputs
+
+
+# 입력 파일에 대응하는 결과 파일 경로 (같은 이름의 이미지/PDF가 겹치지 않도록 확장자 유지)
+def output_path_for(output_dir, rel_path, fmt=ocr_output.FORMAT_TEXT):
+    """결과 파일 경로 (입력 파일 이름 + 형식별 확장자)"""
+    return os.path.join(output_dir, rel_path + ocr_output.FORMAT_EXTENSIONS[fmt])
+
+
+# 결과 텍스트를 UTF-8 파일로 저장하는 함수
+def write_result(path, text):
+    """결과 파일 쓰기 (필요하면 폴더 생성)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+# 매니페스트에 기록할 작업 설정
+def job_settings(args):
+    """명령줄 옵션으로 만든 작업 설정"""
+    return ocr_job.job_settings(args.lang, not args.no_text_layer, args.render_policy,
+                                args.preprocessor, args.memory_budget)
+
+
+# PDF 파일 하나를 처리하는 함수
+def run_pdf(pdf_path, out_path, args):
+    """PDF OCR 후 결과 파일 작성 - 실패한 페이지가 있으면 RuntimeError"""
+    page_count = ocr_core.get_page_count(pdf_path)
+    page_nums = ocr_core.parse_page_ranges(args.pages, page_count)
+    # 페이지가 끝날 때마다 결과 파일과 매니페스트에 기록 (--resume이면 완료된 페이지는 건너뜀)
+    job = ocr_job.PdfJob(pdf_path, out_path, args.format, page_nums, job_settings(args),
+                         args.resume)
+    counts = {}
+    try:
+        pages = ocr_core.iter_pdf_pages(pdf_path, job.pending_pages, args.lang, args.workers,
+                                        not args.no_text_layer, cache=args.cache,
+                                        render_policy=args.render_policy,
+                                        preprocessor=args.preprocessor,
+                                        engine=args.engine, regions=args.regions,
+                                        structured=job.structured, keep_going=True,
+                                        trace=args.trace, memory_budget=args.memory_budget,
+                                        prefetch=args.prefetch)
+        for _, _, source in job.run(pages):
+            counts[source] = counts.get(source, 0) + 1
+    finally:
+        # 모든 페이지가 끝났으면 결과 파일을 완성하고 체크포인트 삭제
+        job.close()
+    # 처리 경로별 페이지 수 보고
+    if job.skipped:
+        counts["이전 작업"] = job.skipped
+    detail = ", ".join(f"{source} {count}" for source, count in counts.items())
+    summary = f"{sum(counts.values())}페이지 ({detail})"
+    if job.failed:
+        raise RuntimeError(f"{summary} - {job.failed}페이지 실패, --resume으로 실패한 페이지만 "
+                           f"다시 처리할 수 있습니다")
+    return summary
+
+
+# 이미지 파일들을 작업자 프로세스 풀에서 병렬 처리하는 함수
+def run_images(images, args):
+    """이미지 OCR 후 결과 파일 작성 - 실패한 파일 수 반환"""
+    failures = 0
+    if not images:
+        return failures
+    # 파일이 끝날 때마다 매니페스트에 기록 (--resume이면 완료된 파일은 건너뜀)
+    job = ocr_job.FileBatchJob(os.path.join(args.output_dir, ocr_job.BATCH_MANIFEST_NAME),
+                               dict(job_settings(args), format=args.format), args.resume)
+    out_paths = {image_path: out_path for image_path, out_path in images
+                 if not job.is_done(image_path, out_path)}
+    if len(out_paths) < len(images):
+        print(f"이전 작업에서 완료된 이미지 {len(images) - len(out_paths)}개를 건너뜁니다.")
+    structured = args.format in ocr_output.STRUCTURED_FORMATS
+    for image_path, result, error in ocr_core.process_image_files(out_paths, args.lang,
+                                                                  args.workers, args.cache,
+                                                                  args.preprocessor,
+                                                                  args.engine,
+                                                                  args.regions, structured,
+                                                                  args.trace):
+        out_path = out_paths[image_path]
+        try:
+            if error is not None:
+                raise error
+            with ocr_trace.stage('write'):
+                if structured:
+                    writer = ocr_output.open_writer(args.format, out_path, image_path)
+                    try:
+                        writer.write_page(result, image=image_path)
+                    finally:
+                        writer.close()
+                else:
+                    write_result(out_path, result)
+            job.done(image_path, out_path)
+            print(f"완료: {image_path} -> {out_path}")
+        except Exception as e:
+            failures += 1
+            job.fail(image_path, e)
+            print(f"실패: {image_path}: {e}", file=sys.stderr)
+    job.close()
+    return failures
+
+
+# 명령줄 인자 정의
+def build_parser():
+    parser = argparse.ArgumentParser(description="이미지/PDF 일괄 OCR (GUI 없음)")
+    parser.add_argument("inputs", nargs="+", help="OCR할 이미지/PDF 파일 또는 디렉토리")
+    parser.add_argument("-o", "--output-dir", default="ocr_output",
+                        help="결과 파일을 저장할 폴더 (기본값: ocr_output)")
+    parser.add_argument("-l", "--lang", default=ocr_core.DEFAULT_LANGUAGE,
+                        help=f"OCR 언어 (기본값: {ocr_core.DEFAULT_LANGUAGE}, "
+                             f"{ocr_core.LANGUAGE_AUTO}: 페이지마다 문자 체계를 감지하여 "
+                             f"필요한 언어만 사용)")
+    parser.add_argument("-w", "--workers", type=int, default=ocr_core.DEFAULT_PDF_WORKERS,
+                        help="동시에 처리할 작업자 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("-p", "--pages", default="",
+                        help="PDF 페이지 범위, 예: 1-5,8,10- (기본값: 전체)")
+    parser.add_argument("-f", "--format", choices=ocr_output.FORMATS, default=ocr_output.FORMAT_TEXT,
+                        help="결과 형식: txt, jsonl(단어/위치/신뢰도), hocr, alto, "
+                             "pdf(보이지 않는 텍스트 레이어를 얹은 검색 가능한 PDF) (기본값: %(default)s)")
+    parser.add_argument("--resume", action="store_true",
+                        help="중단되었던 같은 작업을 이어서 처리 (체크포인트 매니페스트에 완료로 기록된 "
+                             "페이지/이미지는 건너뛰고 실패했거나 남은 것만 처리)")
+    parser.add_argument("--no-text-layer", action="store_true",
+                        help="PDF 텍스트 레이어를 무시하고 모든 페이지를 OCR")
+    parser.add_argument("--fixed-scale", type=float, default=None,
+                        help="적응형 해상도 대신 고정 배율로 PDF 페이지 렌더링 (예: 2 = 144 DPI)")
+    parser.add_argument("--dpi", type=int, default=ocr_core.DEFAULT_TARGET_DPI,
+                        help="글자 높이를 모를 때 목표 렌더링 DPI (기본값: %(default)s)")
+    parser.add_argument("--color", action="store_true",
+                        help="PDF 페이지를 회색조 대신 컬러로 렌더링")
+    parser.add_argument("--max-page-mb", type=int,
+                        default=ocr_core.MAX_PAGE_BYTES // (1024 * 1024),
+                        help="페이지 하나의 렌더링 메모리 상한 MB (기본값: %(default)s)")
+    parser.add_argument("--split-tall", action="store_true",
+                        help="렌더링 메모리 상한을 넘는 긴 페이지를 해상도를 낮추는 대신 가로 띠로 나누어 OCR")
+    parser.add_argument("--memory-budget-mb", type=int, default=None,
+                        help="모든 작업자의 페이지 버퍼(픽셀맵, 전처리 사본)에 쓸 메모리 한도 MB "
+                             "(주면 작업자마다 픽셀맵 상한을 나누어 갖고 긴 페이지는 띠로 나눔)")
+    parser.add_argument("--prefetch", type=int, default=None,
+                        help="제출 창 크기 - 작업자 수 외에 작업자 풀에 더 제출해 둘 PDF 페이지 수 "
+                             "(페이지는 작업자가 꺼낼 때 렌더링되며 미리 렌더링하지 않음, "
+                             "기본값: 작업자 수)")
+    parser.add_argument("--engine", choices=ocr_engine.ENGINES, default=ocr_engine.ENGINE_AUTO,
+                        help="OCR 엔진 (기본값: %(default)s = tesserocr가 있으면 상주 엔진, "
+                             "없으면 pytesseract)")
+    parser.add_argument("--regions", action="store_true",
+                        help="파일/페이지 수가 CPU 코어보다 적을 때 페이지를 단/문단 블록으로 나누어 "
+                             "남는 코어에서 동시에 인식")
+    parser.add_argument("--no-preprocess", action="store_true",
+                        help="자동 전처리(이진화, 기울기 보정, 테두리 잘라내기)를 사용하지 않음")
+    parser.add_argument("--binarize", choices=preprocess.BINARIZE_METHODS,
+                        default=preprocess.BINARIZE_OTSU,
+                        help="이진화 방식 (기본값: %(default)s, 조명이 고르지 않으면 adaptive)")
+    parser.add_argument("--no-deskew", action="store_true", help="기울기 보정을 하지 않음")
+    parser.add_argument("--no-crop", action="store_true", help="테두리를 잘라내지 않음")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="OCR 결과 캐시를 사용하지 않음")
+    parser.add_argument("--cache-path", default=None,
+                        help="캐시 파일 경로 (기본값: ~/.cache/multilang_ocr/ocr_cache.sqlite3)")
+    parser.add_argument("--cache-size-mb", type=int,
+                        default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+                        help="캐시 용량 제한 MB (기본값: %(default)s)")
+    parser.add_argument("--trace", dest="trace_path", metavar="FILE", default=None,
+                        help="단계별 소요 시간을 Chrome trace JSON 파일로 저장 "
+                             "(chrome://tracing 또는 ui.perfetto.dev에서 열기)")
+    return parser
+
+
+# 프로그램의 메인 함수
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.workers = max(1, args.workers)
+    # PDF 페이지 렌더링 해상도 정책
+    args.render_policy = ocr_core.RenderPolicy(
+        adaptive=args.fixed_scale is None,
+        fixed_scale=args.fixed_scale or ocr_core.RENDER_SCALE,
+        target_dpi=args.dpi,
+        grayscale=not args.color,
+        max_page_bytes=args.max_page_mb * 1024 * 1024,
+        split_tall=args.split_tall)
+    # 전체 페이지 버퍼 메모리 한도 (바이트, 없으면 작업자마다 --max-page-mb까지)
+    args.memory_budget = (args.memory_budget_mb * 1024 * 1024
+                          if args.memory_budget_mb is not None else None)
+    # 자동 전처리기 (NumPy가 없으면 전처리 없이 진행)
+    args.preprocessor = None
+    if not args.no_preprocess:
+        if preprocess.is_available():
+            args.preprocessor = preprocess.Preprocessor(args.binarize, not args.no_deskew,
+                                                        not args.no_crop)
+        else:
+            print("경고: NumPy가 설치되어 있지 않아 자동 전처리를 건너뜁니다.", file=sys.stderr)
+    # tesserocr를 직접 지정했는데 설치되어 있지 않으면 작업자를 띄우기 전에 알림
+    if args.engine not in ocr_engine.available_engines() + [ocr_engine.ENGINE_AUTO]:
+        print(f"OCR 엔진을 사용할 수 없습니다: {args.engine}", file=sys.stderr)
+        return 1
+    # 결과 캐시 (작업자 프로세스들이 같은 캐시 파일을 공유)
+    args.cache = None if args.no_cache else OcrCache(args.cache_path,
+                                                     args.cache_size_mb * 1024 * 1024)
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("처리할 이미지/PDF 파일이 없습니다.", file=sys.stderr)
+        return 1
+
+    # --trace가 있으면 작업자 프로세스의 기록까지 한 Trace에 모음 (없으면 측정하지 않음)
+    args.trace = ocr_trace.Trace() if args.trace_path else None
+
+    failures = 0
+    images = []
+    with ocr_trace.recording(args.trace):
+        for file_path, rel_path in inputs:
+            out_path = output_path_for(args.output_dir, rel_path, args.format)
+            if ocr_core.is_pdf_file(file_path):
+                # PDF는 파일 하나씩, 페이지 단위로 병렬 처리
+                try:
+                    summary = run_pdf(file_path, out_path, args)
+                    print(f"완료: {file_path} -> {out_path} ({summary})")
+                except Exception as e:
+                    failures += 1
+                    print(f"실패: {file_path}: {e}", file=sys.stderr)
+            else:
+                # 이미지는 모아서 파일 단위로 병렬 처리
+                images.append((file_path, out_path))
+
+        failures += run_images(images, args)
+
+    # 단계별 소요 시간 요약 출력 및 trace 파일 저장
+    if args.trace is not None:
+        print("단계별 소요 시간:")
+        print(args.trace.format_summary())
+        args.trace.write_chrome_trace(args.trace_path)
+        print(f"trace 저장: {args.trace_path}")
+
+    # 캐시 적중/실패 횟수 보고 (캐시 파일에 누적된 값)
+    if args.cache is not None:
+        stats = args.cache.stats()
+        print(f"캐시: 적중 {stats['hits']}, 실패 {stats['misses']}, "
+              f"{stats['entries']}개 항목 / {stats['bytes'] / (1024 * 1024):.1f}MB")
+        args.cache.close()
+    return 1 if failures else 0
+
+
+# 스크립트가 직접 실행될 때만 main() 함수 호출
+if __name__ == "__main__":
+    sys.exit(main())
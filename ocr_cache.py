@@ -0,0 +1,161 @@
+# =============================================================================
+# OCR 결과 디스크 캐시
+# 이미지/렌더링된 페이지의 픽셀 해시 + OCR 설정을 키로 결과 텍스트를 SQLite에 저장
+# 용량 제한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+# =============================================================================
+
+import hashlib
+import os
+import sqlite3
+import time
+
+# 단계별 시간 측정
+import ocr_trace
+
+# 기본 캐시 용량 제한 (512MB)
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+# 기본 캐시 파일 경로 (OCR_CACHE_DIR 환경 변수로 폴더 변경 가능)
+def default_cache_path():
+    """기본 캐시 파일 경로"""
+    cache_dir = os.environ.get("OCR_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "multilang_ocr")
+    return os.path.join(cache_dir, "ocr_cache.sqlite3")
+
+
+# 픽셀 데이터와 OCR 설정으로 캐시 키를 만드는 함수
+def cache_key(pixels, language, **settings):
+    """픽셀 데이터(bytes/memoryview) + 언어 + 설정의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    # 설정은 이름순으로 정렬하여 항상 같은 키가 나오도록 함
+    digest.update(repr((language, sorted(settings.items()))).encode('utf-8'))
+    # memoryview도 그대로 받으므로 픽셀맵 메모리를 복사하지 않고 해시 가능
+    digest.update(pixels)
+    return digest.hexdigest()
+
+
+# PIL 이미지의 캐시 키를 만드는 함수
+def image_cache_key(image, language, **settings):
+    """PIL 이미지 픽셀 + 모드/크기 + 설정으로 캐시 키 생성"""
+    return cache_key(image.tobytes(), language, mode=image.mode, size=image.size, **settings)
+
+
+# OCR 결과 캐시 클래스
+class OcrCache:
+    """SQLite 기반 OCR 결과 캐시 (여러 프로세스가 같은 파일을 공유할 수 있음)"""
+
+    def __init__(self, path=None, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        # 캐시 파일 경로와 용량 제한
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        # 데이터베이스 연결은 처음 사용할 때 생성 (작업자 프로세스로 전달할 수 있도록)
+        self._conn = None
+
+    # 작업자 프로세스로 전달할 때는 경로와 설정만 넘기고 연결은 새로 만듦
+    def __getstate__(self):
+        return {'path': self.path, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['max_bytes'])
+
+    # 데이터베이스 연결 (없으면 테이블 생성)
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # 자동 커밋 모드, 다른 프로세스가 쓰는 중이면 최대 30초 대기
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            # 여러 프로세스가 동시에 읽고 쓸 수 있도록 WAL 모드 사용
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS entries ("
+                               "key TEXT PRIMARY KEY, text TEXT NOT NULL, "
+                               "size INTEGER NOT NULL, last_access REAL NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access "
+                               "ON entries (last_access)")
+            # 적중/실패 횟수 (모든 프로세스가 함께 누적)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS counters ("
+                               "name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._conn.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0)")
+            # 전체 항목 크기 합계 (put마다 같은 트랜잭션에서 갱신, 이전 버전 캐시 파일은 처음 한 번만 계산)
+            self._conn.execute("INSERT OR IGNORE INTO counters "
+                               "SELECT 'bytes', COALESCE(SUM(size), 0) FROM entries")
+        return self._conn
+
+    # 적중/실패 횟수 1 증가
+    def _count(self, conn, name):
+        conn.execute("UPDATE counters SET value = value + 1 WHERE name = ?", (name,))
+
+    def get(self, key):
+        """캐시된 텍스트 반환 (없으면 None)"""
+        with ocr_trace.stage('cache_get'):
+            conn = self._connect()
+            row = conn.execute("SELECT text FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count(conn, 'misses')
+                ocr_trace.count('cache_miss')
+                return None
+            # 최근 사용 시각 갱신 (LRU 순서 유지)
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._count(conn, 'hits')
+            ocr_trace.count('cache_hit')
+            return row[0]
+
+    def put(self, key, text):
+        """텍스트 저장 후 용량 제한을 넘으면 오래된 항목 삭제"""
+        with ocr_trace.stage('cache_put'):
+            conn = self._connect()
+            size = len(text.encode('utf-8'))
+            # 항목 저장과 크기 합계 갱신을 한 트랜잭션으로 묶어 다른 프로세스와 어긋나지 않게 함
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                             (key, text, size, time.time()))
+                self._add_bytes(conn, size - (row[0] if row else 0))
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    # 크기 합계 변경
+    def _add_bytes(self, conn, delta):
+        conn.execute("UPDATE counters SET value = value + ? WHERE name = 'bytes'", (delta,))
+
+    # 가장 오래 사용하지 않은 항목부터 삭제하여 용량 제한 이하로 유지
+    def _evict(self, conn):
+        """크기 합계가 제한 이하면 테이블을 훑지 않음 (put의 트랜잭션 안에서 호출)"""
+        total = conn.execute("SELECT value FROM counters WHERE name = 'bytes'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        freed = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            if total - freed <= self.max_bytes:
+                break
+            victims.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._add_bytes(conn, -freed)
+
+    def stats(self):
+        """적중/실패 횟수, 항목 수, 사용 용량"""
+        conn = self._connect()
+        counters = dict(conn.execute("SELECT name, value FROM counters"))
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {'hits': counters.get('hits', 0), 'misses': counters.get('misses', 0),
+                'entries': entries, 'bytes': counters.get('bytes', 0), 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        """모든 항목과 횟수 삭제"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM entries")
+        conn.execute("UPDATE counters SET value = 0")
+        conn.execute("COMMIT")
+
+    def close(self):
+        """데이터베이스 연결 닫기"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
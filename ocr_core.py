@@ -0,0 +1,1101 @@
+# =============================================================================
+# OCR 핵심 처리 모듈
+# GUI(tkinter) 없이 이미지와 PDF에서 텍스트를 추출하는 함수 모음
+# multilang_ocr.py(GUI)와 ocr_batch.py(명령줄)가 함께 사용
+# =============================================================================
+
+import copy
+import itertools
+import json
+import math
+import os
+import signal
+import statistics
+import threading
+import traceback
+# 병렬 처리를 위한 라이브러리 - PDF 페이지를 여러 프로세스에서 동시에 렌더링/OCR
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed, wait)
+
+# 이미지 처리 라이브러리
+from PIL import Image
+# PDF 처리 라이브러리 - PyMuPDF 라이브러리로 PDF를 이미지로 변환
+import fitz  # PyMuPDF
+
+# OCR 결과 디스크 캐시
+from ocr_cache import OcrCache, cache_key, image_cache_key
+# OCR 전처리 (NumPy가 있을 때만 동작)
+import preprocess
+# OCR 엔진 백엔드 (tesserocr 상주 엔진 또는 pytesseract)
+import ocr_engine
+# 페이지 레이아웃 분석 (영역 병렬 OCR용 블록 찾기)
+import layout
+# 단계별 시간 측정
+import ocr_trace
+# 문자 체계 자동 감지 (언어 'auto')
+import script_detect
+
+# 기본 OCR 언어 (한국어 + 영어)
+DEFAULT_LANGUAGE = "kor+eng"
+# 페이지마다 필요한 언어를 자동으로 고르는 언어 이름
+LANGUAGE_AUTO = script_detect.LANGUAGE_AUTO
+# 선택 가능한 OCR 언어 목록
+LANGUAGES = ['kor+eng', 'kor', 'eng', 'chi_sim', 'jpn', LANGUAGE_AUTO]
+
+# 지원하는 이미지 파일 확장자
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif', '.gif')
+# 지원하는 PDF 파일 확장자
+PDF_EXTENSIONS = ('.pdf',)
+
+# PDF 병렬 처리 기본 작업자 수 (CPU 코어 수, 알 수 없으면 1)
+DEFAULT_PDF_WORKERS = os.cpu_count() or 1
+
+# 고정 해상도 정책의 PDF 페이지 렌더링 배율 (2x = 144 DPI)
+RENDER_SCALE = 2
+
+# 적응형 해상도 정책 기본값
+# 글자 높이를 알 수 없을 때 목표 DPI (A4 기준, 더 큰 판형은 비율만큼 낮춤)
+DEFAULT_TARGET_DPI = 300
+# 렌더링 DPI 하한/상한
+MIN_RENDER_DPI = 150
+MAX_RENDER_DPI = 400
+# Tesseract가 잘 인식하는 글자(줄) 높이 (픽셀) - 10pt 글자를 300 DPI로 렌더링한 높이
+TARGET_TEXT_HEIGHT_PX = 40
+# 투영 프로파일로 잰 잉크 높이를 글꼴 크기로 환산하는 비율 (소문자 위주 줄은 글꼴 크기의 약 70%)
+INK_HEIGHT_TO_FONT_SIZE = 1.4
+# 페이지 하나의 픽셀맵이 차지할 수 있는 최대 메모리 (바이트)
+MAX_PAGE_BYTES = 64 * 1024 * 1024
+# A4 용지 면적 (pt^2) - 큰 판형의 목표 DPI를 낮출 때 기준
+A4_AREA_PT = 595 * 842
+# 페이지 하나를 OCR하는 동안 쓰는 메모리가 렌더링 픽셀맵 크기의 몇 배까지 되는지
+# (픽셀맵 + 전처리 배열/이미지 사본 + OCR 엔진 내부 사본 추정)
+PAGE_PEAK_FACTOR = 4
+# 긴 페이지를 가로 띠로 나눌 때 띠 하나의 최소 높이 (픽셀)
+MIN_BAND_HEIGHT_PX = 512
+# 띠 경계를 찾을 범위 (띠 높이에 대한 비율) - 띠 아래쪽 이 범위에서 가장 밝은(빈) 행에서 자름
+BAND_SEARCH_FRACTION = 0.2
+
+# 작업 제어(일시정지/취소) 상태를 확인하는 간격 (초)
+CONTROL_POLL_SECONDS = 0.1
+
+# 텍스트 레이어를 그대로 사용하기 위한 최소 글자 수 (공백 제외)
+MIN_TEXT_LAYER_CHARS = 20
+# 텍스트 레이어 단어 좌표를 구조화 결과의 픽셀 좌표로 나타낼 때 사용할 해상도
+TEXT_LAYER_DPI = DEFAULT_TARGET_DPI
+
+# 페이지 처리 경로 이름 (결과 보고용)
+PAGE_SOURCE_TEXT = "텍스트 레이어"
+PAGE_SOURCE_OCR = "OCR"
+PAGE_SOURCE_CACHE = "캐시"
+# 처리 중 오류가 난 페이지 (keep_going=True일 때만 결과로 전달됨)
+PAGE_SOURCE_ERROR = "실패"
+
+# 픽셀맵 채널 수에 대응하는 PIL 이미지 모드
+_PIXMAP_MODES = {1: "L", 3: "RGB", 4: "RGBA"}
+
+
+# 파일 확장자로 이미지 파일인지 확인하는 함수
+def is_image_file(path):
+    """지원하는 이미지 파일인지 확인"""
+    return path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+# 파일 확장자로 PDF 파일인지 확인하는 함수
+def is_pdf_file(path):
+    """PDF 파일인지 확인"""
+    return path.lower().endswith(PDF_EXTENSIONS)
+
+
+# 기본 전처리기 (NumPy가 없으면 None = 전처리 없음)
+def default_preprocessor():
+    """자동 전처리기 생성"""
+    return preprocess.Preprocessor() if preprocess.is_available() else None
+
+
+# 전처리기/영역 병렬/OCR 엔진 설정을 캐시 키용 딕셔너리로 변환
+def _ocr_settings(preprocessor, region_workers, engine):
+    settings = preprocessor.settings() if preprocessor is not None else {}
+    # 엔진마다 인식 결과와 신뢰도가 다르므로 엔진을 바꾸면 다른 엔진의 결과를 쓰지 않음
+    settings['engine'] = engine.name
+    # 영역별로 인식하면 결과 텍스트가 달라질 수 있으므로 따로 캐시 (기존 키는 그대로 유지)
+    if region_workers > 1:
+        settings['regions'] = True
+    return settings
+
+
+# 구조화 결과 캐시 키용 설정
+def _structured_settings(preprocessor, region_workers, engine):
+    settings = _ocr_settings(preprocessor, region_workers, engine)
+    settings['structured'] = True
+    return settings
+
+
+# 영역 병렬 OCR용 스레드 풀 (프로세스마다 하나, 처음 필요할 때 생성) - (스레드 수, 풀)
+_region_executor = None
+_region_executor_lock = threading.Lock()
+
+
+# 스레드 수에 맞는 영역 OCR 스레드 풀을 가져오는 함수
+def _get_region_executor(workers):
+    global _region_executor
+    with _region_executor_lock:
+        if _region_executor is None or _region_executor[0] != workers:
+            if _region_executor is not None:
+                _region_executor[1].shutdown(wait=False)
+            _region_executor = (workers, ThreadPoolExecutor(max_workers=workers,
+                                                            thread_name_prefix="ocr-region"))
+        return _region_executor[1]
+
+
+# 영역 병렬이면 페이지에서 블록을 찾는 함수 (아니면 빈 목록)
+def _find_blocks(image, workers):
+    if workers <= 1:
+        return []
+    with ocr_trace.stage('layout'):
+        return layout.find_blocks(image, workers)
+
+
+# 블록 이미지들을 잘라 여러 스레드에서 동시에 인식하는 함수
+def _recognize_blocks(image, blocks, recognize, workers):
+    """블록 순서대로 recognize(블록 이미지) 결과 목록"""
+    # 블록 이미지는 복사본이므로 원본(픽셀맵 참조일 수 있음)과 따로 해제 가능
+    crops = []
+    for box in blocks:
+        crop = image.crop(box)
+        crop.format = "PPM"
+        crops.append(crop)
+    # 풀 스레드에서도 지금 기록 중인 trace에 기록되도록 trace를 넘김
+    trace = ocr_trace.current()
+
+    def run(crop):
+        with ocr_trace.recording(trace):
+            return recognize(crop)
+
+    # tesseract 프로세스(pytesseract) 또는 GIL을 놓는 C API(tesserocr)가 스레드마다 동시에 실행됨
+    return list(_get_region_executor(workers).map(run, crops))
+
+
+# 페이지 이미지를 블록으로 나누어 여러 스레드에서 동시에 OCR하는 함수
+def ocr_regions(image, language=DEFAULT_LANGUAGE, engine=None, workers=DEFAULT_PDF_WORKERS):
+    """단/문단 블록별로 동시에 인식한 뒤 읽는 순서대로 합친 텍스트
+
+    블록을 찾지 못하면 (NumPy 없음, 한 덩어리 페이지) 이미지 전체를 한 번에 인식
+    """
+    if engine is None:
+        engine = ocr_engine.get_engine()
+    language = resolve_language(image, language, engine)
+    blocks = _find_blocks(image, workers)
+    if not blocks:
+        return engine.recognize(image, language)
+    texts = _recognize_blocks(image, blocks, lambda crop: engine.recognize(crop, language), workers)
+    # 블록(문단) 사이는 빈 줄 하나로 구분
+    return "\n\n".join(text.strip() for text in texts if text.strip()) + "\n"
+
+
+# 언어가 'auto'이면 이미지에 필요한 가장 작은 언어 조합을 고르는 함수
+def resolve_language(image, language, engine=None):
+    """OCR에 사용할 Tesseract 언어 조합 ('auto'가 아니면 그대로 반환)"""
+    if not script_detect.is_auto(language):
+        return language
+    with ocr_trace.stage('script_detect'):
+        language = script_detect.detect_language(image, engine)
+    ocr_trace.count(f"language {language}")
+    return language
+
+
+# 이미지에서 단어 목록을 인식하는 함수 (영역 병렬이면 블록별로 인식한 뒤 합침)
+def _recognize_words(image, language, engine, region_workers):
+    blocks = _find_blocks(image, region_workers)
+    if not blocks:
+        return engine.recognize_data(image, language)
+
+    results = _recognize_blocks(image, blocks,
+                                lambda crop: engine.recognize_data(crop, language), region_workers)
+    words = []
+    base = {'block': 0, 'par': 0, 'line': 0}
+    for (left, top, _, _), block_words in zip(blocks, results):
+        _append_words(words, block_words, base, left, top)
+    return words
+
+
+# 부분 이미지(블록, 가로 띠)에서 인식한 단어를 페이지 단어 목록에 이어 붙이는 함수
+def _append_words(words, part_words, base, left, top):
+    """좌표를 (left, top)만큼 옮기고, 부분마다 1부터 다시 매겨진 블록/문단/줄 번호를
+    base(지금까지의 마지막 번호)에 이어서 페이지 전체 순번으로 바꿈"""
+    for word in part_words:
+        x0, y0, x1, y1 = word['bbox']
+        word['bbox'] = [x0 + left, y0 + top, x1 + left, y1 + top]
+        for name in base:
+            word[name] += base[name]
+    if part_words:
+        for name in base:
+            base[name] = max(word[name] for word in part_words)
+    words.extend(part_words)
+
+
+# 단어 목록에서 텍스트를 다시 만드는 함수
+def words_to_text(words):
+    """같은 줄의 단어는 공백, 줄은 줄바꿈, 문단 사이는 빈 줄로 이은 텍스트"""
+    lines = []
+    previous = None
+    for word in words:
+        if previous is not None and (word['par'], word['line']) == previous:
+            lines[-1] += ' ' + word['text']
+        else:
+            if previous is not None and word['par'] != previous[0]:
+                lines.append('')
+            lines.append(word['text'])
+        previous = (word['par'], word['line'])
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+# 페이지 구조화 결과를 만드는 함수
+def make_page(words, width, height, language, dpi=None):
+    """{'language', 'width', 'height', 'dpi', 'text', 'words'} - 좌표는 width x height 픽셀 기준"""
+    return {'language': language, 'width': width, 'height': height, 'dpi': dpi,
+            'text': words_to_text(words), 'words': words}
+
+
+# 이미지 파일에 기록된 해상도 (없으면 None)
+def _image_dpi(image):
+    dpi = image.info.get('dpi')
+    return round(float(dpi[0]), 2) if dpi and dpi[0] else None
+
+
+# 전처리 → 단어 인식 → 원본 좌표로 되돌리기까지 한 번에 하는 함수
+def _structured_page(image, language, preprocessor, engine, region_workers, dpi):
+    width, height = image.size
+    transform = None
+    if preprocessor is not None:
+        image, transform = preprocessor.process(image)
+    # 언어 자동 선택은 기울기 보정/이진화가 끝난 이미지로 판단
+    language = resolve_language(image, language, engine)
+    words = _recognize_words(image, language, engine, region_workers)
+    # 전처리(잘라내기/기울기 보정) 전 원본 이미지 좌표로 되돌림
+    if transform is not None:
+        for word in words:
+            word['bbox'] = list(preprocess.original_box(transform, word['bbox']))
+    return make_page(words, width, height, language, dpi)
+
+
+# PIL 이미지에서 텍스트를 추출하는 함수
+def ocr_image(image, language=DEFAULT_LANGUAGE, cache=None, preprocessor=None, engine=None,
+              region_workers=1):
+    """이미지 OCR 실행 (cache가 있으면 같은 픽셀/설정의 결과를 재사용)
+
+    preprocessor(Preprocessor)가 있으면 Tesseract 실행 전에 적용 (캐시 적중시 생략)
+    engine(엔진 객체)을 생략하면 프로세스 전역 기본 엔진 사용
+    region_workers가 2 이상이면 단/문단 블록으로 나누어 그만큼의 스레드에서 동시에 인식
+    language가 'auto'이면 이미지마다 문자 체계를 감지하여 필요한 언어만 사용
+    """
+    if engine is None:
+        engine = ocr_engine.get_engine()
+    key = None
+    if cache is not None:
+        # 원본 픽셀 + 전처리/엔진 설정으로 키를 만들어 적중하면 전처리까지 건너뜀
+        key = image_cache_key(image, language,
+                              **_ocr_settings(preprocessor, region_workers, engine))
+        text = cache.get(key)
+        if text is not None:
+            return text
+    if preprocessor is not None:
+        image = preprocessor(image)
+    language = resolve_language(image, language, engine)
+    if region_workers > 1:
+        text = ocr_regions(image, language, engine, region_workers)
+    else:
+        text = engine.recognize(image, language)
+    if key is not None:
+        cache.put(key, text)
+    return text
+
+
+# PIL 이미지에서 단어, 위치, 신뢰도를 추출하는 함수
+def ocr_image_data(image, language=DEFAULT_LANGUAGE, cache=None, preprocessor=None, engine=None,
+                   region_workers=1, dpi=None):
+    """이미지 OCR 구조화 결과 (make_page 형식) - 단어 좌표는 전처리 전 원본 이미지 픽셀 기준
+
+    dpi를 생략하면 이미지 파일에 기록된 해상도 사용
+    """
+    if engine is None:
+        engine = ocr_engine.get_engine()
+    key = None
+    if cache is not None:
+        key = image_cache_key(image, language,
+                              **_structured_settings(preprocessor, region_workers, engine))
+        cached = cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+    page = _structured_page(image, language, preprocessor, engine, region_workers,
+                            dpi if dpi is not None else _image_dpi(image))
+    if key is not None:
+        cache.put(key, json.dumps(page, ensure_ascii=False))
+    return page
+
+
+# 열어 둔 이미지 파일의 픽셀을 디코딩하는 함수 (PIL은 처음 접근할 때 디코딩하므로 미리 측정)
+def _load_image(image):
+    with ocr_trace.stage('load'):
+        image.load()
+
+
+# 이미지 파일을 열어 텍스트를 추출하는 함수
+def ocr_image_file(path, language=DEFAULT_LANGUAGE, cache=None, preprocessor=None, engine=None,
+                   region_workers=1):
+    """이미지 파일 OCR 실행"""
+    with Image.open(path) as image:
+        _load_image(image)
+        return ocr_image(image, language, cache, preprocessor, engine, region_workers)
+
+
+# 이미지 파일을 열어 구조화 결과를 만드는 함수
+def ocr_image_file_data(path, language=DEFAULT_LANGUAGE, cache=None, preprocessor=None,
+                        engine=None, region_workers=1):
+    """이미지 파일 OCR 구조화 결과 (페이지 번호 1)"""
+    with Image.open(path) as image:
+        _load_image(image)
+        page = ocr_image_data(image, language, cache, preprocessor, engine, region_workers)
+    page['page'] = 1
+    return page
+
+
+# "1-3,5,8-" 형식의 페이지 범위 문자열을 0부터 시작하는 페이지 번호 목록으로 변환
+def parse_page_ranges(spec, page_count):
+    """페이지 범위 문자열 해석 (1부터 시작, 끝을 생략하면 마지막 페이지까지)"""
+    # 범위를 지정하지 않으면 전체 페이지
+    if not spec or not spec.strip():
+        return list(range(page_count))
+
+    pages = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start_text, end_text = part.split('-', 1)
+            start = int(start_text) if start_text.strip() else 1
+            end = int(end_text) if end_text.strip() else page_count
+        else:
+            start = end = int(part)
+        if start < 1 or end < start:
+            raise ValueError(f"잘못된 페이지 범위: {part}")
+        # 문서 길이를 넘는 부분은 잘라냄
+        pages.update(range(start - 1, min(end, page_count)))
+    return sorted(pages)
+
+
+# PDF 결과에서 한 페이지의 텍스트를 머리글과 함께 형식화하는 함수
+def format_pdf_page(page_num, text, source):
+    """페이지 머리글 + 텍스트 (머리글에 처리 경로 표시)"""
+    return f"=== 페이지 {page_num + 1} ({source}) ===\n{text}\n"
+
+
+# PyMuPDF 픽셀맵을 PNG 인코딩 없이 PIL 이미지로 변환하는 함수
+def pixmap_to_image(pix):
+    """픽셀맵 메모리를 그대로 감싸는 PIL 이미지 생성 (복사/압축 없음)"""
+    mode = _PIXMAP_MODES[pix.n]
+    # 픽셀맵의 샘플 메모리를 복사하지 않고 참조 (stride로 행 간격 지정)
+    # 주의: 반환된 이미지를 사용하는 동안 pix 객체가 살아 있어야 함
+    image = Image.frombuffer(mode, (pix.width, pix.height), pix.samples_mv,
+                             "raw", mode, pix.stride, 1)
+    # pytesseract가 임시 파일을 쓸 때 PNG 압축 대신 무압축 PPM/PGM 형식을 사용하도록 지정
+    image.format = "PPM"
+    return image
+
+
+# PDF 페이지의 텍스트 레이어에서 쓸 만한 텍스트를 추출하는 함수
+def extract_text_layer(page):
+    """텍스트 레이어가 충분하면 텍스트를, 아니면 None 반환"""
+    text = page.get_text("text")
+    # 공백과 글리프 매핑 실패 문자(U+FFFD)를 제외한 실제 글자만 계산
+    real_chars = sum(1 for ch in text if not ch.isspace() and ch != "\ufffd")
+    if real_chars < MIN_TEXT_LAYER_CHARS:
+        return None
+    return text
+
+
+# PDF 페이지의 텍스트 레이어 단어로 구조화 결과를 만드는 함수
+def text_layer_page(page, text, language=DEFAULT_LANGUAGE):
+    """텍스트 레이어 구조화 결과 (make_page 형식, 좌표는 TEXT_LAYER_DPI 픽셀, 신뢰도 100)"""
+    scale = TEXT_LAYER_DPI / 72
+    # 단어 좌표는 회전 전 페이지 기준이므로 렌더링되는 (화면에 보이는) 방향으로 바꿈
+    matrix = page.rotation_matrix * fitz.Matrix(scale, scale)
+    words = []
+    lines = {}
+    for x0, y0, x1, y1, word_text, block, line, _ in page.get_text("words"):
+        rect = fitz.Rect(x0, y0, x1, y1) * matrix
+        # PDF 텍스트에는 문단 구분이 없으므로 블록을 문단으로 사용
+        line_id = lines.setdefault((block, line), len(lines) + 1)
+        words.append(ocr_engine.make_word(word_text, 100, (round(rect.x0), round(rect.y0),
+                                                           round(rect.x1), round(rect.y1)),
+                                          block + 1, block + 1, line_id))
+    # 언어 자동 선택이면 추출한 글자 종류로 언어를 기록
+    if script_detect.is_auto(language):
+        language = script_detect.language_for_text(text)
+    result = make_page(words, round(page.rect.width * scale), round(page.rect.height * scale),
+                       language, TEXT_LAYER_DPI)
+    # 텍스트는 텍스트 모드와 같은 추출 결과를 그대로 사용
+    result['text'] = text
+    return result
+
+
+# 페이지의 글자 높이(pt)를 추정하는 함수
+def estimate_text_height(page):
+    """텍스트 레이어 글꼴 크기의 중앙값, 없으면 72 DPI 투영 프로파일의 줄 높이 중앙값 (모르면 None)"""
+    # 1) 텍스트 레이어가 있으면 글꼴 크기를 그대로 사용
+    sizes = [span["size"]
+             for block in page.get_text("dict")["blocks"]
+             for line in block.get("lines", ())
+             for span in line["spans"] if span["text"].strip()]
+    if sizes:
+        return statistics.median(sizes)
+
+    # 2) 72 DPI 회색조로 빠르게 렌더링하여 행별 평균 밝기(가로 투영)를 구함
+    pix = page.get_pixmap(colorspace=fitz.csGRAY, alpha=False)
+    probe = pixmap_to_image(pix)
+    rows = list(probe.resize((1, pix.height), Image.BOX).getdata())
+    # 픽셀맵 메모리를 참조하는 이미지를 먼저 해제한 뒤 픽셀맵 해제
+    del probe
+    pix = None
+    if not rows:
+        return None
+
+    # 배경보다 눈에 띄게 어두운 행이 연속된 구간을 글자 줄로 보고 높이 측정 (1pt = 1px)
+    threshold = max(rows) - 4
+    heights = []
+    run = 0
+    for value in rows + [255]:
+        if value < threshold:
+            run += 1
+        else:
+            if run >= 2:
+                heights.append(run)
+            run = 0
+    # 줄이 너무 적으면 추정값을 믿기 어려움
+    if len(heights) < 3:
+        return None
+    return statistics.median(heights) * INK_HEIGHT_TO_FONT_SIZE
+
+
+# PDF 페이지 렌더링 해상도 정책 클래스
+class RenderPolicy:
+    """페이지마다 렌더링 배율과 색 공간을 정하는 정책 (작업자 프로세스로 전달 가능)
+
+    adaptive=True이면 글자 높이가 TARGET_TEXT_HEIGHT_PX가 되도록 배율을 정하고
+    (글자 높이를 모르면 판형에 따라 낮춘 target_dpi), min_dpi~max_dpi로 제한함.
+    adaptive=False이면 예전처럼 fixed_scale 배율을 그대로 사용.
+    어느 경우든 픽셀맵 크기는 max_page_bytes를 넘지 않음 - split_tall=True이면 해상도를 낮추는 대신
+    페이지를 가로 띠로 나누어 띠 하나씩 렌더링 (band_rects)
+    release_store=True이면 작업자가 페이지마다 MuPDF 내부 저장소(이미지/글꼴 캐시)를 비움
+    """
+
+    def __init__(self, adaptive=True, fixed_scale=RENDER_SCALE, target_dpi=DEFAULT_TARGET_DPI,
+                 min_dpi=MIN_RENDER_DPI, max_dpi=MAX_RENDER_DPI, grayscale=True,
+                 max_page_bytes=MAX_PAGE_BYTES, split_tall=False, release_store=False):
+        self.adaptive = adaptive
+        self.fixed_scale = fixed_scale
+        self.target_dpi = target_dpi
+        self.min_dpi = min_dpi
+        self.max_dpi = max_dpi
+        # OCR에는 색이 필요 없으므로 기본은 회색조 (메모리 1/3)
+        self.grayscale = grayscale
+        self.max_page_bytes = max_page_bytes
+        self.split_tall = split_tall
+        self.release_store = release_store
+
+    @property
+    def channels(self):
+        return 1 if self.grayscale else 3
+
+    @property
+    def colorspace(self):
+        return fitz.csGRAY if self.grayscale else fitz.csRGB
+
+    def choose_scale(self, page):
+        """페이지 렌더링 배율 결정 (72 DPI = 1.0)"""
+        width, height = page.rect.width, page.rect.height
+        if not self.adaptive:
+            scale = self.fixed_scale
+        else:
+            text_height = estimate_text_height(page)
+            if text_height:
+                scale = TARGET_TEXT_HEIGHT_PX / text_height
+            else:
+                # 판형이 클수록 글자도 크다고 보고 목표 DPI를 면적 비율만큼 낮춤
+                area_ratio = min(1.0, math.sqrt(A4_AREA_PT / max(width * height, 1.0)))
+                scale = self.target_dpi * area_ratio / 72
+            scale = min(max(scale, self.min_dpi / 72), self.max_dpi / 72)
+
+        # 메모리 상한은 DPI 하한보다 우선함
+        if self.split_tall:
+            # 띠로 나누면 페이지 높이는 상관없으므로 최소 높이의 띠 하나가 상한을 넘지 않을 만큼만 제한
+            max_scale = self.max_page_bytes / max(width * self.channels * MIN_BAND_HEIGHT_PX, 1.0)
+        else:
+            max_scale = math.sqrt(self.max_page_bytes / max(width * height * self.channels, 1.0))
+        return min(scale, max_scale)
+
+    def band_rects(self, page, scale):
+        """scale로 렌더링한 페이지가 max_page_bytes를 넘으면 나누어 렌더링할 가로 띠 사각형(pt) 목록
+
+        split_tall=False이거나 한 번에 렌더링해도 되면 None
+        """
+        rect = page.rect
+        # 픽셀맵 크기는 바깥쪽으로 반올림되므로 한 픽셀씩 여유를 둠
+        row_bytes = (math.ceil(rect.width * scale) + 1) * self.channels
+        if not self.split_tall or row_bytes * (rect.height * scale + 1) <= self.max_page_bytes:
+            return None
+        band_pt = (self.max_page_bytes // row_bytes - 2) / scale
+        return [fitz.Rect(rect.x0, top, rect.x1, bottom)
+                for top, bottom in _band_breaks(page, band_pt, self.max_page_bytes)]
+
+    def with_memory_budget(self, page_budget):
+        """페이지 하나를 처리하는 동안 page_budget 바이트 정도만 쓰도록 제한한 사본
+
+        픽셀맵 상한을 page_budget / PAGE_PEAK_FACTOR로 낮추고, 긴 페이지는 해상도를 낮추는 대신
+        띠로 나누며, 페이지마다 MuPDF 저장소를 비움
+        """
+        policy = copy.copy(self)
+        policy.max_page_bytes = min(self.max_page_bytes, max(1, page_budget // PAGE_PEAK_FACTOR))
+        policy.split_tall = True
+        policy.release_store = True
+        return policy
+
+
+# 페이지를 band_pt 높이 이하의 가로 띠로 나누는 함수 (글자 줄을 자르지 않도록 빈 행에서 자름)
+def _band_breaks(page, band_pt, max_bytes):
+    """[(위, 아래)] pt 좌표 목록 - 띠 아래쪽 BAND_SEARCH_FRACTION 범위에서 가장 밝은 행을 경계로 사용"""
+    rect = page.rect
+    # 최대 72 DPI 회색조로 빠르게 렌더링하여 행별 평균 밝기(가로 투영)를 구함
+    probe_scale = min(1.0, math.sqrt(max_bytes / max(rect.width * rect.height, 1.0)))
+    pix = page.get_pixmap(matrix=fitz.Matrix(probe_scale, probe_scale), colorspace=fitz.csGRAY,
+                          alpha=False)
+    probe = pixmap_to_image(pix)
+    rows = list(probe.resize((1, pix.height), Image.BOX).getdata())
+    # 픽셀맵 메모리를 참조하는 이미지를 먼저 해제한 뒤 픽셀맵 해제
+    del probe
+    pix = None
+
+    band = max(1, int(band_pt * probe_scale))
+    search = max(1, int(band * BAND_SEARCH_FRACTION))
+    breaks = []
+    top = 0
+    while len(rows) - top > band:
+        end = top + band
+        # 가장 밝은 행 (같으면 띠가 커지도록 아래쪽 행)
+        cut = max(range(end - search, end), key=lambda y: (rows[y], y))
+        breaks.append((top, cut))
+        top = cut
+    breaks.append((top, len(rows)))
+    return [(rect.y0 + start / probe_scale, min(rect.y1, rect.y0 + end / probe_scale))
+            for start, end in breaks]
+
+
+# 정책에 따라 페이지를 픽셀맵으로 렌더링하는 함수
+def render_page(page, policy, clip=None, scale=None):
+    """(픽셀맵, 배율) 반환 - OCR에는 알파 채널 불필요
+
+    clip(pt 사각형)을 주면 그 부분만 렌더링, scale을 생략하면 정책으로 결정
+    """
+    if scale is None:
+        scale = policy.choose_scale(page)
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=policy.colorspace,
+                          alpha=False, clip=clip)
+    return pix, scale
+
+
+# 작업자 프로세스마다 한 번만 열어 두는 PDF 문서 객체, 결과 캐시, 렌더링 정책, OCR 엔진
+_worker_doc = None
+_worker_cache = None
+_worker_policy = None
+_worker_preprocessor = None
+_worker_engine = None
+_worker_region_workers = 1
+
+
+# 영역 병렬 모드에서 작업자 프로세스 하나가 쓸 스레드 수 (남는 CPU 코어를 나누어 씀)
+def _region_workers_per_process(regions, workers):
+    return max(1, DEFAULT_PDF_WORKERS // workers) if regions else 1
+
+
+# 이미지 작업자 프로세스 초기화 함수 - 프로세스 시작시 한 번 호출됨
+def _init_image_worker(cache, preprocessor, engine_name, region_workers):
+    """작업자 프로세스의 결과 캐시, 전처리기, OCR 엔진, 영역 병렬 스레드 수 설정"""
+    global _worker_cache, _worker_preprocessor, _worker_engine, _worker_region_workers
+    global _region_executor, _region_executor_lock
+    # fork 방식에서는 부모의 영역 OCR 스레드 풀이 (스레드 없이) 복사되므로 버리고 새로 만듦
+    _region_executor = None
+    _region_executor_lock = threading.Lock()
+    # fork 방식에서는 부모의 SQLite 연결이 복사될 수 있으므로 항상 새 연결을 쓰는 사본 사용
+    _worker_cache = OcrCache(cache.path, cache.max_bytes) if cache is not None else None
+    _worker_preprocessor = preprocessor
+    # 엔진은 이름만 전달받아 작업자마다 새로 만듦 (상주 엔진은 프로세스 사이에 공유 불가)
+    _worker_engine = ocr_engine.create_engine(engine_name)
+    _worker_region_workers = region_workers
+
+
+# PDF 작업자 프로세스 초기화 함수 - 프로세스 시작시 한 번 호출됨
+def _init_pdf_worker(pdf_path, cache, render_policy, preprocessor, engine_name, region_workers):
+    """작업자 프로세스에서 PDF 문서 열기"""
+    global _worker_doc, _worker_policy
+    # 취소할 때 작업자와 그 자식 프로세스(pytesseract가 띄운 tesseract)를 한 번에 종료할 수 있도록
+    # 작업자마다 자기 프로세스 그룹을 가짐 (POSIX만)
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+    # 페이지마다 다시 열지 않도록 프로세스 전역 변수에 문서 보관
+    _worker_doc = fitz.open(pdf_path)
+    _worker_policy = render_policy
+    _init_image_worker(cache, preprocessor, engine_name, region_workers)
+
+
+# PDF 작업자 프로세스를 처리 중인 페이지와 함께 바로 종료하는 함수
+def _terminate_pdf_workers(executor):
+    """작업자 프로세스 그룹(작업자 + tesseract 자식 프로세스)에 SIGTERM을 보낸 뒤 풀 정리
+
+    프로세스 그룹을 만들기 전이거나 POSIX가 아니면 작업자 프로세스만 종료함
+    """
+    # 풀이 작업자 프로세스 목록을 공개하지 않으므로 내부 목록을 사용
+    for process in list((executor._processes or {}).values()):
+        try:
+            if hasattr(os, 'killpg'):
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+        except ProcessLookupError:
+            process.terminate()
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+# 이미지 파일 하나를 OCR하는 함수 (작업자 프로세스에서 실행)
+def _ocr_image_file_worker(path, language, structured=False):
+    """이미지 파일 OCR (작업자 프로세스) - structured=True이면 구조화 결과"""
+    ocr = ocr_image_file_data if structured else ocr_image_file
+    return path, ocr(path, language, _worker_cache, _worker_preprocessor, _worker_engine,
+                     _worker_region_workers)
+
+
+# PDF 한 페이지를 렌더링하고 OCR을 실행하는 함수 (작업자 프로세스에서 실행)
+def _ocr_pdf_page(page_num, language, use_text_layer, structured=False):
+    """PDF 페이지 한 장 OCR (작업자 프로세스) - structured=True이면 텍스트 대신 구조화 결과"""
+    # 메모리 한도가 있으면 이전 페이지가 MuPDF 저장소에 남긴 이미지/글꼴 캐시를 비움
+    if _worker_policy.release_store:
+        fitz.TOOLS.store_shrink(100)
+    # 현재 페이지 객체 가져오기
+    page = _worker_doc[page_num]
+
+    # 텍스트 레이어 우선 모드: 이미 텍스트가 있는 페이지는 렌더링/OCR 생략
+    if use_text_layer:
+        with ocr_trace.stage('text_layer'):
+            text = extract_text_layer(page)
+        if text is not None:
+            if structured:
+                text = _with_page_info(text_layer_page(page, text, language), page_num,
+                                       PAGE_SOURCE_TEXT)
+            return page_num, text, PAGE_SOURCE_TEXT
+
+    # 렌더링 정책에 따라 페이지를 이미지로 변환 (메모리 상한을 넘는 긴 페이지는 띠로 나누어 처리)
+    with ocr_trace.stage('render'):
+        scale = _worker_policy.choose_scale(page)
+        bands = _worker_policy.band_rects(page, scale)
+        if bands is None:
+            pix, _ = render_page(page, _worker_policy, scale=scale)
+    if bands is not None:
+        result = _ocr_page_bands(page, bands, scale, language, structured)
+        if structured:
+            result = _with_page_info(result, page_num, PAGE_SOURCE_OCR)
+        return page_num, result, PAGE_SOURCE_OCR
+    ocr_trace.count('render_bytes', len(pix.samples_mv))
+
+    # 렌더링된 픽셀이 같은 페이지는 캐시된 결과를 그대로 사용 (픽셀맵 메모리를 복사 없이 해시)
+    key = None
+    if _worker_cache is not None:
+        settings = (_structured_settings if structured else _ocr_settings)(
+            _worker_preprocessor, _worker_region_workers, _worker_engine)
+        key = cache_key(pix.samples_mv, language, width=pix.width, height=pix.height,
+                        channels=pix.n, scale=round(scale, 4), **settings)
+        text = _worker_cache.get(key)
+        if text is not None:
+            if structured:
+                text = _with_page_info(json.loads(text), page_num, PAGE_SOURCE_CACHE)
+            return page_num, text, PAGE_SOURCE_CACHE
+
+    # 픽셀맵 메모리를 PNG 인코딩/디코딩 없이 바로 PIL 이미지로 사용
+    pil_image = pixmap_to_image(pix)
+    try:
+        if structured:
+            # 단어 좌표는 렌더링된 페이지 픽셀 기준 (dpi = 배율 x 72)
+            result = _structured_page(pil_image, language, _worker_preprocessor, _worker_engine,
+                                      _worker_region_workers, round(scale * 72, 2))
+            del pil_image
+            pix = None
+            if key is not None:
+                _worker_cache.put(key, json.dumps(result, ensure_ascii=False))
+            return page_num, _with_page_info(result, page_num, PAGE_SOURCE_OCR), PAGE_SOURCE_OCR
+
+        if _worker_preprocessor is not None:
+            # 전처리 결과는 새 이미지이므로 픽셀맵은 OCR 전에 바로 해제
+            preprocessed = _worker_preprocessor(pil_image)
+            del pil_image
+            pix = None
+            pil_image = preprocessed
+        # 작업자에 상주하는 OCR 엔진으로 페이지 이미지에서 텍스트 추출
+        text = ocr_image(pil_image, language, engine=_worker_engine,
+                         region_workers=_worker_region_workers)
+    except BaseException as e:
+        # 오류 추적 정보에 남은 안쪽 함수(OCR 엔진 등)의 지역 변수도 이미지를 참조하므로 먼저 비움
+        traceback.clear_frames(e.__traceback__)
+        raise
+    finally:
+        # 픽셀맵 메모리를 참조하는 이미지를 먼저 해제한 뒤 픽셀맵 해제 (OCR이 실패해도 같은 순서)
+        pil_image = None
+        pix = None
+    if key is not None:
+        _worker_cache.put(key, text)
+    # 결과를 원래 순서로 되돌릴 수 있도록 페이지 번호와 처리 경로를 함께 반환
+    return page_num, text, PAGE_SOURCE_OCR
+
+
+# 긴 페이지를 가로 띠 하나씩 렌더링/OCR하여 합치는 함수 (작업자 프로세스에서 실행)
+def _ocr_page_bands(page, bands, scale, language, structured):
+    """페이지 텍스트 또는 구조화 결과 (단어 좌표는 페이지 전체를 scale로 렌더링한 픽셀 기준)
+
+    한 번에 띠 하나의 픽셀맵만 메모리에 있음 (페이지 전체 픽셀맵이 없으므로 결과 캐시는 사용하지 않음)
+    """
+    texts, words, languages = [], [], []
+    base = {'block': 0, 'par': 0, 'line': 0}
+    dpi = round(scale * 72, 2)
+    for clip in bands:
+        with ocr_trace.stage('render'):
+            pix, _ = render_page(page, _worker_policy, clip=clip, scale=scale)
+        ocr_trace.count('render_bytes', len(pix.samples_mv))
+        ocr_trace.count('render_bands')
+        image = pixmap_to_image(pix)
+        try:
+            if structured:
+                band = _structured_page(image, language, _worker_preprocessor, _worker_engine,
+                                        _worker_region_workers, dpi)
+                # 띠 안의 좌표를 페이지 좌표로 옮김
+                _append_words(words, band['words'], base, 0,
+                              round((clip.y0 - page.rect.y0) * scale))
+                languages += [name for name in band['language'].split('+')
+                              if name not in languages]
+            else:
+                if _worker_preprocessor is not None:
+                    # 전처리 결과는 새 이미지이므로 픽셀맵은 OCR 전에 바로 해제
+                    preprocessed = _worker_preprocessor(image)
+                    image = None
+                    pix = None
+                    image = preprocessed
+                texts.append(ocr_image(image, language, engine=_worker_engine,
+                                       region_workers=_worker_region_workers))
+        except BaseException as e:
+            traceback.clear_frames(e.__traceback__)
+            raise
+        finally:
+            # 다음 띠를 렌더링하기 전에 이 띠의 이미지와 픽셀맵을 해제
+            image = None
+            pix = None
+    if structured:
+        return make_page(words, round(page.rect.width * scale), round(page.rect.height * scale),
+                         '+'.join(languages), dpi)
+    # 띠 경계는 줄 사이이므로 띠 사이는 줄바꿈 하나로 이음
+    return "\n".join(text.strip() for text in texts if text.strip()) + "\n"
+
+
+# 구조화 결과에 페이지 번호(1부터)와 처리 경로를 적는 함수 (캐시에는 넣지 않는 정보)
+def _with_page_info(result, page_num, source):
+    result['page'] = page_num + 1
+    result['source'] = source
+    return result
+
+
+# 백그라운드 작업의 일시정지/취소 상태를 주고받는 클래스
+class JobControl:
+    """작업 제어 (UI 스레드에서 pause/resume/cancel, 작업 스레드에서 상태 확인)"""
+
+    def __init__(self):
+        # 취소 요청 여부
+        self._cancel_event = threading.Event()
+        # 실행 허용 여부 (해제되면 일시정지)
+        self._run_event = threading.Event()
+        self._run_event.set()
+
+    def cancel(self):
+        """작업 취소 (일시정지 중이어도 바로 깨어나도록 실행 허용)"""
+        self._cancel_event.set()
+        self._run_event.set()
+
+    def pause(self):
+        """새 페이지 시작 중지"""
+        self._run_event.clear()
+
+    def resume(self):
+        """일시정지 해제"""
+        self._run_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def paused(self):
+        return not self._run_event.is_set()
+
+    def wait_if_paused(self):
+        """일시정지 중이면 재개/취소될 때까지 대기 - 계속 진행해도 되면 True"""
+        self._run_event.wait()
+        return not self.cancelled
+
+
+# PDF 문서의 총 페이지 수를 확인하는 함수
+def get_page_count(pdf_path):
+    """PDF 총 페이지 수"""
+    with fitz.open(pdf_path) as doc:
+        return len(doc)
+
+
+# PDF의 지정된 페이지들을 병렬로 OCR 처리하며 결과를 한 페이지씩 내보내는 제너레이터
+def iter_pdf_pages(pdf_path, page_nums, language=DEFAULT_LANGUAGE, workers=DEFAULT_PDF_WORKERS,
+                   use_text_layer=True, on_progress=None, cache=None, control=None,
+                   render_policy=None, preprocessor=None, engine=None, regions=False,
+                   structured=False, keep_going=False, trace=None, memory_budget=None,
+                   prefetch=None):
+    """PDF 페이지 병렬 OCR - (페이지 번호, 텍스트, 처리 경로)를 페이지 순서대로 생성
+
+    on_progress(완료 페이지 수, 전체 페이지 수)는 페이지가 끝날 때마다 (완료 순서대로) 호출됨
+    cache(OcrCache)를 주면 작업자 프로세스들이 같은 캐시 파일을 공유함
+    control(JobControl)로 일시정지/취소할 수 있으며, 취소되면 남은 페이지 없이 종료됨
+    render_policy(RenderPolicy)를 생략하면 적응형 해상도 + 회색조 렌더링 사용
+    preprocessor(Preprocessor)가 있으면 OCR하는 페이지마다 Tesseract 실행 전에 적용
+    engine(엔진 이름)을 생략하면 tesserocr가 있을 때 상주 엔진, 없으면 pytesseract 사용
+    regions=True이면 페이지 수가 CPU 코어보다 적을 때 남는 코어로 페이지 안의 블록을 동시에 인식
+    structured=True이면 텍스트 대신 구조화 결과(단어, 위치, 신뢰도 - make_page 형식에
+    page/source가 추가된 딕셔너리)를 생성
+    keep_going=True이면 페이지 하나가 실패해도 멈추지 않고 (페이지 번호, 예외, PAGE_SOURCE_ERROR)를 생성
+    trace(ocr_trace.Trace)를 주면 작업자 프로세스의 단계별 측정 기록을 페이지마다 합침
+    memory_budget(바이트)을 주면 모든 작업자의 페이지 버퍼(픽셀맵, 전처리 사본)가 합쳐서 그 안에
+    들도록 작업자마다 픽셀맵 상한을 낮추고, 상한을 넘는 긴 페이지는 해상도를 낮추는 대신 가로 띠로
+    나누어 처리함 (OCR 엔진/언어 데이터 메모리는 제외)
+    prefetch(기본값: 작업자 수)는 작업자 수 외에 작업자 풀에 더 제출해 둘 페이지 수 (제출 창 크기,
+    렌더링은 작업자가 페이지를 꺼낼 때 함)
+    처리 중이거나 순서를 기다리는 페이지는 작업자 수 + prefetch를 넘지 않으므로
+    문서 길이와 상관없이 메모리 사용량이 일정함
+    """
+    page_nums = list(page_nums)
+    if not page_nums:
+        return
+
+    if render_policy is None:
+        render_policy = RenderPolicy()
+
+    # 페이지 수보다 많은 작업자는 필요 없음
+    workers = max(1, min(workers, len(page_nums)))
+    # 제출 창 크기 - 동시에 붙잡아 둘 수 있는 페이지 수 (처리 중 + 제출되어 대기 중 + 순서 대기 중)
+    window = workers + (workers if prefetch is None else max(0, prefetch))
+    # 메모리 한도를 작업자 수로 나누어 작업자마다 한 번에 처리하는 페이지 하나의 한도로 사용
+    if memory_budget is not None:
+        render_policy = render_policy.with_memory_budget(memory_budget // workers)
+
+    # 처리 중인 작업 (future -> 페이지 번호)
+    pending = {}
+    # 먼저 끝났지만 앞 페이지를 기다리는 결과 (페이지 번호 -> 결과)
+    ready = {}
+    # 아직 제출하지 않은 페이지와 다음에 내보낼 페이지 위치
+    to_submit = iter(page_nums)
+    next_index = 0
+    done_count = 0
+    # 이전 반복에서 일시정지 상태였는지 (일시정지가 시작될 때 한 번만 대기 중인 작업을 되돌림)
+    was_paused = False
+
+    # 작업자 프로세스 풀 생성 - 각 프로세스가 PDF를 한 번 열고 페이지를 렌더링/OCR
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_pdf_worker,
+                                   initargs=(pdf_path, cache, render_policy, preprocessor,
+                                             engine,
+                                             _region_workers_per_process(regions, workers)))
+    try:
+        while control is None or not control.cancelled:
+            paused = control is not None and control.paused
+            if paused and not was_paused:
+                # 제출했지만 아직 시작하지 않은 페이지는 취소하고 제출 순서 맨 앞으로 되돌림
+                # (이미 처리 중인 페이지만 마저 끝남, 단 풀이 작업자에게 넘기려고 내부 큐에 옮겨 둔
+                # 작업 하나는 취소할 수 없어 그대로 실행됨)
+                cancelled_pages = [page_num for future, page_num in list(pending.items())
+                                   if future.cancel()]
+                if cancelled_pages:
+                    pending = {future: page_num for future, page_num in pending.items()
+                               if not future.cancelled()}
+                    to_submit = itertools.chain(cancelled_pages, to_submit)
+            was_paused = paused
+
+            # 창 크기만큼만 페이지 작업을 미리 제출 (일시정지 중에는 새 페이지를 시작하지 않음)
+            while len(pending) + len(ready) < window and (control is None or not control.paused):
+                page_num = next(to_submit, None)
+                if page_num is None:
+                    break
+                if trace is None:
+                    future = executor.submit(_ocr_pdf_page, page_num, language, use_text_layer,
+                                             structured)
+                else:
+                    future = executor.submit(ocr_trace.traced_call, 'page', _ocr_pdf_page,
+                                             page_num, language, use_text_layer, structured)
+                pending[future] = page_num
+
+            if not pending:
+                # 일시정지 상태면 재개되거나 취소될 때까지 대기, 아니면 모든 페이지 완료
+                if control is not None and control.paused:
+                    control.wait_if_paused()
+                    continue
+                break
+
+            # 하나 이상 끝날 때까지 대기 (취소를 빨리 알아차리도록 짧게 나누어 대기)
+            done, _ = wait(pending, timeout=CONTROL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                page_num = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if not keep_going:
+                        raise
+                    # 실패한 페이지도 순서대로 내보내어 호출한 쪽이 기록할 수 있게 함
+                    result = (page_num, e, PAGE_SOURCE_ERROR)
+                else:
+                    if trace is not None:
+                        result, data = result
+                        trace.merge(data)
+                if trace is not None:
+                    trace.count(f"pages ({result[2]})")
+                ready[result[0]] = result
+                done_count += 1
+                if on_progress is not None:
+                    on_progress(done_count, len(page_nums))
+
+            # 앞 페이지부터 차례로 준비된 결과를 내보냄
+            while next_index < len(page_nums) and page_nums[next_index] in ready:
+                yield ready.pop(page_nums[next_index])
+                next_index += 1
+    finally:
+        # 정상 완료가 아니면 (취소, 오류, 소비자 중단) 대기 중인 페이지를 버리고
+        # 처리 중인 페이지도 작업자 프로세스째 종료하여 tesseract가 계속 CPU를 쓰지 않게 함
+        # (풀은 호출마다 새로 만들므로 다음 작업은 새 작업자로 시작)
+        if next_index == len(page_nums):
+            executor.shutdown(wait=True)
+        else:
+            _terminate_pdf_workers(executor)
+
+
+# PDF의 지정된 페이지들을 병렬로 OCR 처리하는 함수
+def process_pdf(pdf_path, page_nums, language=DEFAULT_LANGUAGE, workers=DEFAULT_PDF_WORKERS,
+                use_text_layer=True, on_progress=None, cache=None, control=None,
+                render_policy=None, preprocessor=None, engine=None, regions=False,
+                structured=False, keep_going=False, trace=None, memory_budget=None,
+                prefetch=None):
+    """PDF 페이지 병렬 OCR - (페이지 번호, 텍스트, 처리 경로) 목록을 페이지 순서로 반환"""
+    return list(iter_pdf_pages(pdf_path, page_nums, language, workers, use_text_layer,
+                               on_progress, cache, control, render_policy, preprocessor,
+                               engine, regions, structured, keep_going, trace, memory_budget,
+                               prefetch))
+
+
+# PDF 결과 페이지들을 차례로 파일 객체에 쓰는 함수
+def write_pdf_pages(pages, f):
+    """(페이지 번호, 텍스트, 처리 경로)를 받는 대로 형식화하여 쓰고 그대로 다시 생성"""
+    for index, (page_num, text, source) in enumerate(pages):
+        # 페이지 사이에는 빈 줄 하나 (전체를 '\n'.join 한 것과 같은 결과)
+        with ocr_trace.stage('write'):
+            if index:
+                f.write('\n')
+            f.write(format_pdf_page(page_num, text, source))
+            # 중간에 중단되어도 이미 처리된 페이지는 디스크에 남도록 바로 내보냄
+            f.flush()
+        yield page_num, text, source
+
+
+# 이미지 파일들을 작업자 프로세스 풀에서 병렬로 OCR 처리하는 함수
+def process_image_files(paths, language=DEFAULT_LANGUAGE, workers=DEFAULT_PDF_WORKERS, cache=None,
+                        preprocessor=None, engine=None, regions=False, structured=False,
+                        trace=None):
+    """이미지 파일 병렬 OCR - 완료되는 순서대로 (파일 경로, 텍스트, 오류) 생성
+
+    structured=True이면 텍스트 대신 구조화 결과(make_page 형식) 생성
+    trace(ocr_trace.Trace)를 주면 작업자 프로세스의 단계별 측정 기록을 파일마다 합침
+    """
+    paths = list(paths)
+    if not paths:
+        return
+    workers = max(1, min(workers, len(paths)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_image_worker,
+                             initargs=(cache, preprocessor, engine,
+                                       _region_workers_per_process(regions, workers))
+                             ) as executor:
+        if trace is None:
+            futures = {executor.submit(_ocr_image_file_worker, path, language, structured): path
+                       for path in paths}
+        else:
+            futures = {executor.submit(ocr_trace.traced_call, 'image_file',
+                                       _ocr_image_file_worker, path, language, structured): path
+                       for path in paths}
+        for future in as_completed(futures):
+            try:
+                if trace is None:
+                    path, text = future.result()
+                else:
+                    (path, text), data = future.result()
+                    trace.merge(data)
+                    trace.count('files')
+                yield path, text, None
+            except Exception as e:
+                # 한 파일의 실패가 나머지 처리를 막지 않도록 오류를 결과로 전달
+                yield futures[future], None, e
+
+
+# 여러 파일의 페이지를 묶어서 처리하는 작업자 프로세스 초기화 함수 (OCR 서버용)
+def _init_batch_worker(cache, render_policy, preprocessor, engine_name):
+    """작업자 프로세스의 렌더링 정책, 결과 캐시, 전처리기, OCR 엔진 설정 (문서는 묶음마다 열기)"""
+    global _worker_doc, _worker_policy
+    _worker_doc = None
+    _worker_policy = render_policy
+    _init_image_worker(cache, preprocessor, engine_name, 1)
+
+
+# ocr_page_batch를 실행할 작업자 프로세스 풀을 만드는 함수
+def create_page_pool(workers, cache=None, render_policy=None, preprocessor=None, engine=None):
+    """작업자 프로세스 풀 - 작업자마다 OCR 엔진을 한 번만 만들어 두고 여러 묶음에 재사용"""
+    return ProcessPoolExecutor(max_workers=max(1, workers), initializer=_init_batch_worker,
+                               initargs=(cache, render_policy or RenderPolicy(), preprocessor,
+                                         engine))
+
+
+# 이미지/PDF 페이지 묶음 하나를 차례로 OCR하는 함수 (create_page_pool의 작업자에서 실행)
+def ocr_page_batch(items):
+    """[(파일 경로, 페이지 번호 또는 None(이미지), 언어, 텍스트 레이어 우선)] 묶음 처리
+
+    항목마다 (구조화 결과, None) 또는 (None, 오류 메시지)를 같은 순서로 반환
+    (한 페이지의 실패가 같은 묶음의 다른 페이지를 막지 않음)
+    """
+    global _worker_doc
+    results = []
+    try:
+        for path, page_num, language, use_text_layer in items:
+            try:
+                if page_num is None:
+                    _, page = _ocr_image_file_worker(path, language, structured=True)
+                    page['source'] = PAGE_SOURCE_OCR
+                else:
+                    # 같은 문서의 페이지가 이어지면 열어 둔 문서를 그대로 사용
+                    if _worker_doc is None or _worker_doc.name != path:
+                        if _worker_doc is not None:
+                            _worker_doc.close()
+                            _worker_doc = None
+                        _worker_doc = fitz.open(path)
+                    _, page, _ = _ocr_pdf_page(page_num, language, use_text_layer,
+                                               structured=True)
+                results.append((page, None))
+            except Exception as e:
+                # 오류 추적 정보가 페이지 이미지를 붙잡지 않도록 비운 뒤 메시지만 전달
+                traceback.clear_frames(e.__traceback__)
+                results.append((None, f"{type(e).__name__}: {e}"))
+    finally:
+        # 요청이 끝나면 업로드 파일을 지울 수 있도록 묶음마다 문서를 닫음
+        if _worker_doc is not None:
+            _worker_doc.close()
+            _worker_doc = None
+    return results
@@ -0,0 +1,230 @@
+# =============================================================================
+# OCR 엔진 백엔드
+# pytesseract: 호출마다 tesseract 프로세스를 새로 띄우고 임시 파일로 이미지 전달 (기본 대체 경로)
+# tesserocr: Tesseract C API를 프로세스 안에 상주시켜 언어 데이터를 한 번만 불러옴 (선택사항)
+# 작업자 프로세스는 시작할 때 엔진을 한 번 만들어 두고 모든 페이지/이미지에 재사용
+# =============================================================================
+
+import threading
+
+# OCR 엔진 - Tesseract OCR을 파이썬에서 사용할 수 있게 해주는 라이브러리 (명령줄 실행)
+import pytesseract
+
+# 단계별 시간 측정
+import ocr_trace
+
+# Tesseract C API 바인딩 (선택사항)
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# 엔진 이름
+ENGINE_AUTO = 'auto'
+ENGINE_TESSEROCR = 'tesserocr'
+ENGINE_PYTESSERACT = 'pytesseract'
+ENGINES = (ENGINE_AUTO, ENGINE_TESSEROCR, ENGINE_PYTESSERACT)
+
+# 방향/문자 체계 감지(OSD)용 Tesseract 언어 데이터 이름
+OSD_LANGUAGE = 'osd'
+
+
+# 단어 하나의 인식 결과 (두 엔진이 같은 형식으로 반환)
+def make_word(text, conf, box, block, par, line):
+    """단어 딕셔너리 - bbox는 (왼쪽, 위, 오른쪽, 아래) 픽셀, conf는 0~100
+
+    block/par/line은 이미지 안에서 처음부터 차례로 매긴 블록/문단/줄 번호
+    """
+    return {'text': text, 'conf': round(float(conf), 2), 'bbox': list(box),
+            'block': block, 'par': par, 'line': line}
+
+
+# pytesseract 엔진 클래스
+class PytesseractEngine:
+    """호출마다 tesseract 프로세스를 실행하는 엔진 (언어 데이터도 매번 다시 불러옴)"""
+
+    name = ENGINE_PYTESSERACT
+
+    def recognize(self, image, language):
+        """이미지에서 텍스트 추출"""
+        with ocr_trace.stage('ocr'):
+            return pytesseract.image_to_string(image, lang=language)
+
+    def recognize_data(self, image, language):
+        """이미지에서 단어, 위치, 신뢰도 추출 (make_word 형식의 목록)"""
+        with ocr_trace.stage('ocr'):
+            data = pytesseract.image_to_data(image, lang=language,
+                                             output_type=pytesseract.Output.DICT)
+        # Tesseract의 문단/줄 번호는 상위 단위 안에서 다시 1부터 시작하므로 전체 순번으로 바꿈
+        pars, lines = {}, {}
+        words = []
+        for index, text in enumerate(data['text']):
+            if data['level'][index] != 5 or not text.strip():
+                continue
+            block = data['block_num'][index]
+            par = pars.setdefault((block, data['par_num'][index]), len(pars) + 1)
+            line = lines.setdefault((block, data['par_num'][index], data['line_num'][index]),
+                                    len(lines) + 1)
+            left, top = data['left'][index], data['top'][index]
+            words.append(make_word(text, data['conf'][index],
+                                   (left, top, left + data['width'][index],
+                                    top + data['height'][index]),
+                                   block, par, line))
+        return words
+
+    def detect_script(self, image):
+        """(문자 체계 이름, 신뢰도) - OSD 언어 데이터가 없거나 글자가 너무 적으면 None"""
+        with ocr_trace.stage('osd'):
+            try:
+                data = pytesseract.image_to_osd(image, config='--psm 0',
+                                                output_type=pytesseract.Output.DICT)
+            except pytesseract.TesseractError:
+                return None
+        return data['script'], float(data['script_conf'])
+
+    def close(self):
+        """정리할 자원 없음"""
+
+
+# tesserocr 엔진 클래스
+class TesserocrEngine:
+    """스레드 + 언어 조합마다 Tesseract API를 한 번 초기화하여 계속 사용하는 상주 엔진
+
+    API 하나는 한 번에 한 이미지만 인식할 수 있으므로 스레드마다 따로 만들어
+    여러 스레드(영역 병렬 OCR, GUI 백그라운드 스레드)가 동시에 인식할 수 있게 함
+    """
+
+    name = ENGINE_TESSEROCR
+
+    def __init__(self):
+        if tesserocr is None:
+            raise RuntimeError("tesserocr가 설치되어 있지 않습니다.")
+        # 스레드별 (언어 조합 -> 초기화된 API) 딕셔너리
+        self._local = threading.local()
+        # close()에서 모두 해제할 수 있도록 만든 API 전체 목록
+        self._all_apis = []
+        self._lock = threading.Lock()
+        # OSD 언어 데이터가 없어 문자 체계 감지를 할 수 없는지
+        self._osd_missing = False
+
+    # 현재 스레드에서 언어 조합에 맞는 API (처음 요청될 때만 언어 데이터를 불러옴)
+    def _api(self, language):
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+        api = apis.get(language)
+        if api is None:
+            if language == OSD_LANGUAGE:
+                # 방향/문자 체계만 감지하는 API (글자 인식은 하지 않음)
+                api = tesserocr.PyTessBaseAPI(lang=language, psm=tesserocr.PSM.OSD_ONLY)
+            else:
+                api = tesserocr.PyTessBaseAPI(lang=language)
+            apis[language] = api
+            with self._lock:
+                self._all_apis.append(api)
+        return api
+
+    def recognize(self, image, language):
+        """이미지에서 텍스트 추출 (프로세스 생성/임시 파일 없음)"""
+        api = self._api(language)
+        with ocr_trace.stage('ocr'):
+            api.SetImage(image)
+            try:
+                return api.GetUTF8Text()
+            finally:
+                # 다음 이미지를 위해 인식 결과와 이미지 참조 정리 (언어 데이터는 유지)
+                api.Clear()
+
+    def recognize_data(self, image, language):
+        """이미지에서 단어, 위치, 신뢰도 추출 (make_word 형식의 목록)"""
+        api = self._api(language)
+        api.SetImage(image)
+        try:
+            with ocr_trace.stage('ocr'):
+                api.Recognize()
+            words = []
+            block = par = line = 0
+            level = tesserocr.RIL.WORD
+            iterator = api.GetIterator()
+            if iterator is None:
+                return words
+            for word in tesserocr.iterate_level(iterator, level):
+                # 새 블록/문단/줄이 시작될 때마다 번호 증가
+                if word.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                    block += 1
+                if word.IsAtBeginningOf(tesserocr.RIL.PARA):
+                    par += 1
+                if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    line += 1
+                text = word.GetUTF8Text(level)
+                box = word.BoundingBox(level)
+                if not text or not text.strip() or box is None:
+                    continue
+                words.append(make_word(text, word.Confidence(level), box, block, par, line))
+            return words
+        finally:
+            api.Clear()
+
+    def detect_script(self, image):
+        """(문자 체계 이름, 신뢰도) - OSD 언어 데이터가 없거나 글자가 너무 적으면 None"""
+        if self._osd_missing:
+            return None
+        try:
+            api = self._api(OSD_LANGUAGE)
+        except RuntimeError:
+            # osd.traineddata가 설치되어 있지 않음 (다음부터는 시도하지 않음)
+            self._osd_missing = True
+            return None
+        with ocr_trace.stage('osd'):
+            api.SetImage(image)
+            try:
+                result = api.DetectOrientationScript()
+            finally:
+                api.Clear()
+        if not result:
+            return None
+        return result['script_name'], float(result['script_conf'])
+
+    def close(self):
+        """불러 둔 API 모두 해제 (인식 중인 스레드가 없을 때 호출)"""
+        with self._lock:
+            for api in self._all_apis:
+                api.End()
+            self._all_apis.clear()
+        self._local = threading.local()
+
+
+# 사용할 수 있는 엔진 이름 목록
+def available_engines():
+    """설치된 라이브러리로 만들 수 있는 엔진 이름"""
+    if tesserocr is not None:
+        return [ENGINE_TESSEROCR, ENGINE_PYTESSERACT]
+    return [ENGINE_PYTESSERACT]
+
+
+# 이름으로 엔진을 만드는 함수
+def create_engine(name=ENGINE_AUTO):
+    """엔진 생성 - auto이면 tesserocr가 있을 때 상주 엔진, 없으면 pytesseract"""
+    name = name or ENGINE_AUTO
+    if name not in ENGINES:
+        raise ValueError(f"알 수 없는 OCR 엔진: {name}")
+    if name == ENGINE_TESSEROCR or (name == ENGINE_AUTO and tesserocr is not None):
+        return TesserocrEngine()
+    return PytesseractEngine()
+
+
+# 프로세스마다 한 번만 만드는 기본 엔진 (엔진 이름 -> 엔진)
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+# 프로세스 전역 엔진을 가져오는 함수
+def get_engine(name=ENGINE_AUTO):
+    """같은 이름이면 같은 엔진 객체 반환 (상주 엔진을 호출마다 새로 만들지 않음)"""
+    name = name or ENGINE_AUTO
+    with _engines_lock:
+        engine = _engines.get(name)
+        if engine is None:
+            engine = create_engine(name)
+            _engines[name] = engine
+        return engine
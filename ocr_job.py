@@ -0,0 +1,316 @@
+# =============================================================================
+# 이어서 처리할 수 있는 일괄 OCR 작업 모듈
+# 페이지(또는 파일)가 끝날 때마다 결과 파일에 덧붙이고, 상태와 결과 파일 안의 위치를
+# 추가 전용 JSON Lines 체크포인트(매니페스트)에 한 줄씩 기록
+# 같은 작업을 다시 시작하면 완료된 페이지는 건너뛰고 실패했거나 빠진 페이지만 다시 처리
+# =============================================================================
+
+import json
+import os
+
+# OCR 핵심 처리 모듈 (페이지 형식화, 처리 경로 이름)
+import ocr_core
+# 구조화 결과 저장 (형식 이름, 작성기)
+import ocr_output
+# 단계별 시간 측정
+import ocr_trace
+
+# 매니페스트 파일 이름 (결과 파일 이름 + 접미사)
+MANIFEST_SUFFIX = '.manifest.jsonl'
+# 한 번에 쓸 수 없는 형식(hOCR, ALTO, PDF)의 페이지별 구조화 결과를 모아 두는 파일 접미사
+PAGES_SUFFIX = '.pages.jsonl'
+# 이미지 일괄 처리의 매니페스트 파일 이름 (출력 폴더 안)
+BATCH_MANIFEST_NAME = 'ocr_batch' + MANIFEST_SUFFIX
+
+# 페이지/파일 상태
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+# 입력 파일이 바뀌지 않았는지 확인하기 위한 정보
+def file_signature(path):
+    """절대 경로, 크기, 수정 시각 (나노초)"""
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+# 결과에 영향을 주는 설정 (설정이 바뀌면 이전 체크포인트를 이어서 쓰지 않음)
+def job_settings(language, use_text_layer, render_policy, preprocessor, memory_budget=None):
+    """매니페스트 첫 줄에 기록할 작업 설정
+
+    memory_budget(바이트)은 작업자마다 픽셀맵 상한과 띠 나누기를 바꾸므로 설정에 포함함
+    """
+    settings = {
+        'language': language,
+        'text_layer': use_text_layer,
+        'render': vars(render_policy),
+        'preprocess': preprocessor.settings() if preprocessor is not None else None,
+    }
+    # 한도가 없을 때는 넣지 않아 이전 버전에서 만든 체크포인트도 그대로 이어서 처리
+    if memory_budget is not None:
+        settings['memory_budget'] = memory_budget
+    return settings
+
+
+# 기록을 디스크까지 내보내는 함수 (프로그램이 죽거나 전원이 꺼져도 남도록)
+def _sync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+# 체크포인트 매니페스트 클래스
+class JobManifest:
+    """추가 전용 JSON Lines 매니페스트
+
+    첫 줄은 작업 정보(입력 파일, 언어, 형식 등), 이후 한 줄에 항목(페이지 번호 또는 파일 경로)
+    하나의 상태를 기록하며 같은 항목은 마지막 줄이 유효함. 작업 정보가 다르거나 resume=False이면
+    이전 기록을 버리고 새로 시작함.
+    """
+
+    def __init__(self, path, job, resume=False):
+        self.path = path
+        # 파일에서 읽은 작업 정보와 비교할 수 있도록 JSON으로 한 번 변환 (튜플 -> 리스트 등)
+        self.job = json.loads(json.dumps(job))
+        # 항목 -> 마지막 기록
+        self.records = {}
+        # 이전 기록을 이어서 쓰는지 여부
+        self.resumed = resume and self._load()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if self.resumed:
+            self._file = open(path, 'a', encoding='utf-8')
+            # 기록 도중 중단된 마지막 줄이 있으면 다음 기록이 그 줄에 이어 붙지 않도록 줄을 바꿈
+            if not self._ends_with_newline():
+                self._file.write('\n')
+        else:
+            self.records = {}
+            self._file = open(path, 'w', encoding='utf-8')
+            self._write({'job': self.job})
+
+    # 기존 매니페스트 읽기 - 같은 작업이면 True
+    def _load(self):
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding='utf-8') as f:
+            lines = iter(f)
+            try:
+                header = json.loads(next(lines))
+            except (StopIteration, ValueError):
+                return False
+            if header.get('job') != self.job:
+                return False
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 기록 도중 중단된 마지막 줄은 무시
+                    continue
+                self.records[record['item']] = record
+        return True
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        _sync(self._file)
+
+    def record(self, item, status, **fields):
+        """항목 상태 기록 (바로 디스크에 내보냄)"""
+        record = dict(item=item, status=status, **fields)
+        self.records[item] = record
+        self._write(record)
+
+    def status(self, item):
+        """항목의 마지막 상태 (기록이 없으면 None)"""
+        record = self.records.get(item)
+        return record['status'] if record is not None else None
+
+    def forget(self, item):
+        """기록을 무효로 처리 (다음 실행에서 다시 처리하도록 상태 없음 기록)"""
+        if item in self.records:
+            self.record(item, None)
+
+    def close(self, remove=False):
+        """매니페스트 닫기 - remove=True이면 파일 삭제 (작업이 모두 끝나 필요 없을 때)"""
+        self._file.close()
+        if remove:
+            os.remove(self.path)
+
+
+# PDF 하나를 이어서 처리할 수 있게 OCR하는 작업 클래스
+class PdfJob:
+    """결과 파일 + 매니페스트로 진행 상태를 남기는 PDF OCR 작업
+
+    txt/jsonl은 페이지가 끝나는 대로 결과 파일에 바로 덧붙이고 (바이트 위치를 매니페스트에 기록),
+    hOCR/ALTO/PDF는 페이지별 구조화 결과를 따로 모았다가 모든 페이지가 끝나면 한 번에 작성함.
+    이어서 처리한 페이지는 파일 끝에 덧붙으므로 작업이 끝날 때 기록된 위치로 페이지 순서를 맞춤.
+    실패한 페이지 없이 끝나면 매니페스트와 임시 파일을 지움.
+    """
+
+    def __init__(self, pdf_path, out_path, fmt, page_nums, settings, resume=False):
+        self.pdf_path = pdf_path
+        self.out_path = out_path
+        self.fmt = fmt
+        self.page_nums = list(page_nums)
+        self.structured = fmt in ocr_output.STRUCTURED_FORMATS
+        # 페이지 사이 구분 (텍스트는 빈 줄 하나, JSON Lines는 줄바꿈이 페이지에 포함됨)
+        self._separator = b'\n' if fmt == ocr_output.FORMAT_TEXT else b''
+        # 페이지 조각을 덧붙일 파일 (txt/jsonl은 결과 파일 자체)
+        if fmt in (ocr_output.FORMAT_TEXT, ocr_output.FORMAT_JSONL):
+            self.data_path = out_path
+        else:
+            self.data_path = out_path + PAGES_SUFFIX
+
+        job = dict(file_signature(pdf_path), format=fmt, **settings)
+        self.manifest = JobManifest(out_path + MANIFEST_SUFFIX, job, resume)
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        # 작업이 끝날 때 페이지 조각을 다시 읽으므로 읽기/쓰기 모드로 엶
+        resume_data = self.manifest.resumed and os.path.exists(self.data_path)
+        self._data = open(self.data_path, 'r+b' if resume_data else 'w+b')
+        if self.manifest.resumed:
+            self._truncate_to_records()
+        # 이전 실행에서 완료된 페이지 수 (이번 실행에서 건너뜀)
+        self.skipped = sum(1 for page_num in self.page_nums if self._is_done(page_num))
+        self.failed = 0
+
+    def _is_done(self, page_num):
+        return self.manifest.status(page_num) == STATUS_DONE
+
+    # 기록된 페이지 조각 뒤에 남은 (기록 도중 중단된) 내용을 잘라내는 함수
+    def _truncate_to_records(self):
+        size = self._data.seek(0, os.SEEK_END)
+        end = 0
+        for page_num, record in list(self.manifest.records.items()):
+            if record['status'] != STATUS_DONE:
+                continue
+            if record['offset'] + record['length'] > size:
+                # 파일에 없는 조각은 완료되지 않은 것으로 처리
+                self.manifest.forget(page_num)
+            else:
+                end = max(end, record['offset'] + record['length'])
+        self._data.truncate(end)
+        self._data.seek(end)
+
+    @property
+    def pending_pages(self):
+        """이번 실행에서 처리할 페이지 번호 (완료되지 않았거나 실패한 페이지)"""
+        return [page_num for page_num in self.page_nums if not self._is_done(page_num)]
+
+    # 페이지 결과 하나를 파일 조각으로 만드는 함수
+    def _encode(self, page_num, result, source):
+        if self.structured:
+            return (json.dumps(result, ensure_ascii=False) + '\n').encode('utf-8')
+        return ocr_core.format_pdf_page(page_num, result, source).encode('utf-8')
+
+    def run(self, pages):
+        """iter_pdf_pages(keep_going=True)의 결과를 기록하고 그대로 다시 생성"""
+        for page_num, result, source in pages:
+            if source == ocr_core.PAGE_SOURCE_ERROR:
+                self.failed += 1
+                self.manifest.record(page_num, STATUS_FAILED, error=str(result))
+            else:
+                self._append(page_num, result, source)
+            yield page_num, result, source
+
+    # 페이지 조각을 파일 끝에 덧붙인 뒤 매니페스트에 위치 기록 (순서가 바뀌면 안 됨)
+    def _append(self, page_num, result, source):
+        offset = self._data.tell()
+        if offset and self._separator:
+            self._data.write(self._separator)
+            offset += len(self._separator)
+        with ocr_trace.stage('write'):
+            data = self._encode(page_num, result, source)
+            self._data.write(data)
+            _sync(self._data)
+            self.manifest.record(page_num, STATUS_DONE, source=source, offset=offset,
+                                 length=len(data))
+
+    @property
+    def complete(self):
+        """요청된 페이지가 모두 완료되었는지"""
+        return all(self._is_done(page_num) for page_num in self.page_nums)
+
+    # 완료된 페이지 조각을 페이지 순서대로 읽는 함수 (한 번에 한 페이지만 메모리에 둠)
+    def _iter_chunks(self):
+        for page_num in sorted(self.page_nums):
+            if self._is_done(page_num):
+                record = self.manifest.records[page_num]
+                self._data.seek(record['offset'])
+                yield page_num, self._data.read(record['length'])
+
+    # 결과 파일을 페이지 순서로 다시 쓰는 함수 (이어서 처리한 페이지가 파일 끝에 붙어 있을 때)
+    def _reorder(self):
+        done = [page_num for page_num in self.page_nums if self._is_done(page_num)]
+        offsets = [self.manifest.records[page_num]['offset'] for page_num in sorted(done)]
+        if offsets == sorted(offsets):
+            return
+        temp_path = self.out_path + '.tmp'
+        with open(temp_path, 'wb') as out:
+            for index, (_, chunk) in enumerate(self._iter_chunks()):
+                if index:
+                    out.write(self._separator)
+                out.write(chunk)
+        self._data.close()
+        os.replace(temp_path, self.out_path)
+
+    # 모아 둔 구조화 결과로 hOCR/ALTO/PDF 결과 파일을 작성하는 함수
+    def _convert(self):
+        writer = ocr_output.open_writer(self.fmt, self.out_path, self.pdf_path)
+        try:
+            for _, chunk in self._iter_chunks():
+                writer.write_page(json.loads(chunk))
+        finally:
+            writer.close()
+
+    def close(self):
+        """작업 정리 - 모든 페이지가 끝났으면 결과 파일을 페이지 순서로 완성하고 체크포인트 삭제
+
+        실패하거나 남은 페이지가 있으면 체크포인트를 남겨 두어 다음 실행에서 이어서 처리함
+        (hOCR/ALTO/PDF는 그때까지 완료된 페이지로 결과 파일을 미리 작성)
+        """
+        complete = self.complete
+        try:
+            with ocr_trace.stage('finalize'):
+                if self.data_path == self.out_path:
+                    # 완료되기 전에는 매니페스트의 위치 기록과 맞도록 파일을 그대로 둠
+                    if complete:
+                        self._reorder()
+                elif any(self._is_done(page_num) for page_num in self.page_nums):
+                    self._convert()
+        finally:
+            self._data.close()
+            self.manifest.close(remove=complete)
+        if complete and self.data_path != self.out_path:
+            os.remove(self.data_path)
+
+
+# 입력 파일마다 결과 파일 하나를 쓰는 일괄 작업의 진행 기록 클래스 (이미지 일괄 처리)
+class FileBatchJob:
+    """파일별 완료/실패를 매니페스트에 기록 - 입력 파일이 바뀌었거나 결과 파일이 없으면 다시 처리"""
+
+    def __init__(self, manifest_path, settings, resume=False):
+        self.manifest = JobManifest(manifest_path, settings, resume)
+        self.failed = 0
+
+    def is_done(self, path, out_path):
+        """이전 실행에서 같은 입력 파일을 완료했고 결과 파일이 남아 있는지"""
+        record = self.manifest.records.get(path)
+        return (record is not None and record['status'] == STATUS_DONE
+                and record.get('input') == file_signature(path) and os.path.exists(out_path))
+
+    def done(self, path, out_path):
+        """파일 완료 기록 (결과 파일을 다 쓴 뒤 호출)"""
+        self.manifest.record(path, STATUS_DONE, input=file_signature(path), output=out_path)
+
+    def fail(self, path, error):
+        """파일 실패 기록"""
+        self.failed += 1
+        self.manifest.record(path, STATUS_FAILED, error=str(error))
+
+    def close(self, complete=True):
+        """기록 닫기 - 실패 없이 모두 끝났으면 매니페스트 삭제"""
+        self.manifest.close(remove=complete and not self.failed)
@@ -0,0 +1,322 @@
+# =============================================================================
+# 구조화된 OCR 결과 저장 모듈
+# 페이지별 구조화 결과(단어, 위치, 신뢰도, 언어)를 JSON Lines / hOCR / ALTO / 검색 가능한 PDF로 기록
+# 페이지가 도착하는 대로 한 페이지씩 기록하므로 전체 문서를 메모리에 모으지 않음
+# =============================================================================
+
+import json
+import os
+from xml.sax.saxutils import escape, quoteattr
+
+# PDF 처리 라이브러리 - 검색 가능한 PDF 작성
+import fitz  # PyMuPDF
+
+# 텍스트 레이어에서 가져온 페이지 표시
+from ocr_core import PAGE_SOURCE_TEXT
+
+# 출력 형식 이름
+FORMAT_TEXT = 'txt'
+FORMAT_JSONL = 'jsonl'
+FORMAT_HOCR = 'hocr'
+FORMAT_ALTO = 'alto'
+FORMAT_PDF = 'pdf'
+FORMATS = (FORMAT_TEXT, FORMAT_JSONL, FORMAT_HOCR, FORMAT_ALTO, FORMAT_PDF)
+# 단어 위치/신뢰도가 필요한 형식
+STRUCTURED_FORMATS = (FORMAT_JSONL, FORMAT_HOCR, FORMAT_ALTO, FORMAT_PDF)
+
+# 형식별 결과 파일 확장자
+FORMAT_EXTENSIONS = {
+    FORMAT_TEXT: '.txt',
+    FORMAT_JSONL: '.jsonl',
+    FORMAT_HOCR: '.hocr',
+    FORMAT_ALTO: '.xml',
+    FORMAT_PDF: '.pdf',
+}
+
+# 파일 확장자로 형식을 고를 때 쓰는 표 (.html은 hOCR)
+_EXTENSION_FORMATS = {
+    '.jsonl': FORMAT_JSONL,
+    '.json': FORMAT_JSONL,
+    '.hocr': FORMAT_HOCR,
+    '.html': FORMAT_HOCR,
+    '.xml': FORMAT_ALTO,
+    '.pdf': FORMAT_PDF,
+}
+
+# 해상도 정보가 없는 이미지를 PDF 페이지로 만들 때 가정하는 DPI
+DEFAULT_IMAGE_DPI = 300
+
+# 프로그램 이름 (hOCR/ALTO 메타데이터)
+SOFTWARE_NAME = "multilang_ocr"
+
+
+# 파일 경로의 확장자로 출력 형식을 정하는 함수
+def format_for_path(path):
+    """확장자에 맞는 출력 형식 (알 수 없으면 텍스트)"""
+    return _EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower(), FORMAT_TEXT)
+
+
+# 단어 목록을 블록 → 문단 → 줄 구조로 묶는 함수
+def group_words(words):
+    """[(블록 번호, [(문단 번호, [(줄 번호, [단어...])...])...])...] - 단어 순서 유지"""
+    blocks = []
+    for word in words:
+        if not blocks or blocks[-1][0] != word['block']:
+            blocks.append((word['block'], []))
+        pars = blocks[-1][1]
+        if not pars or pars[-1][0] != word['par']:
+            pars.append((word['par'], []))
+        lines = pars[-1][1]
+        if not lines or lines[-1][0] != word['line']:
+            lines.append((word['line'], []))
+        lines[-1][1].append(word)
+    return blocks
+
+
+# 단어들을 감싸는 상자
+def _union_box(words):
+    return (min(word['bbox'][0] for word in words), min(word['bbox'][1] for word in words),
+            max(word['bbox'][2] for word in words), max(word['bbox'][3] for word in words))
+
+
+# 문단(줄 목록)의 모든 단어
+def _par_words(lines):
+    return [word for _, words in lines for word in words]
+
+
+# 블록(문단 목록)의 모든 단어
+def _block_words(pars):
+    return [word for _, lines in pars for word in _par_words(lines)]
+
+
+# JSON Lines 작성 클래스
+class JsonlWriter:
+    """페이지마다 JSON 한 줄 (page, source, language, width, height, dpi, text, words)"""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write_page(self, page, image=None):
+        """페이지 하나 기록"""
+        self._file.write(json.dumps(page, ensure_ascii=False) + '\n')
+        # 중간에 중단되어도 이미 처리된 페이지는 디스크에 남도록 바로 내보냄
+        self._file.flush()
+
+    def close(self):
+        """파일 닫기"""
+        self._file.close()
+
+
+# hOCR 작성 클래스
+class HocrWriter:
+    """hOCR (XHTML) - ocr_page / ocr_carea / ocr_par / ocr_line / ocrx_word"""
+
+    def __init__(self, path, title=""):
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"\n'
+            '    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">\n'
+            ' <head>\n'
+            f'  <title>{escape(title)}</title>\n'
+            '  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>\n'
+            f'  <meta name="ocr-system" content="{SOFTWARE_NAME}"/>\n'
+            '  <meta name="ocr-capabilities" '
+            'content="ocr_page ocr_carea ocr_par ocr_line ocrx_word"/>\n'
+            ' </head>\n'
+            ' <body>\n')
+        self._file.flush()
+
+    def write_page(self, page, image=None):
+        """페이지 하나 기록"""
+        number = page.get('page', 1)
+        title = f"bbox 0 0 {page['width']} {page['height']}; ppageno {number - 1}"
+        if page.get('dpi'):
+            title += f"; scan_res {round(page['dpi'])} {round(page['dpi'])}"
+        lines = [f"  <div class='ocr_page' id='page_{number}' title={quoteattr(title)}>"]
+        for block_id, pars in group_words(page['words']):
+            box = _union_box(_block_words(pars))
+            lines.append(f"   <div class='ocr_carea' id='block_{number}_{block_id}' "
+                         f"title='bbox {box[0]} {box[1]} {box[2]} {box[3]}'>")
+            for par_id, par_lines in pars:
+                box = _union_box(_par_words(par_lines))
+                lines.append(f"    <p class='ocr_par' id='par_{number}_{par_id}' "
+                             f"lang={quoteattr(page['language'])} "
+                             f"title='bbox {box[0]} {box[1]} {box[2]} {box[3]}'>")
+                for line_id, words in par_lines:
+                    box = _union_box(words)
+                    spans = "".join(
+                        f"<span class='ocrx_word' id='word_{number}_{line_id}_{index}' "
+                        f"title='bbox {word['bbox'][0]} {word['bbox'][1]} {word['bbox'][2]} "
+                        f"{word['bbox'][3]}; x_wconf {round(word['conf'])}'>"
+                        f"{escape(word['text'])}</span> "
+                        for index, word in enumerate(words, 1))
+                    lines.append(f"     <span class='ocr_line' id='line_{number}_{line_id}' "
+                                 f"title='bbox {box[0]} {box[1]} {box[2]} {box[3]}'>"
+                                 f"{spans.rstrip()}</span>")
+                lines.append("    </p>")
+            lines.append("   </div>")
+        lines.append("  </div>\n")
+        self._file.write("\n".join(lines))
+        self._file.flush()
+
+    def close(self):
+        """문서 끝을 쓰고 파일 닫기"""
+        self._file.write(" </body>\n</html>\n")
+        self._file.close()
+
+
+# ALTO 작성 클래스
+class AltoWriter:
+    """ALTO v4 XML - 문단마다 TextBlock, 줄마다 TextLine, 단어마다 String (좌표 단위: 픽셀)"""
+
+    def __init__(self, path, file_name=""):
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<alto xmlns="http://www.loc.gov/standards/alto/ns-v4#"\n'
+            '      xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"\n'
+            '      xsi:schemaLocation="http://www.loc.gov/standards/alto/ns-v4# '
+            'http://www.loc.gov/alto/v4/alto-4-2.xsd">\n'
+            '  <Description>\n'
+            '    <MeasurementUnit>pixel</MeasurementUnit>\n'
+            '    <sourceImageInformation>\n'
+            f'      <fileName>{escape(file_name)}</fileName>\n'
+            '    </sourceImageInformation>\n'
+            '    <OCRProcessing ID="OCR_0">\n'
+            '      <ocrProcessingStep>\n'
+            '        <processingSoftware>\n'
+            f'          <softwareName>{SOFTWARE_NAME}</softwareName>\n'
+            '        </processingSoftware>\n'
+            '      </ocrProcessingStep>\n'
+            '    </OCRProcessing>\n'
+            '  </Description>\n'
+            '  <Layout>\n')
+        self._file.flush()
+
+    def write_page(self, page, image=None):
+        """페이지 하나 기록"""
+        number = page.get('page', 1)
+
+        def position(box):
+            return (f'HPOS="{box[0]}" VPOS="{box[1]}" '
+                    f'WIDTH="{box[2] - box[0]}" HEIGHT="{box[3] - box[1]}"')
+
+        lines = [f'    <Page ID="page_{number}" PHYSICAL_IMG_NR="{number}" '
+                 f'WIDTH="{page["width"]}" HEIGHT="{page["height"]}">',
+                 f'      <PrintSpace {position((0, 0, page["width"], page["height"]))}>']
+        for _, pars in group_words(page['words']):
+            for par_id, par_lines in pars:
+                lines.append(f'        <TextBlock ID="block_{number}_{par_id}" '
+                             f'{position(_union_box(_par_words(par_lines)))} '
+                             f'LANG={quoteattr(page["language"])}>')
+                for line_id, words in par_lines:
+                    lines.append(f'          <TextLine ID="line_{number}_{line_id}" '
+                                 f'{position(_union_box(words))}>')
+                    for index, word in enumerate(words):
+                        if index:
+                            # 단어 사이 공백
+                            previous = words[index - 1]['bbox']
+                            lines.append(f'            <SP WIDTH="{max(0, word["bbox"][0] - previous[2])}"'
+                                         f' HPOS="{previous[2]}" VPOS="{previous[1]}"/>')
+                        lines.append(f'            <String CONTENT={quoteattr(word["text"])} '
+                                     f'{position(word["bbox"])} '
+                                     f'WC="{max(0.0, word["conf"]) / 100:.2f}"/>')
+                    lines.append('          </TextLine>')
+                lines.append('        </TextBlock>')
+        lines.append('      </PrintSpace>')
+        lines.append('    </Page>\n')
+        self._file.write("\n".join(lines))
+        self._file.flush()
+
+    def close(self):
+        """문서 끝을 쓰고 파일 닫기"""
+        self._file.write("  </Layout>\n</alto>\n")
+        self._file.close()
+
+
+# 검색 가능한 PDF 작성 클래스
+class SearchablePdfWriter:
+    """원본 페이지(PDF 페이지 또는 이미지) 위에 보이지 않는 OCR 텍스트 레이어를 얹은 PDF
+
+    PDF 구조상 파일은 close()에서 한 번에 저장됨 (페이지 이미지는 원본을 참조하거나
+    이미지 파일 그대로 넣으므로 다시 렌더링한 픽셀을 메모리에 모으지 않음)
+    """
+
+    # 보이지 않는 텍스트용 글꼴 이름 (한국어/중국어/일본어/라틴 문자를 모두 포함하는 CJK 글꼴)
+    FONT_NAME = "ocrcjk"
+
+    def __init__(self, path, source_pdf=None):
+        self.path = path
+        self._doc = fitz.open()
+        # PDF 입력이면 원본 페이지를 그대로 복사해 옴
+        self._source = fitz.open(source_pdf) if source_pdf else None
+        self._font = fitz.Font("cjk")
+
+    def write_page(self, page, image=None):
+        """페이지 하나 추가 - 이미지 입력이면 image에 이미지 파일 경로를 줌"""
+        dpi = page.get('dpi') or DEFAULT_IMAGE_DPI
+        if self._source is not None:
+            number = page['page'] - 1
+            self._doc.insert_pdf(self._source, from_page=number, to_page=number)
+            out = self._doc[-1]
+        else:
+            out = self._doc.new_page(width=page['width'] * 72 / dpi,
+                                     height=page['height'] * 72 / dpi)
+            if image is not None:
+                out.insert_image(out.rect, filename=image)
+        # 텍스트 레이어에서 가져온 페이지는 이미 검색 가능하므로 글자를 겹쳐 넣지 않음
+        if page.get('words') and page.get('source') != PAGE_SOURCE_TEXT:
+            self._insert_text(out, page['words'], 72 / dpi)
+
+    # 단어마다 보이지 않는 글자(render_mode=3)를 단어 상자에 맞춰 넣음
+    def _insert_text(self, out, words, scale):
+        out.insert_font(fontname=self.FONT_NAME, fontbuffer=self._font.buffer)
+        # 단어 좌표는 화면에 보이는 (회전된) 페이지 기준이므로 회전 전 좌표로 되돌림
+        derotate = out.derotation_matrix
+        for word in words:
+            left, top, right, bottom = (value * scale for value in word['bbox'])
+            height = bottom - top
+            length = self._font.text_length(word['text'], fontsize=1)
+            if height <= 0 or length <= 0:
+                continue
+            # 상자 높이에 맞추되 단어 너비를 넘지 않는 글자 크기
+            fontsize = min(height, (right - left) / length)
+            baseline = fitz.Point(left, bottom + self._font.descender * fontsize)
+            out.insert_text(baseline * derotate, word['text'], fontname=self.FONT_NAME,
+                            fontsize=fontsize, rotate=out.rotation, render_mode=3)
+
+    def close(self):
+        """글꼴을 쓰인 글자만 남기도록 줄이고 파일 저장"""
+        if self._doc.page_count:
+            self._doc.subset_fonts()
+            self._doc.save(self.path, garbage=3, deflate=True)
+        self._doc.close()
+        if self._source is not None:
+            self._source.close()
+
+
+# 형식에 맞는 작성기를 만드는 함수
+def open_writer(fmt, path, source_path=None):
+    """구조화 결과 작성기 - source_path는 원본 파일 (PDF 형식에서 PDF 입력이면 페이지를 복사)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    name = os.path.basename(source_path) if source_path else ""
+    if fmt == FORMAT_JSONL:
+        return JsonlWriter(path)
+    if fmt == FORMAT_HOCR:
+        return HocrWriter(path, name)
+    if fmt == FORMAT_ALTO:
+        return AltoWriter(path, name)
+    if fmt == FORMAT_PDF:
+        is_pdf = source_path is not None and source_path.lower().endswith('.pdf')
+        return SearchablePdfWriter(path, source_path if is_pdf else None)
+    raise ValueError(f"구조화 결과를 쓸 수 없는 형식: {fmt}")
+
+
+# 구조화된 PDF 결과 페이지들을 차례로 작성기에 쓰는 함수
+def write_structured_pages(pages, writer):
+    """(페이지 번호, 페이지 결과, 처리 경로)를 받는 대로 기록하고 그대로 다시 생성"""
+    for page_num, page, source in pages:
+        writer.write_page(page)
+        yield page_num, page, source
@@ -0,0 +1,569 @@
+# =============================================================================
+# 로컬 OCR HTTP 서비스 (GUI 없음, 표준 라이브러리 asyncio만 사용)
+# 다른 프로그램이 이미지/PDF를 올려 구조화 OCR 결과(JSON)를 받을 수 있도록 ocr_core를 HTTP로 제공
+# 요청마다 페이지를 대기열에 넣고, 대기열에서 짧은 시간 동안 모은 페이지 묶음을
+# 고정된 크기의 작업자 프로세스 풀에서 처리 (작업자마다 OCR 엔진은 한 번만 생성)
+# 대기 중인 페이지가 한도를 넘으면 업로드를 받기 전에 429로 거절하여 메모리 사용량을 제한
+# 사용법: python ocr_server.py [--host 127.0.0.1] [--port 8765] [-w 작업자수] [--max-queue N]
+#   curl --data-binary @scan.pdf "http://127.0.0.1:8765/ocr?lang=kor+eng&pages=1-3"
+#   curl -F file=@photo.png -F lang=auto http://127.0.0.1:8765/ocr
+#   curl http://127.0.0.1:8765/health   /   curl http://127.0.0.1:8765/metrics
+# =============================================================================
+
+import argparse
+import asyncio
+import email.parser
+import email.policy
+import io
+import json
+import os
+import re
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from urllib.parse import parse_qs, urlsplit
+
+# 이미지 처리 라이브러리 (업로드 형식 확인)
+from PIL import Image
+
+# OCR 핵심 처리 모듈 (tkinter를 가져오지 않음)
+import ocr_core
+# OCR 결과 디스크 캐시
+from ocr_cache import OcrCache, DEFAULT_CACHE_MAX_BYTES
+# OCR 엔진 백엔드
+import ocr_engine
+# 소요 시간 히스토그램
+from ocr_trace import Histogram
+
+# 기본 주소 (이 컴퓨터에서만 접속 가능)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# 묶음 하나에 넣을 최대 페이지 수
+DEFAULT_BATCH_SIZE = 4
+# 첫 페이지가 들어온 뒤 같은 묶음에 넣을 페이지를 기다리는 최대 시간 (밀리초)
+DEFAULT_BATCH_WAIT_MS = 20
+# 대기 중이거나 처리 중인 페이지 수 한도 (넘으면 429)
+DEFAULT_MAX_QUEUE = 64
+# 업로드 파일 크기 한도 (바이트)
+DEFAULT_MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+# 429 응답에서 다시 시도하기까지 기다리라고 알려 줄 시간 (초)
+RETRY_AFTER_SECONDS = 1
+# 오류 응답 뒤 클라이언트가 보내던 본문을 읽어 버리며 기다리는 최대 시간 (초)
+LINGER_SECONDS = 5
+# 요청 줄/헤더 한 줄의 최대 길이와 헤더 최대 개수
+MAX_HEADER_LINE = 8192
+MAX_HEADERS = 100
+
+# 언어 이름 형식 (kor+eng처럼 '+'로 이은 Tesseract 언어 데이터 이름)
+_LANGUAGE_PATTERN = re.compile(r'[A-Za-z0-9_]+(\+[A-Za-z0-9_]+)*')
+
+# 응답 상태 문구
+_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                411: "Length Required", 413: "Payload Too Large", 415: "Unsupported Media Type",
+                429: "Too Many Requests", 431: "Request Header Fields Too Large",
+                500: "Internal Server Error",
+                503: "Service Unavailable"}
+
+
+# 클라이언트에 오류 응답을 보내기 위한 예외
+class HttpError(Exception):
+    """HTTP 상태 코드 + 메시지 (headers는 응답에 추가할 헤더)"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+# 요청 페이지를 모아 작업자 프로세스 풀에서 묶음으로 처리하는 클래스
+class BatchQueue:
+    """페이지 단위 대기열 + 묶음 처리기 (이벤트 루프 안에서만 사용)
+
+    submit()은 페이지마다 결과를 받을 future를 돌려주고, 처리기는 작업자가 하나 비면
+    대기열에서 batch_size개까지 (최대 batch_wait초 기다리며) 모아 작업자 하나에 넘김
+    작업자가 모두 바쁘면 대기열에 페이지가 쌓이므로 부하가 클수록 묶음이 커짐
+    """
+
+    def __init__(self, executor, workers, batch_size=DEFAULT_BATCH_SIZE,
+                 batch_wait=DEFAULT_BATCH_WAIT_MS / 1000, max_queue=DEFAULT_MAX_QUEUE):
+        self.executor = executor
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_queue = max_queue
+        # 대기 중 + 처리 중인 페이지 수
+        self.depth = 0
+        # 처리 중인 묶음 수
+        self.running = 0
+        self.counters = {'batches': 0, 'batch_pages': 0, 'pages_ok': 0, 'pages_failed': 0}
+        # 묶음 하나의 처리 시간
+        self.batch_ms = Histogram()
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(workers)
+        self._tasks = set()
+        self._dispatcher = None
+
+    def start(self):
+        self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def stop(self):
+        """묶음 처리 중지 (처리 중인 묶음의 결과는 버림)"""
+        for task in [self._dispatcher, *self._tasks]:
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*[task for task in [self._dispatcher, *self._tasks] if task],
+                             return_exceptions=True)
+
+    def has_room(self, pages=1):
+        """pages개를 더 넣을 수 있으면 True"""
+        return self.depth + pages <= self.max_queue
+
+    def submit(self, items):
+        """항목(ocr_core.ocr_page_batch 형식)마다 (구조화 결과, 오류 메시지)를 받을 future 목록
+
+        한도는 호출하는 쪽에서 has_room()으로 먼저 확인
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            self._queue.put_nowait((item, future))
+            futures.append(future)
+        self.depth += len(items)
+        return futures
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # 작업자가 하나 빌 때까지 기다린 뒤 묶음을 모음 (바쁜 동안에는 대기열에서 페이지가 쌓임)
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = loop.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        # 기다리던 요청이 끊어진 페이지는 OCR하지 않음
+        live = [(item, future) for item, future in batch if not future.done()]
+        self.depth -= len(batch) - len(live)
+        try:
+            if not live:
+                return
+            self.running += 1
+            start = time.perf_counter()
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, ocr_core.ocr_page_batch, [item for item, _ in live])
+            except Exception as e:
+                # 작업자 프로세스가 죽는 등 묶음 전체가 실패한 경우
+                results = [(None, f"{type(e).__name__}: {e}")] * len(live)
+            finally:
+                self.running -= 1
+                self.depth -= len(live)
+            self.batch_ms.add((time.perf_counter() - start) * 1000)
+            self.counters['batches'] += 1
+            self.counters['batch_pages'] += len(live)
+            for (_, future), result in zip(live, results):
+                self.counters['pages_failed' if result[1] else 'pages_ok'] += 1
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+# HTTP 요청 하나의 내용
+class Request:
+    def __init__(self, method, path, query, headers):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+
+
+# 요청 줄 또는 헤더 한 줄을 읽는 함수
+async def _read_head_line(reader, status, message):
+    """스트림 버퍼 한도를 넘는 줄이나 중간에 끊긴 줄은 HttpError(status, message)"""
+    try:
+        line = await reader.readline()
+    except (asyncio.LimitOverrunError, asyncio.IncompleteReadError, ValueError):
+        # readline은 버퍼 한도를 넘으면 LimitOverrunError를 ValueError로 바꾸어 올림
+        raise HttpError(status, message)
+    if len(line) > MAX_HEADER_LINE:
+        raise HttpError(status, message)
+    return line
+
+
+# 요청 줄과 헤더를 읽는 함수 (본문은 읽지 않음)
+async def read_request_head(reader):
+    """Request (본문 없음) - 연결이 바로 끊어지면 None"""
+    line = await _read_head_line(reader, 400, "요청 줄이 너무 깁니다.")
+    if not line:
+        return None
+    parts = line.decode('latin-1').split()
+    if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+        raise HttpError(400, "잘못된 요청 줄입니다.")
+    headers = {}
+    while True:
+        line = await _read_head_line(reader, 431, "헤더가 너무 깁니다.")
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HttpError(431, "헤더가 너무 많습니다.")
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    url = urlsplit(parts[1])
+    query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+    return Request(parts[0].upper(), url.path, query, headers)
+
+
+# multipart/form-data 본문에서 파일과 입력 값을 꺼내는 함수
+def parse_multipart(content_type, body):
+    """(파일 데이터 또는 None, 파일 이름, {입력 이름: 값})"""
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body)
+    if not message.is_multipart():
+        raise HttpError(400, "multipart 본문을 해석할 수 없습니다.")
+    data, file_name, fields = None, None, {}
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        if part.get_filename() is not None and data is None:
+            data, file_name = part.get_payload(decode=True), part.get_filename()
+        elif name:
+            fields[name] = part.get_payload(decode=True).decode('utf-8', 'replace').strip()
+    return data, file_name, fields
+
+
+# 업로드 데이터가 PDF인지 이미지인지 확인하는 함수
+def detect_upload_kind(data):
+    """'pdf' 또는 'image' - 둘 다 아니면 HttpError(415)"""
+    if data[:5] == b'%PDF-':
+        return 'pdf'
+    try:
+        # 헤더만 읽어 형식을 확인 (픽셀 디코딩은 작업자에서)
+        with Image.open(io.BytesIO(data)):
+            return 'image'
+    except Exception:
+        raise HttpError(415, "이미지나 PDF 파일이 아닙니다.")
+
+
+# OCR 요청 매개변수를 확인하는 함수
+def parse_ocr_options(params):
+    """(언어, 페이지 범위 문자열, 텍스트 레이어 우선)"""
+    language = params.get('lang') or ocr_core.DEFAULT_LANGUAGE
+    if not _LANGUAGE_PATTERN.fullmatch(language):
+        raise HttpError(400, f"잘못된 언어 이름: {language}")
+    text_layer = params.get('text_layer', '1').lower() not in ('0', 'false', 'no')
+    return language, params.get('pages', ''), text_layer
+
+
+# HTTP 서버 클래스 (요청 해석, 업로드 임시 저장, 응답 작성)
+class OcrServer:
+    """POST /ocr, GET /health, GET /metrics를 처리하는 로컬 OCR 서버"""
+
+    def __init__(self, batches, max_upload_bytes=DEFAULT_MAX_UPLOAD_BYTES, engine_name=None):
+        self.batches = batches
+        self.max_upload_bytes = max_upload_bytes
+        self.engine_name = engine_name
+        self.started = time.time()
+        # 업로드 파일을 작업자 프로세스에 넘기기 위한 임시 폴더
+        self.upload_dir = tempfile.mkdtemp(prefix="ocr_server_")
+        # 상태 코드별 응답 수
+        self.responses = {}
+        # OCR 요청 하나의 처리 시간
+        self.request_ms = Histogram()
+        self.closing = False
+
+    def close(self):
+        self.closing = True
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    async def handle_connection(self, reader, writer):
+        """연결 하나에서 요청 하나를 처리하고 연결을 닫음"""
+        try:
+            try:
+                request = await read_request_head(reader)
+                if request is None:
+                    return
+                status, body = await self.route(request, reader, writer)
+                headers = {}
+            except HttpError as e:
+                status, body, headers = e.status, {'error': str(e)}, e.headers
+            except asyncio.IncompleteReadError:
+                return
+            except Exception as e:
+                status, body, headers = 500, {'error': f"{type(e).__name__}: {e}"}, {}
+            self.responses[status] = self.responses.get(status, 0) + 1
+            await self.send(writer, status, body, headers)
+            # 본문을 받기 전에 거절했으면 클라이언트가 응답을 받기 전에 연결이 재설정(RST)되지 않도록
+            # 보내기 쪽만 닫고 남은 본문을 읽어 버린 뒤 연결을 닫음
+            if status >= 400:
+                await self.linger(reader, writer)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer, status, body, headers=None):
+        """JSON 응답 쓰기"""
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        lines = [f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}",
+                 "Content-Type: application/json; charset=utf-8",
+                 f"Content-Length: {len(data)}", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + data)
+        await writer.drain()
+
+    async def linger(self, reader, writer):
+        """보내기 쪽을 닫고 클라이언트가 연결을 닫을 때까지 받은 데이터를 버림
+
+        업로드 크기 한도만큼 읽거나 LINGER_SECONDS가 지나면 그만둠
+        """
+        if writer.can_write_eof():
+            writer.write_eof()
+
+        async def discard():
+            remaining = self.max_upload_bytes
+            while remaining > 0:
+                data = await reader.read(min(remaining, 64 * 1024))
+                if not data:
+                    break
+                remaining -= len(data)
+
+        try:
+            await asyncio.wait_for(discard(), LINGER_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+    async def route(self, request, reader, writer):
+        """(상태 코드, 응답 본문)"""
+        if request.path in ('/health', '/metrics'):
+            if request.method != 'GET':
+                raise HttpError(405, "GET으로 요청하세요.", {'Allow': 'GET'})
+            return 200, self.health() if request.path == '/health' else self.metrics()
+        if request.path != '/ocr':
+            raise HttpError(404, "없는 경로입니다.")
+        if request.method != 'POST':
+            raise HttpError(405, "POST로 요청하세요.", {'Allow': 'POST'})
+        start = time.perf_counter()
+        result = await self.handle_ocr(request, reader, writer)
+        self.request_ms.add((time.perf_counter() - start) * 1000)
+        return 200, result
+
+    async def read_body(self, request, reader, writer):
+        """본문 읽기 - 크기 한도와 대기열 한도는 본문을 받기 전에 확인"""
+        if 'chunked' in request.headers.get('transfer-encoding', '').lower():
+            raise HttpError(411, "Content-Length가 필요합니다.")
+        try:
+            length = int(request.headers.get('content-length', '0'))
+        except ValueError:
+            raise HttpError(400, "잘못된 Content-Length입니다.")
+        if length <= 0:
+            raise HttpError(400, "업로드할 파일이 없습니다.")
+        if length > self.max_upload_bytes:
+            raise HttpError(413, f"파일이 너무 큽니다 (최대 {self.max_upload_bytes // (1024 * 1024)}MB).")
+        # 대기열이 가득 차 있으면 업로드를 받지 않고 바로 거절
+        self.check_room(1)
+        if request.headers.get('expect', '').lower() == '100-continue':
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            await writer.drain()
+        return await reader.readexactly(length)
+
+    def check_room(self, pages):
+        """대기열에 pages개를 넣을 수 없으면 HttpError(429 또는 503)"""
+        if self.closing:
+            raise HttpError(503, "서버를 종료하는 중입니다.")
+        if pages > self.batches.max_queue:
+            raise HttpError(413, f"한 요청의 페이지가 너무 많습니다 (최대 {self.batches.max_queue}쪽).")
+        if not self.batches.has_room(pages):
+            raise HttpError(429, "처리 대기 중인 페이지가 너무 많습니다. 잠시 후 다시 시도하세요.",
+                            {'Retry-After': str(RETRY_AFTER_SECONDS)})
+
+    async def handle_ocr(self, request, reader, writer):
+        """업로드 파일 OCR - {'file', 'kind', 'language', 'pages': [페이지 구조화 결과]}"""
+        body = await self.read_body(request, reader, writer)
+        params = dict(request.query)
+        file_name = params.get('name')
+        content_type = request.headers.get('content-type', '')
+        if content_type.lower().startswith('multipart/form-data'):
+            body, file_name, fields = parse_multipart(content_type, body)
+            if body is None:
+                raise HttpError(400, "업로드한 파일이 없습니다.")
+            # 주소의 매개변수가 폼 입력보다 우선
+            params = dict(fields, **request.query)
+        language, pages_spec, use_text_layer = parse_ocr_options(params)
+        kind = detect_upload_kind(body)
+
+        fd, path = tempfile.mkstemp(dir=self.upload_dir, suffix='.' + kind)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            del body
+            if kind == 'pdf':
+                try:
+                    page_nums = ocr_core.parse_page_ranges(pages_spec,
+                                                           ocr_core.get_page_count(path))
+                except ValueError:
+                    raise HttpError(400, f"잘못된 페이지 범위: {pages_spec}")
+                except Exception as e:
+                    raise HttpError(400, f"PDF를 열 수 없습니다: {e}")
+                if not page_nums:
+                    raise HttpError(400, "처리할 페이지가 없습니다.")
+            else:
+                page_nums = [None]
+            self.check_room(len(page_nums))
+            futures = self.batches.submit([(path, page_num, language, use_text_layer)
+                                           for page_num in page_nums])
+            try:
+                results = await asyncio.gather(*futures)
+            finally:
+                # 요청이 중간에 끝나면 아직 시작하지 않은 페이지는 처리하지 않음
+                for future in futures:
+                    future.cancel()
+        finally:
+            os.remove(path)
+
+        pages = []
+        for page_num, (page, error) in zip(page_nums, results):
+            if error is not None:
+                page = {'page': 1 if page_num is None else page_num + 1,
+                        'source': ocr_core.PAGE_SOURCE_ERROR, 'error': error}
+            pages.append(page)
+        return {'file': file_name, 'kind': kind, 'language': language, 'pages': pages}
+
+    def health(self):
+        """서버 상태"""
+        return {'status': 'closing' if self.closing else 'ok',
+                'workers': self.batches.workers, 'engine': self.engine_name,
+                'queue_depth': self.batches.depth, 'max_queue': self.batches.max_queue}
+
+    def metrics(self):
+        """요청/페이지/묶음 카운터와 처리 시간 요약"""
+        batches = self.batches
+        return {'uptime_sec': round(time.time() - self.started, 1),
+                'queue_depth': batches.depth, 'max_queue': batches.max_queue,
+                'running_batches': batches.running, 'workers': batches.workers,
+                'responses': {str(status): count
+                              for status, count in sorted(self.responses.items())},
+                'counters': dict(batches.counters),
+                'mean_batch_size': round(batches.counters['batch_pages']
+                                         / batches.counters['batches'], 2)
+                if batches.counters['batches'] else None,
+                'request_ms': histogram_summary(self.request_ms),
+                'batch_ms': histogram_summary(batches.batch_ms)}
+
+
+# 히스토그램 요약 (밀리초)
+def histogram_summary(histogram):
+    if not histogram.count:
+        return {'count': 0}
+    return {'count': histogram.count,
+            'mean': round(histogram.total_ms / histogram.count, 2),
+            'p50': round(histogram.percentile(50), 2), 'p90': round(histogram.percentile(90), 2),
+            'p99': round(histogram.percentile(99), 2), 'max': round(histogram.max_ms, 2)}
+
+
+# 서버를 실행하는 함수 (중지될 때까지 반환하지 않음)
+async def serve(args, on_ready=None):
+    """on_ready(호스트, 포트)는 접속을 받을 준비가 되면 호출됨"""
+    cache = None if args.no_cache else OcrCache(args.cache_path,
+                                                args.cache_size_mb * 1024 * 1024)
+    preprocessor = None if args.no_preprocess else ocr_core.default_preprocessor()
+    executor = ocr_core.create_page_pool(args.workers, cache, ocr_core.RenderPolicy(),
+                                         preprocessor, args.engine)
+    batches = BatchQueue(executor, args.workers, args.batch_size, args.batch_wait_ms / 1000,
+                         args.max_queue)
+    server = OcrServer(batches, args.max_upload_mb * 1024 * 1024, args.engine)
+    batches.start()
+    listener = await asyncio.start_server(server.handle_connection, args.host, args.port,
+                                          limit=MAX_HEADER_LINE * 2)
+    try:
+        host, port = listener.sockets[0].getsockname()[:2]
+        if on_ready is not None:
+            on_ready(host, port)
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+        await batches.stop()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if cache is not None:
+            cache.close()
+
+
+# 명령줄 인자 정의
+def build_parser():
+    parser = argparse.ArgumentParser(description="로컬 OCR HTTP 서비스")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help="접속을 받을 주소 (기본값: %(default)s = 이 컴퓨터에서만 접속 가능)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help="포트 (기본값: %(default)s, 0이면 빈 포트 자동 선택)")
+    parser.add_argument("-w", "--workers", type=int, default=ocr_core.DEFAULT_PDF_WORKERS,
+                        help="OCR 작업자 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="작업자에 한 번에 넘길 최대 페이지 수 (기본값: %(default)s)")
+    parser.add_argument("--batch-wait-ms", type=float, default=DEFAULT_BATCH_WAIT_MS,
+                        help="묶음을 채우려고 기다리는 최대 시간 ms (기본값: %(default)s)")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help="대기 중이거나 처리 중인 페이지 한도, 넘으면 429 응답 "
+                             "(기본값: %(default)s)")
+    parser.add_argument("--max-upload-mb", type=int,
+                        default=DEFAULT_MAX_UPLOAD_BYTES // (1024 * 1024),
+                        help="업로드 파일 크기 한도 MB (기본값: %(default)s)")
+    parser.add_argument("--engine", choices=ocr_engine.ENGINES, default=ocr_engine.ENGINE_AUTO,
+                        help="OCR 엔진 (기본값: %(default)s)")
+    parser.add_argument("--no-preprocess", action="store_true",
+                        help="자동 전처리(이진화, 기울기 보정, 테두리 잘라내기)를 사용하지 않음")
+    parser.add_argument("--no-cache", action="store_true", help="OCR 결과 캐시를 사용하지 않음")
+    parser.add_argument("--cache-path", default=None,
+                        help="캐시 파일 경로 (기본값: ~/.cache/multilang_ocr/ocr_cache.sqlite3)")
+    parser.add_argument("--cache-size-mb", type=int,
+                        default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+                        help="캐시 용량 제한 MB (기본값: %(default)s)")
+    return parser
+
+
+# 종료 신호 처리 함수
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+# 프로그램의 메인 함수
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.workers = max(1, args.workers)
+    args.batch_size = max(1, args.batch_size)
+    args.max_queue = max(1, args.max_queue)
+    if args.engine not in ocr_engine.available_engines() + [ocr_engine.ENGINE_AUTO]:
+        print(f"OCR 엔진을 사용할 수 없습니다: {args.engine}", file=sys.stderr)
+        return 1
+
+    def ready(host, port):
+        print(f"OCR 서버 실행 중: http://{host}:{port} (작업자 {args.workers}개, "
+              f"대기열 한도 {args.max_queue}쪽) - Ctrl+C로 종료", flush=True)
+
+    # 서비스 관리자가 보내는 종료 신호도 Ctrl+C처럼 처리 (업로드 임시 폴더와 작업자 정리)
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    try:
+        asyncio.run(serve(args, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+# 스크립트가 직접 실행될 때만 main() 함수 호출
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+# =============================================================================
+# OCR 파이프라인 단계별 시간 측정 모듈
+# 단계(렌더링, 전처리, OCR, 쓰기, 화면 갱신 등)마다 걸린 시간을 구간(span)으로 기록하고
+# 횟수/합계 카운터와 소요 시간 히스토그램으로 모아 Chrome trace-event JSON으로 내보냄
+# (chrome://tracing 또는 https://ui.perfetto.dev 에서 오프라인으로 열 수 있음)
+# 기록 중이 아니면 stage()는 아무것도 하지 않는 공용 객체를 돌려주므로 부담이 거의 없음
+# 기록 중인 Trace는 스레드(컨텍스트)마다 따로 정해지므로 다른 스레드에서는 trace를 직접 넘겨 받아
+# recording()으로 설정해야 함
+# =============================================================================
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# 히스토그램 구간 경계 (밀리초) - 마지막 구간은 그보다 긴 모든 값
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+# 현재 스레드(컨텍스트)에서 기록 중인 Trace (없으면 None)
+_active = contextvars.ContextVar('ocr_trace_active', default=None)
+
+
+# 아무것도 하지 않는 단계 (기록 중이 아닐 때 공용으로 사용)
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+# 소요 시간 히스토그램 클래스
+class Histogram:
+    """HISTOGRAM_BOUNDS_MS 구간별 개수 + 개수/합계/최솟값/최댓값"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def add(self, ms):
+        """값 하나 추가"""
+        index = 0
+        while index < len(HISTOGRAM_BOUNDS_MS) and ms > HISTOGRAM_BOUNDS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+
+    def merge(self, data):
+        """to_dict() 결과를 더함 (작업자 프로세스에서 받은 히스토그램)"""
+        if not data['count']:
+            return
+        for index, count in enumerate(data['buckets']):
+            self.buckets[index] += count
+        self.count += data['count']
+        self.total_ms += data['total_ms']
+        self.min_ms = data['min_ms'] if self.min_ms is None else min(self.min_ms, data['min_ms'])
+        self.max_ms = data['max_ms'] if self.max_ms is None else max(self.max_ms, data['max_ms'])
+
+    def percentile(self, p):
+        """p 백분위수 추정값 (해당 구간의 상한, 최댓값을 넘지 않음)"""
+        target = p / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                bound = HISTOGRAM_BOUNDS_MS[index] if index < len(HISTOGRAM_BOUNDS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self):
+        return {'buckets': list(self.buckets), 'count': self.count, 'total_ms': self.total_ms,
+                'min_ms': self.min_ms, 'max_ms': self.max_ms}
+
+
+# 기록 중인 단계 하나 (with 블록이 끝날 때 구간과 히스토그램에 기록)
+class _Stage:
+    __slots__ = ('trace', 'name', 'args', 'start_us', 'start')
+
+    def __init__(self, trace, name, args):
+        self.trace = trace
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_us = time.time_ns() // 1000
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.add_span(self.name, self.start_us, time.perf_counter() - self.start, self.args)
+        return False
+
+
+# 작업 하나의 측정 기록 클래스
+class Trace:
+    """구간 목록 + 카운터 + 단계별 히스토그램 (여러 스레드에서 동시에 기록 가능)"""
+
+    def __init__(self):
+        # Chrome trace-event 형식의 구간 목록
+        self.events = []
+        # 카운터 이름 -> 누적 값
+        self.counters = {}
+        # 단계 이름 -> Histogram
+        self.histograms = {}
+        # 프로세스 번호 -> 이름 (trace 보기에서 프로세스 줄 이름)
+        self.process_names = {os.getpid(): "main"}
+        self._lock = threading.Lock()
+
+    def stage(self, name, **args):
+        """with 블록 하나를 단계 name으로 측정"""
+        return _Stage(self, name, args)
+
+    def add_span(self, name, start_us, seconds, args=None):
+        """끝난 구간 하나 기록"""
+        event = {'name': name, 'ph': 'X', 'ts': start_us, 'dur': round(seconds * 1e6),
+                 'pid': os.getpid(), 'tid': threading.get_native_id()}
+        if args:
+            event['args'] = args
+        with self._lock:
+            self.events.append(event)
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(seconds * 1000)
+
+    def count(self, name, value=1):
+        """카운터 name에 value를 더함"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def export(self):
+        """프로세스 사이로 보낼 수 있는 딕셔너리 (merge()로 다시 합침)"""
+        with self._lock:
+            return {'events': list(self.events), 'counters': dict(self.counters),
+                    'histograms': {name: histogram.to_dict()
+                                   for name, histogram in self.histograms.items()},
+                    'pid': os.getpid()}
+
+    def merge(self, data):
+        """다른 프로세스(작업자)의 기록을 합침"""
+        with self._lock:
+            self.events.extend(data['events'])
+            for name, value in data['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for name, histogram in data['histograms'].items():
+                self.histograms.setdefault(name, Histogram()).merge(histogram)
+            self.process_names.setdefault(data['pid'], f"worker {data['pid']}")
+
+    def summary(self):
+        """단계별 {'count', 'mean_ms', 'p50_ms', 'p90_ms', 'max_ms'} (총 시간이 긴 단계부터)"""
+        with self._lock:
+            items = sorted(self.histograms.items(), key=lambda item: -item[1].total_ms)
+            return {name: {'count': histogram.count,
+                           'mean_ms': round(histogram.total_ms / histogram.count, 2),
+                           'p50_ms': round(histogram.percentile(50), 2),
+                           'p90_ms': round(histogram.percentile(90), 2),
+                           'max_ms': round(histogram.max_ms, 2)}
+                    for name, histogram in items}
+
+    def format_summary(self, limit=None):
+        """사람이 읽을 단계별 요약 (한 줄에 한 단계)"""
+        lines = [f"{name}: {stats['count']}회, 평균 {stats['mean_ms']:.1f}ms, "
+                 f"p90 {stats['p90_ms']:.0f}ms"
+                 for name, stats in list(self.summary().items())[:limit]]
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path):
+        """Chrome trace-event JSON 파일로 저장 (카운터/히스토그램은 otherData에 포함)"""
+        with self._lock:
+            events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': name}}
+                      for pid, name in self.process_names.items()]
+            events += sorted(self.events, key=lambda event: event['ts'])
+            data = {'traceEvents': events, 'displayTimeUnit': 'ms',
+                    'otherData': {'counters': dict(self.counters),
+                                  'histograms': {name: histogram.to_dict()
+                                                 for name, histogram in self.histograms.items()},
+                                  'histogram_bounds_ms': list(HISTOGRAM_BOUNDS_MS)}}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+# 현재 기록 중인 Trace에 단계를 측정하는 함수 (기록 중이 아니면 아무것도 하지 않음)
+def stage(name, **args):
+    """with ocr_trace.stage('ocr'): ... 형태로 사용"""
+    trace = _active.get()
+    if trace is None:
+        return _NULL_STAGE
+    return _Stage(trace, name, args)
+
+
+# 현재 기록 중인 Trace의 카운터를 늘리는 함수
+def count(name, value=1):
+    trace = _active.get()
+    if trace is not None:
+        trace.count(name, value)
+
+
+# 현재 스레드에서 기록 중인 Trace (없으면 None) - 다른 스레드로 넘겨 recording()에 사용
+def current():
+    return _active.get()
+
+
+# 현재 스레드에서 기록 중인지 확인
+def is_recording():
+    return _active.get() is not None
+
+
+# with 블록 동안 trace에 기록하도록 설정하는 함수 (끝나면 이전 상태로 되돌림)
+@contextlib.contextmanager
+def recording(trace):
+    """with ocr_trace.recording(trace): ... - trace가 None이면 아무것도 바꾸지 않음"""
+    if trace is None:
+        yield trace
+        return
+    token = _active.set(trace)
+    try:
+        yield trace
+    finally:
+        _active.reset(token)
+
+
+# 작업자 프로세스에서 함수 하나를 측정하며 실행하는 함수
+def traced_call(name, func, *args):
+    """(func 결과, 이 호출의 기록) - 기록은 부모 프로세스에서 Trace.merge()로 합침"""
+    trace = Trace()
+    with recording(trace), trace.stage(name):
+        result = func(*args)
+    return result, trace.export()
+
+
+# 처리 속도와 남은 시간을 추정하는 클래스
+class RateMeter:
+    """최근 window개 완료 시각으로 계산한 초당 처리 수와 남은 시간(초)"""
+
+    def __init__(self, total, window=20):
+        self.total = total
+        self._samples = deque(maxlen=window)
+        self._samples.append((time.perf_counter(), 0))
+
+    def update(self, done):
+        """(초당 처리 수, 남은 시간 초) - 아직 계산할 수 없으면 (None, None)"""
+        now = time.perf_counter()
+        self._samples.append((now, done))
+        first_time, first_done = self._samples[0]
+        if now <= first_time or done <= first_done:
+            return None, None
+        rate = (done - first_done) / (now - first_time)
+        return rate, max(0, self.total - done) / rate
+
+
+# 남은 시간을 읽기 쉬운 문자열로 바꾸는 함수
+def format_eta(seconds):
+    """시:분:초 또는 분:초"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
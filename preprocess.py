@@ -0,0 +1,235 @@
+# =============================================================================
+# OCR 전처리 모듈 (NumPy 기반)
+# 모든 이미지/PDF 페이지에 Tesseract 실행 전 자동으로 적용:
+# 회색조 변환 → 이진화(Otsu 또는 적응형) → 기울기 보정 → 테두리 잘라내기
+# NumPy가 없으면 전처리를 건너뜀 (requirements.txt의 선택적 라이브러리)
+# =============================================================================
+
+import math
+
+# 이미지 처리 라이브러리
+from PIL import Image
+
+# 배열 연산 라이브러리 (선택사항)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 단계별 시간 측정
+import ocr_trace
+
+# 이진화 방식
+BINARIZE_OTSU = 'otsu'
+BINARIZE_ADAPTIVE = 'adaptive'
+BINARIZE_METHODS = (BINARIZE_OTSU, BINARIZE_ADAPTIVE)
+
+# 적응형 이진화 창 크기(픽셀)와 주변 평균보다 얼마나 어두워야 글자로 볼지 (비율)
+ADAPTIVE_WINDOW = 31
+ADAPTIVE_OFFSET = 0.15
+
+# 기울기 탐색 범위와 간격 (도)
+MAX_SKEW_DEGREES = 5.0
+SKEW_STEP_DEGREES = 0.25
+# 이보다 작은 기울기는 보정하지 않음 (회전 비용 대비 효과 없음)
+MIN_SKEW_DEGREES = 0.2
+# 기울기 추정에 사용할 축소 이미지의 최대 변 길이
+SKEW_SAMPLE_SIZE = 1000
+
+# 글자 줄로 보기에는 잉크 비율이 너무 높은 행/열 (스캔 테두리, 검은 띠)
+BORDER_INK_FRACTION = 0.5
+# 테두리를 잘라낸 뒤 남겨 둘 여백 (픽셀)
+CROP_MARGIN = 10
+
+
+# NumPy 사용 가능 여부
+def is_available():
+    """전처리를 사용할 수 있는지 확인"""
+    return np is not None
+
+
+# PIL 이미지를 8비트 회색조 배열로 변환
+def to_gray_array(image):
+    """회색조 uint8 배열"""
+    if image.mode != 'L':
+        image = image.convert('L')
+    return np.asarray(image, dtype=np.uint8)
+
+
+# 히스토그램으로 Otsu 임계값 계산
+def otsu_threshold(gray):
+    """클래스 간 분산이 최대가 되는 밝기 임계값"""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256, dtype=np.float64)
+    # 임계값 t 이하(배경/글자) 누적 비율과 누적 평균
+    weight = np.cumsum(hist)
+    mean = np.cumsum(hist * levels)
+    total_weight, total_mean = weight[-1], mean[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = (total_mean * weight - mean * total_weight) ** 2 / (weight * (total_weight - weight))
+    between[~np.isfinite(between)] = 0
+    return int(np.argmax(between))
+
+
+# 적분 영상으로 각 픽셀 주변 창의 평균 밝기 계산
+def _local_mean(gray, window):
+    half = window // 2
+    height, width = gray.shape
+    padded = np.pad(gray, half, mode='edge')
+    # 맨 앞에 0 행/열을 둔 적분 영상 - 창 합계를 네 모서리 값의 덧셈/뺄셈으로 계산
+    integral = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1), dtype=np.int64)
+    np.cumsum(np.cumsum(padded, axis=0, dtype=np.int64), axis=1, out=integral[1:, 1:])
+    total = (integral[window:window + height, window:window + width]
+             - integral[:height, window:window + width]
+             - integral[window:window + height, :width]
+             + integral[:height, :width])
+    return total / float(window * window)
+
+
+# 회색조 배열을 글자(True)/배경(False) 배열로 이진화
+def binarize(gray, method=BINARIZE_OTSU):
+    """글자 픽셀 마스크 (True = 잉크)"""
+    if method == BINARIZE_ADAPTIVE:
+        # 조명이 고르지 않은 스캔: 주변 평균보다 일정 비율 이상 어두운 픽셀
+        return gray < _local_mean(gray, ADAPTIVE_WINDOW) * (1.0 - ADAPTIVE_OFFSET)
+    return gray <= otsu_threshold(gray)
+
+
+# 가로 투영 프로파일이 가장 뾰족해지는 각도로 기울기 추정
+def estimate_skew(ink, max_angle=MAX_SKEW_DEGREES, step=SKEW_STEP_DEGREES):
+    """기울기(도) - 양수면 글자 줄이 오른쪽 아래로 기울어짐"""
+    # 큰 이미지는 간격을 두고 샘플링하여 계산량 감소
+    stride = max(1, int(math.ceil(max(ink.shape) / SKEW_SAMPLE_SIZE)))
+    ys, xs = np.nonzero(ink[::stride, ::stride])
+    if len(ys) < 100:
+        return 0.0
+    ys = ys.astype(np.float64)
+    xs = xs.astype(np.float64)
+
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-max_angle, max_angle + step / 2, step):
+        # 해당 각도만큼 기울어진 줄을 따라 잉크를 모은 행 히스토그램
+        rows = np.round(ys - xs * math.tan(math.radians(angle))).astype(np.int64)
+        hist = np.bincount(rows - rows.min())
+        # 줄이 정렬될수록 히스토그램의 제곱합(분산)이 커짐
+        score = float(np.dot(hist, hist))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+# 스캔 테두리(잉크가 빽빽한 행/열)를 배경으로 지운 마스크
+def remove_borders(ink):
+    """테두리 행/열을 False로 바꾼 사본"""
+    border_rows = ink.mean(axis=1) >= BORDER_INK_FRACTION
+    border_cols = ink.mean(axis=0) >= BORDER_INK_FRACTION
+    if not border_rows.any() and not border_cols.any():
+        return ink
+    ink = ink.copy()
+    ink[border_rows, :] = False
+    ink[:, border_cols] = False
+    return ink
+
+
+# 스캔 테두리를 제외한 내용 영역 계산
+def content_box(ink, margin=CROP_MARGIN):
+    """(왼쪽, 위, 오른쪽, 아래) - 내용이 없으면 None"""
+    def content_range(counts):
+        index = np.nonzero(counts)[0]
+        if len(index) == 0:
+            return None
+        return index[0], index[-1] + 1
+
+    # 테두리를 지운 뒤 잉크가 남아 있는 행/열의 범위
+    ink = remove_borders(ink)
+    rows = content_range(ink.any(axis=1))
+    cols = content_range(ink.any(axis=0))
+    if rows is None or cols is None:
+        return None
+    height, width = ink.shape
+    return (max(0, int(cols[0]) - margin), max(0, int(rows[0]) - margin),
+            min(width, int(cols[1]) + margin), min(height, int(rows[1]) + margin))
+
+
+# OCR 전처리기 클래스
+class Preprocessor:
+    """회색조 → 이진화 → 기울기 보정 → 테두리 잘라내기 (작업자 프로세스로 전달 가능)"""
+
+    def __init__(self, binarize_method=BINARIZE_OTSU, deskew=True, crop=True):
+        if binarize_method not in BINARIZE_METHODS:
+            raise ValueError(f"알 수 없는 이진화 방식: {binarize_method}")
+        self.binarize_method = binarize_method
+        self.deskew = deskew
+        self.crop = crop
+
+    def settings(self):
+        """캐시 키에 포함할 설정"""
+        return {'binarize': self.binarize_method, 'deskew': self.deskew, 'crop': self.crop}
+
+    # 내용 영역만 남기기 (crop=False면 테두리만 지움) - (잘라낸 마스크, 왼쪽 위 좌표)
+    def _crop(self, ink):
+        if not self.crop:
+            return remove_borders(ink), (0, 0)
+        box = content_box(ink)
+        if box is None:
+            return ink, (0, 0)
+        left, top, right, bottom = box
+        return ink[top:bottom, left:right], (left, top)
+
+    def __call__(self, image):
+        """전처리된 흑백(L 모드, 0/255) 이미지 반환 - NumPy가 없으면 원본 그대로"""
+        return self.process(image)[0]
+
+    def process(self, image):
+        """(전처리된 이미지, 좌표 변환) - 변환은 original_box()로 원본 좌표를 되찾을 때 사용"""
+        if np is None:
+            return image, None
+        with ocr_trace.stage('preprocess'):
+            return self._process(image)
+
+    def _process(self, image):
+        ink = binarize(to_gray_array(image), self.binarize_method)
+
+        # 테두리를 먼저 잘라내야 기울기 추정이 테두리 선에 끌려가지 않음
+        offset, angle, size, rotated_size, rotated_offset = (0, 0), 0.0, None, None, (0, 0)
+        if self.crop or self.deskew:
+            ink, offset = self._crop(ink)
+
+        if self.deskew:
+            skew = estimate_skew(remove_borders(ink))
+            if abs(skew) >= MIN_SKEW_DEGREES:
+                # PIL은 반시계 방향으로 회전하므로 오른쪽 아래로 기운 줄은 양의 각도로 바로잡힘
+                rotated = Image.fromarray(np.where(ink, 0, 255).astype(np.uint8)).rotate(
+                    skew, resample=Image.Resampling.NEAREST, expand=True, fillcolor=255)
+                angle, size, rotated_size = skew, (ink.shape[1], ink.shape[0]), rotated.size
+                ink = np.asarray(rotated) < 128
+
+                # 회전으로 생긴 여백 제거
+                ink, rotated_offset = self._crop(ink)
+
+        result = Image.fromarray(np.where(ink, 0, 255).astype(np.uint8))
+        # pytesseract가 임시 파일을 무압축 PGM으로 쓰도록 지정
+        result.format = "PPM"
+        return result, (offset, angle, size, rotated_size, rotated_offset)
+
+
+# 전처리된 이미지의 상자 좌표를 원본 이미지 좌표로 되돌리는 함수
+def original_box(transform, box):
+    """(왼쪽, 위, 오른쪽, 아래) - 회전된 경우 네 꼭짓점을 되돌린 뒤 감싸는 상자"""
+    if transform is None:
+        return box
+    offset, angle, size, rotated_size, rotated_offset = transform
+    left, top, right, bottom = box
+    corners = [(x + rotated_offset[0], y + rotated_offset[1])
+               for x, y in ((left, top), (right, top), (left, bottom), (right, bottom))]
+    if size is not None:
+        # 회전 후 이미지 중심 기준 좌표를 회전 전 이미지 중심 기준으로 되돌림 (y축은 아래 방향)
+        cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+        unrotated = []
+        for x, y in corners:
+            dx, dy = x - rotated_size[0] / 2, y - rotated_size[1] / 2
+            unrotated.append((dx * cos - dy * sin + size[0] / 2, dx * sin + dy * cos + size[1] / 2))
+        corners = unrotated
+    xs = [x + offset[0] for x, _ in corners]
+    ys = [y + offset[1] for _, y in corners]
+    return (int(round(min(xs))), int(round(min(ys))), int(round(max(xs))), int(round(max(ys))))
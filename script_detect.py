@@ -0,0 +1,223 @@
+# =============================================================================
+# 문자 체계(스크립트) 자동 감지 모듈
+# 언어를 'auto'로 두면 페이지마다 필요한 가장 작은 언어 조합을 골라 OCR
+# (영어만 있는 페이지가 중국어/일본어 언어 데이터까지 불러오는 비용을 치르지 않도록)
+# 1단계: 축소 이미지에서 글자 모양으로 라틴 문자/한중일 문자 비율 추정 (NumPy, OCR 없음)
+# 2단계: 한중일 문자가 보이면 Tesseract OSD로 어떤 문자 체계인지 확인 (osd 언어 데이터 필요)
+# 어느 쪽도 확신할 수 없으면 지원하는 언어를 모두 사용
+# =============================================================================
+
+# 이진화 함수 재사용
+import preprocess
+# 배열 연산 라이브러리 (선택사항)
+from preprocess import np
+# 투영 프로파일 구간 함수 재사용
+import layout
+
+# 언어 자동 선택을 뜻하는 언어 이름
+LANGUAGE_AUTO = 'auto'
+# 문자 체계를 확신할 수 없을 때 사용할 언어 조합 (프로그램이 지원하는 언어 전체)
+FALLBACK_LANGUAGE = 'kor+eng+chi_sim+jpn'
+# 라틴 문자만 있는 페이지의 언어
+LATIN_LANGUAGE = 'eng'
+
+# Tesseract OSD 문자 체계 이름 -> 언어 조합 (한중일 문서에는 숫자/영문이 섞이므로 eng 포함)
+SCRIPT_LANGUAGES = {
+    'Latin': LATIN_LANGUAGE,
+    'Hangul': 'kor+eng',
+    'Korean': 'kor+eng',
+    'Han': 'chi_sim+eng',
+    'Japanese': 'jpn+eng',
+    'Hiragana': 'jpn+eng',
+    'Katakana': 'jpn+eng',
+}
+
+# 글자 모양 분석에 사용할 축소 이미지의 최대 변 길이
+SCRIPT_SAMPLE_SIZE = 1500
+# OSD에 넘길 축소 이미지의 최대 변 길이 (글자 높이가 너무 작아지지 않을 정도)
+OSD_SAMPLE_SIZE = 2000
+# 축소 이미지에서 맞출 본문 줄 높이 (픽셀) - 라틴 글자 사이 틈이 남아 있을 정도
+SAMPLE_LINE_HEIGHT = 14
+# 기울어진 줄이 서로 붙지 않도록 나누어 볼 세로 띠 너비 (축소 이미지 픽셀)
+STRIP_WIDTH = 200
+# 글자 줄로 볼 최소 높이 (축소 이미지 픽셀)
+MIN_LINE_HEIGHT = 6
+# 판단에 필요한 최소 글자 줄 조각 수 (띠 하나의 한 줄이 한 조각)
+MIN_LINES = 4
+# 본문 줄 높이(중앙값)의 이 배수보다 높은 조각은 제목/그림으로 보고 판단하지 않음
+MAX_LINE_HEIGHT_RATIO = 1.3
+# 정사각형 글자로 볼 조건: 높이가 줄 높이의 이 비율 이상이고, 너비가 자기 높이의 이 비율 이상
+SQUARE_MIN_HEIGHT = 0.8
+SQUARE_MIN_WIDTH = 0.6
+# 줄 조각에서 정사각형 글자 폭이 이 비율 이상이면 한중일 문자 조각으로 봄
+# (라틴 소문자 줄은 대부분 낮거나 좁은 글자 - 대문자만 있는 줄과 아주 굵은 글꼴은 예외)
+CJK_SQUARE_FRACTION = 0.6
+# 너비/높이 비율이 이 범위인 글자가 이 개수 이상 연달아 있어도 한중일 문자 조각으로 봄 (섞인 단어)
+SQUARE_RUN_ASPECT = (0.85, 1.25)
+CJK_RUN_LENGTH = 2
+# 한중일 문자 조각이 이 비율 이하이면 라틴 문자만 있는 페이지로 봄
+# (잘못 판단하면 한중일 단어를 잃으므로 한 조각이라도 보이면 OSD/전체 언어로 넘김)
+LATIN_MAX_CJK_FRACTION = 0.0
+# 이보다 낮은 OSD 문자 체계 신뢰도는 믿지 않음
+MIN_SCRIPT_CONFIDENCE = 1.0
+
+# 글자별 유니코드 범위 (텍스트 레이어 언어 판별용)
+_HANGUL_RANGES = ((0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF))
+_KANA_RANGES = ((0x3040, 0x30FF), (0x31F0, 0x31FF), (0xFF66, 0xFF9F))
+_HAN_RANGES = ((0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF))
+
+
+# 언어 자동 선택 여부 확인
+def is_auto(language):
+    """언어 자동 선택이면 True"""
+    return language == LANGUAGE_AUTO
+
+
+# 글자 하나가 유니코드 범위 목록에 들어가는지 확인
+def _in_ranges(char, ranges):
+    code = ord(char)
+    return any(start <= code <= end for start, end in ranges)
+
+
+# 이미 있는 텍스트(텍스트 레이어)로 언어 조합을 정하는 함수
+def language_for_text(text):
+    """글자 종류로 정한 언어 조합 - 가나가 있으면 일본어, 한글이 있으면 한국어, 한자만 있으면 중국어"""
+    hangul = kana = han = 0
+    for char in text:
+        if char.isascii():
+            continue
+        if _in_ranges(char, _HANGUL_RANGES):
+            hangul += 1
+        elif _in_ranges(char, _KANA_RANGES):
+            kana += 1
+        elif _in_ranges(char, _HAN_RANGES):
+            han += 1
+    # 일본어 문장은 한자와 가나가, 한국어 문장은 한글(과 가끔 한자)이 섞임
+    if kana:
+        return SCRIPT_LANGUAGES['Japanese']
+    if hangul:
+        return SCRIPT_LANGUAGES['Hangul']
+    if han:
+        return SCRIPT_LANGUAGES['Han']
+    return LATIN_LANGUAGE
+
+
+# 글자 줄 조각 하나가 한중일 문자로 보이는지 확인하는 함수
+def _looks_cjk(line, line_height):
+    """정사각형 글자가 폭의 대부분이거나 둘 이상 연달아 있으면 True
+
+    한중일 문자는 줄 높이를 거의 다 채우는 정사각형, 라틴 소문자는 낮거나 좁음
+    (축소 이미지에서는 붙어 버린 라틴 글자 몇 개가 넓은 덩어리가 되기도 하므로 폭 비율만으로는
+    라틴 문장 사이에 섞인 한중일 단어를 찾지 못함)
+    """
+    square = total = run = longest = 0
+    for start, end in layout.runs(line.any(axis=0)):
+        rows = np.flatnonzero(line[:, start:end].any(axis=1))
+        height = rows[-1] - rows[0] + 1
+        width = end - start
+        total += width
+        if height < SQUARE_MIN_HEIGHT * line_height:
+            run = 0
+            continue
+        if width >= SQUARE_MIN_WIDTH * height:
+            square += width
+        # 너비와 높이가 거의 같은 글자가 연달아 나오는 구간 길이
+        if SQUARE_RUN_ASPECT[0] * height <= width <= SQUARE_RUN_ASPECT[1] * height:
+            run += 1
+            longest = max(longest, run)
+        else:
+            run = 0
+    return square >= CJK_SQUARE_FRACTION * total or longest >= CJK_RUN_LENGTH
+
+
+# 회색조 이미지를 축소하여 잉크 배열로 만드는 함수
+def _ink(gray, factor):
+    sample = gray.reduce(factor) if factor > 1 else gray
+    return preprocess.remove_borders(preprocess.binarize(preprocess.to_gray_array(sample)))
+
+
+# 좁은 세로 띠마다 글자 줄 조각을 찾는 함수
+def _line_pieces(ink):
+    """((띠, 위, 아래) 목록, 보통 줄 높이) - 글자 줄이 없으면 ([], None)"""
+    pieces = []
+    for left in range(0, ink.shape[1], STRIP_WIDTH):
+        strip = ink[:, left:left + STRIP_WIDTH]
+        pieces += [(strip, top, bottom) for top, bottom in layout.runs(strip.any(axis=1))
+                   if bottom - top >= MIN_LINE_HEIGHT]
+    if not pieces:
+        return [], None
+    return pieces, float(np.median([bottom - top for _, top, bottom in pieces]))
+
+
+# 축소 이미지에서 한중일 문자로 보이는 글자 줄 조각의 비율을 재는 함수
+def cjk_fraction(image):
+    """(한중일 문자로 보이는 줄 조각 비율 0~1, 줄 조각 수) - NumPy가 없거나 글자 줄이 없으면 None
+
+    페이지를 좁은 세로 띠로 나누어 띠 안의 글자 줄 하나를 조각 하나로 봄
+    (기울기 보정 전 이미지에서도 줄이 서로 붙지 않고, 라틴 문장 사이에 섞인 한중일 단어도 찾을 수 있음)
+    글자 크기와 렌더링 해상도에 상관없이 같은 기준으로 보도록 본문 줄 높이를 일정하게 맞춰 판단
+    """
+    if np is None:
+        return None
+    gray = image if image.mode == 'L' else image.convert('L')
+    factor = max(1, -(-max(image.size) // SCRIPT_SAMPLE_SIZE))
+    pieces, typical = _line_pieces(_ink(gray, factor))
+    if typical is None:
+        return None
+    # 줄이 너무 높으면 (큰 글자, 높은 해상도) 본문 줄 높이가 SAMPLE_LINE_HEIGHT쯤 되도록 더 축소
+    extra = round(typical / SAMPLE_LINE_HEIGHT)
+    if extra > 1:
+        pieces, typical = _line_pieces(_ink(gray, factor * extra))
+        if typical is None:
+            return None
+
+    # 본문 높이의 글자 줄만 사용 (큰 제목, 여러 줄이 붙은 구간, 그림은 제외)
+    cjk = count = 0
+    for strip, top, bottom in pieces:
+        if bottom - top > MAX_LINE_HEIGHT_RATIO * typical:
+            continue
+        line = strip[top:bottom]
+        # 글자 한두 개뿐인 짧은 조각은 판단하지 않음
+        if np.count_nonzero(line.any(axis=0)) < 2 * typical:
+            continue
+        count += 1
+        if _looks_cjk(line, max(bottom - top, typical)):
+            cjk += 1
+    if not count:
+        return None
+    return cjk / count, count
+
+
+# 엔진의 OSD로 문자 체계를 확인하는 함수
+def _osd_language(image, engine):
+    """OSD가 확신하는 문자 체계의 언어 조합 - 엔진에 OSD가 없거나 확신할 수 없으면 None"""
+    if engine is None:
+        return None
+    factor = max(1, -(-max(image.size) // OSD_SAMPLE_SIZE))
+    result = engine.detect_script(image.reduce(factor) if factor > 1 else image)
+    if result is None:
+        return None
+    script, confidence = result
+    if confidence < MIN_SCRIPT_CONFIDENCE:
+        return None
+    return SCRIPT_LANGUAGES.get(script)
+
+
+# 페이지 이미지에 필요한 가장 작은 언어 조합을 고르는 함수
+def detect_language(image, engine=None):
+    """OCR 언어 조합 (Tesseract 언어 이름) - 확신할 수 없으면 FALLBACK_LANGUAGE
+
+    라틴 문자만 보이면 OSD 없이 바로 영어로 정하고, 한중일 문자가 보이면 engine의 OSD로
+    어떤 문자인지 확인함 (engine이 None이거나 OSD 언어 데이터가 없으면 확인하지 않음)
+    """
+    measured = cjk_fraction(image)
+    cjk_seen = False
+    if measured is not None and measured[1] >= MIN_LINES:
+        if measured[0] <= LATIN_MAX_CJK_FRACTION:
+            return LATIN_LANGUAGE
+        cjk_seen = True
+    language = _osd_language(image, engine)
+    # 글자 모양으로는 한중일 문자가 보이는데 OSD가 라틴 문자라고 하면 섞인 페이지로 봄
+    if language is None or (language == LATIN_LANGUAGE and cjk_seen):
+        return FALLBACK_LANGUAGE
+    return language